@@ -0,0 +1,165 @@
+from instrucoes import PUSHG, STOREG, PUSHL, STOREL, PUSHN, JZ, JUMP, STOP, CALL, RETURN
+
+# ---------------------------------------------------
+# Alocação de posições para as variáveis (opção 'slots')
+#
+# O gerador de código dá a cada variável declarada uma posição global
+# própria (PUSHG/STOREG). Esta passagem, sobre o código simbólico já gerado
+# (e otimizado pelo peephole, se pedido):
+#   1. divide o código em blocos básicos e calcula, por análise de
+#      liveness (para trás, com lista de trabalho), as variáveis vivas à
+#      entrada e à saída de cada bloco; os conjuntos são inteiros usados
+#      como bitsets (bit i = variável de índice i);
+#   2. regista os conflitos: quando uma variável é escrita, todas as que
+#      estão vivas nesse ponto não podem partilhar a sua posição;
+#   3. atribui posições por ordem de primeira ocorrência, reutilizando a
+#      primeira posição sem conflitos (coloração gulosa);
+#   4. reescreve os acessos como locais do frame do programa principal
+#      (PUSHL/STOREL), reservados no início com PUSHN. As variáveis
+#      declaradas mas nunca usadas não ocupam posição.
+# Na área global ficam só os arrays, acedidos com deslocamentos a partir de
+# gp (o compilador põe-nos nas primeiras posições, ver
+# CompilationContext.agrupar_arrays), seguidos das 'fixas' abaixo.
+# Uma variável lida antes de escrita está viva desde o início do programa
+# e conserva o valor inicial 0, como uma global.
+# As globais usadas nos corpos dos subprogramas ('fixas') continuam globais:
+# nesses corpos PUSHL/STOREL são do frame da chamada. Uma chamada (CALL)
+# não mexe nas restantes, por isso conta como uma instrução normal, e os
+# corpos (depois do STOP) acabam em RETURN, sem sucessores.
+# Os blocos básicos e a liveness também servem à eliminação de código morto
+# (otimizador.eliminar_codigo_morto).
+# ---------------------------------------------------
+
+# Instruções depois das quais começa um bloco básico
+_FIM_DE_BLOCO = {JZ, JUMP, STOP, RETURN}
+
+def blocos_basicos(codigo):
+    """
+    Blocos básicos do código simbólico: lista de (início, fim) e, para cada
+    bloco, a lista dos blocos sucessores.
+    """
+    lideres = {0}
+    for i, (op, _) in enumerate(codigo):
+        if op is None:
+            lideres.add(i)                 # rótulo: possível destino de saltos
+        elif op in _FIM_DE_BLOCO:
+            lideres.add(i + 1)
+    ordem = sorted(i for i in lideres if i < len(codigo))
+    blocos = list(zip(ordem, ordem[1:] + [len(codigo)]))
+
+    bloco_de = {codigo[i][1]: b for b, (i, _) in enumerate(blocos) if codigo[i][0] is None}
+    sucessores = []
+    for b, (_, fim) in enumerate(blocos):
+        op, arg = codigo[fim - 1]
+        seguinte = [b + 1] if b + 1 < len(blocos) else []
+        if op == JUMP:
+            sucessores.append([bloco_de[arg]])
+        elif op == JZ:
+            sucessores.append([bloco_de[arg]] + seguinte)
+        elif op == STOP or op == RETURN:
+            sucessores.append([])
+        else:
+            sucessores.append(seguinte)
+    return blocos, sucessores
+
+def variaveis_vivas(codigo, blocos, sucessores, chamadas=0):
+    """
+    Variáveis vivas à saída de cada bloco (bitsets), até ao ponto fixo.
+    'chamadas' são as variáveis que um CALL pode ler e que continuam vivas
+    depois de um RETURN (as globais usadas nos corpos dos subprogramas).
+    """
+    usa, define = [], []
+    for inicio, fim in blocos:
+        u = d = 0
+        for k in range(fim - 1, inicio - 1, -1):
+            op, arg = codigo[k]
+            if op == PUSHG:
+                u |= 1 << arg
+            elif op == STOREG:
+                u &= ~(1 << arg)
+                d |= 1 << arg
+            elif op == CALL:
+                u |= chamadas
+        usa.append(u)
+        define.append(d)
+
+    antecessores = [[] for _ in blocos]
+    for b, seguintes in enumerate(sucessores):
+        for x in seguintes:
+            antecessores[x].append(b)
+
+    # Lista de trabalho: quando a entrada de um bloco muda, os antecessores
+    # voltam a ser calculados (começa pelo fim, porque a análise é para trás)
+    entrada = [0] * len(blocos)
+    saida = [0] * len(blocos)
+    pendentes = list(range(len(blocos)))
+    na_lista = [True] * len(blocos)
+    while pendentes:
+        b = pendentes.pop()
+        na_lista[b] = False
+        s = chamadas if codigo[blocos[b][1] - 1][0] == RETURN else 0
+        for x in sucessores[b]:
+            s |= entrada[x]
+        saida[b] = s
+        e = usa[b] | (s & ~define[b])
+        if e != entrada[b]:
+            entrada[b] = e
+            for a in antecessores[b]:
+                if not na_lista[a]:
+                    na_lista[a] = True
+                    pendentes.append(a)
+    return saida
+
+def alocar_slots(codigo, n_variaveis, fixas=frozenset(), arrays=0):
+    """
+    Reescreve os acessos às n_variaveis globais de 'codigo' (simbólico)
+    como locais, partilhando posições entre variáveis que nunca estão vivas
+    ao mesmo tempo. As primeiras 'arrays' posições são dos arrays (não são
+    tocadas) e as posições em 'fixas' continuam globais, renumeradas logo a
+    seguir aos arrays, pela mesma ordem. Devolve (novo código, posições
+    poupadas).
+    """
+    blocos, sucessores = blocos_basicos(codigo)
+    saida = variaveis_vivas(codigo, blocos, sucessores)
+
+    # conflitos[v]: variáveis vivas em algum ponto onde v é escrita
+    conflitos = [0] * n_variaveis
+    for (inicio, fim), vivas in zip(blocos, saida):
+        for k in range(fim - 1, inicio - 1, -1):
+            op, arg = codigo[k]
+            if op == STOREG:
+                bit = 1 << arg
+                conflitos[arg] |= vivas & ~bit
+                vivas &= ~bit
+            elif op == PUSHG:
+                vivas |= 1 << arg
+
+    # Coloração gulosa, pela ordem de primeira ocorrência. Dois conflitos
+    # são verificados por posição: v com os membros (conflitos[v]) e os
+    # membros com v (a união dos seus conflitos)
+    posicao = {}
+    membros, vizinhos = [], []
+    for op, arg in codigo:
+        if (op == PUSHG or op == STOREG) and arg not in posicao and arg not in fixas:
+            bit = 1 << arg
+            for p in range(len(membros)):
+                if not (conflitos[arg] & membros[p]) and not (vizinhos[p] & bit):
+                    break
+            else:
+                p = len(membros)
+                membros.append(0)
+                vizinhos.append(0)
+            posicao[arg] = p
+            membros[p] |= bit
+            vizinhos[p] |= conflitos[arg]
+
+    globais = {v: arrays + k for k, v in enumerate(sorted(fixas))}
+    novo = [(PUSHN, len(membros))] if membros else []
+    for op, arg in codigo:
+        if op == PUSHG:
+            novo.append((PUSHL, posicao[arg]) if arg in posicao else (PUSHG, globais[arg]))
+        elif op == STOREG:
+            novo.append((STOREL, posicao[arg]) if arg in posicao else (STOREG, globais[arg]))
+        else:
+            novo.append((op, arg))
+    return novo, n_variaveis - arrays - len(fixas) - len(membros)
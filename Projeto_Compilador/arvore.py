@@ -0,0 +1,241 @@
+# ---------------------------------------------------
+# Nós da AST
+#
+# Cada construção tem a sua classe, com __slots__: os campos ficam num
+# bloco fixo (sem __dict__ por nó), o que reduz a memória em programas
+# grandes, e as passagens sobre a AST (análise semântica, dobragem de
+# constantes, geração de código) despacham pela classe do nó, type(no),
+# com tabelas classe → função em vez de cadeias de comparações de strings.
+#
+# As expressões têm ainda o campo 'tipo', preenchido pela análise
+# semântica (semantica.py); nos literais é conhecido logo à partida.
+# ---------------------------------------------------
+
+class No:
+    """Base de todos os nós: campos em __slots__ e repr com os campos."""
+    __slots__ = ()
+
+    def __repr__(self):
+        valores = (repr(getattr(self, c)) for c in campos(type(self)) if c != 'tipo')
+        return f"{type(self).__name__}({', '.join(valores)})"
+
+_CAMPOS = {}
+
+def campos(cls):
+    """Campos (__slots__) de uma classe de nós, pela ordem de declaração, com 'tipo'."""
+    lista = _CAMPOS.get(cls)
+    if lista is None:
+        lista = _CAMPOS[cls] = tuple(c for k in reversed(cls.__mro__)
+                                     for c in getattr(k, '__slots__', ()))
+    return lista
+
+# ---------------- expressões ----------------
+
+class Expressao(No):
+    __slots__ = ('tipo',)
+
+class Num(Expressao):
+    __slots__ = ('valor',)
+
+    def __init__(self, valor):
+        self.valor = valor
+        self.tipo = 'integer'
+
+class Real(Expressao):
+    __slots__ = ('valor',)
+
+    def __init__(self, valor):
+        self.valor = valor
+        self.tipo = 'real'
+
+class Str(Expressao):
+    __slots__ = ('valor',)
+
+    def __init__(self, valor):
+        self.valor = valor
+        self.tipo = 'string'
+
+class Bool(Expressao):
+    __slots__ = ('valor',)
+
+    def __init__(self, valor):
+        self.valor = valor
+        self.tipo = 'boolean'
+
+class Id(Expressao):
+    __slots__ = ('nome',)
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.tipo = None
+
+class BinOp(Expressao):
+    """Operação binária; 'op' em minúsculas ('+', 'div', 'and', '<>', …)."""
+    __slots__ = ('op', 'esq', 'dir')
+
+    def __init__(self, op, esq, dir):
+        self.op = op
+        self.esq = esq
+        self.dir = dir
+        self.tipo = None
+
+class Index(Expressao):
+    """Elemento de um array: nome[indice]."""
+    __slots__ = ('nome', 'indice')
+
+    def __init__(self, nome, indice):
+        self.nome = nome
+        self.indice = indice
+        self.tipo = None
+
+class Call(Expressao):
+    """Chamada de uma função: nome(args)."""
+    __slots__ = ('nome', 'args')
+
+    def __init__(self, nome, args):
+        self.nome = nome
+        self.args = args
+        self.tipo = None
+
+# Literais cujo valor se conhece e se dobra em tempo de compilação (inteiros e booleanos)
+LITERAIS = (Num, Bool)
+
+# ---------------- instruções ----------------
+
+class Assign(No):
+    __slots__ = ('var', 'expr')
+
+    def __init__(self, var, expr):
+        self.var = var
+        self.expr = expr
+
+class AssignIndex(No):
+    """var[indice] := expr"""
+    __slots__ = ('var', 'indice', 'expr')
+
+    def __init__(self, var, indice, expr):
+        self.var = var
+        self.indice = indice
+        self.expr = expr
+
+class Read(No):
+    __slots__ = ('var',)
+
+    def __init__(self, var):
+        self.var = var
+
+class ReadIndex(No):
+    """readln(var[indice])"""
+    __slots__ = ('var', 'indice')
+
+    def __init__(self, var, indice):
+        self.var = var
+        self.indice = indice
+
+class Write(No):
+    """write/writeln: 'nova_linha' é True para writeln."""
+    __slots__ = ('exprs', 'nova_linha')
+
+    def __init__(self, exprs, nova_linha):
+        self.exprs = exprs
+        self.nova_linha = nova_linha
+
+class If(No):
+    """if cond then entao [else senao]; sem else, 'senao' é None."""
+    __slots__ = ('cond', 'entao', 'senao')
+
+    def __init__(self, cond, entao, senao=None):
+        self.cond = cond
+        self.entao = entao
+        self.senao = senao
+
+class While(No):
+    __slots__ = ('cond', 'corpo')
+
+    def __init__(self, cond, corpo):
+        self.cond = cond
+        self.corpo = corpo
+
+class For(No):
+    """for var := inicio to|downto limite do corpo; 'direcao' é 'to' ou 'downto'."""
+    __slots__ = ('var', 'inicio', 'limite', 'corpo', 'direcao')
+
+    def __init__(self, var, inicio, limite, corpo, direcao):
+        self.var = var
+        self.inicio = inicio
+        self.limite = limite
+        self.corpo = corpo
+        self.direcao = direcao
+
+class ProcCall(No):
+    """Chamada de um procedimento: nome ou nome(args)."""
+    __slots__ = ('nome', 'args')
+
+    def __init__(self, nome, args):
+        self.nome = nome
+        self.args = args
+
+class Block(No):
+    __slots__ = ('instrucoes',)
+
+    def __init__(self, instrucoes):
+        self.instrucoes = instrucoes
+
+# ---------------- programa ----------------
+
+class TipoArray:
+    """
+    Tipo declarado 'array[inicio..fim] of elemento' (nas tabelas de
+    variáveis; não é um nó da AST). 'elemento' é um tipo simples.
+    """
+    __slots__ = ('inicio', 'fim', 'elemento')
+
+    def __init__(self, inicio, fim, elemento):
+        self.inicio = inicio
+        self.fim = fim
+        self.elemento = elemento
+
+    def __len__(self):
+        return self.fim - self.inicio + 1
+
+    def __repr__(self):
+        return f"array[{self.inicio}..{self.fim}] of {self.elemento}"
+
+class Subprograma(No):
+    """
+    procedure/function declarada antes do bloco principal. 'parametros'
+    são os nomes, pela ordem; 'retorno' é o tipo do resultado (None num
+    procedimento). 'tabela' é a tabela local, nome → (tipo, posição
+    relativa ao fp): os parâmetros (-n … -1), o resultado de uma função,
+    com o nome dela (-n-1), e as 'locais' variáveis locais (0, 1, …).
+    O nome fica também na tabela de variáveis global, como (Subprograma,
+    None), para a análise semântica das chamadas.
+    """
+    __slots__ = ('nome', 'parametros', 'retorno', 'tabela', 'locais', 'corpo')
+
+    def __init__(self, nome, parametros, retorno, tabela, locais=0, corpo=None):
+        self.nome = nome
+        self.parametros = parametros
+        self.retorno = retorno
+        self.tabela = tabela
+        self.locais = locais
+        self.corpo = corpo
+
+class Program(No):
+    __slots__ = ('nome', 'bloco', 'subprogramas')
+
+    def __init__(self, nome, bloco, subprogramas=()):
+        self.nome = nome
+        self.bloco = bloco
+        self.subprogramas = subprogramas
+
+def nos(raiz):
+    """Nós de 'raiz' e dos seus campos (também dentro de listas), cada um antes dos filhos; sem recursão."""
+    pendentes = [raiz]
+    while pendentes:
+        x = pendentes.pop()
+        if isinstance(x, list):
+            pendentes.extend(reversed(x))
+        elif isinstance(x, No):
+            yield x
+            pendentes.extend(getattr(x, c) for c in reversed(campos(type(x))) if c != 'tipo')
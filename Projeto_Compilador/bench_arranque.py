@@ -0,0 +1,66 @@
+import os, sys, glob, shutil, statistics, subprocess, tempfile, time, argparse
+
+# ---------------------------------------------------
+# Benchmark do arranque do compilador
+#
+# Mede, em processos Python novos, o tempo de importar parser.py e compilar
+# um programa mínimo:
+#   - a frio:   cópia limpa das fontes (sem parsetab.py, parser.out nem
+#               __pycache__), como na primeira execução;
+#   - a quente: mesma diretoria, com tabelas e bytecode já gerados;
+#   - import:   só "import parser" a quente (o caso de uma execução em que
+#               tudo vem da cache: o PLY nunca chega a ser carregado).
+# O custo do próprio interpretador (python -c pass) é descontado.
+#
+# Uso: python bench_arranque.py [-n REPETICOES]
+# ---------------------------------------------------
+
+DIRETORIA = os.path.dirname(os.path.abspath(__file__))
+
+PROGRAMA = "program Minimo; begin writeln('ok') end."
+
+CODIGO = f"import parser; parser.compilar_programa({PROGRAMA!r})"
+
+IMPORTACAO = "import parser"
+
+GERADOS = ('parsetab.py', 'parser.out')
+
+def _copiar_fontes(destino):
+    for fonte in glob.glob(os.path.join(DIRETORIA, '*.py')):
+        nome = os.path.basename(fonte)
+        if nome not in GERADOS and not nome.startswith('bench_'):
+            shutil.copy(fonte, destino)
+
+def _executar(diretoria, codigo):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, '-c', codigo], cwd=diretoria, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - inicio
+
+def medir(repeticoes):
+    """Devolve (tempos a frio, tempos a quente, tempos de import) em segundos."""
+    frio, quente, importacao = [], [], []
+    for _ in range(repeticoes):
+        with tempfile.TemporaryDirectory() as tmp:
+            _copiar_fontes(tmp)
+            frio.append(_executar(tmp, CODIGO))
+            for _ in range(3):
+                quente.append(_executar(tmp, CODIGO))
+                importacao.append(_executar(tmp, IMPORTACAO))
+    return frio, quente, importacao
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark do arranque do compilador.")
+    ap.add_argument("-n", "--repeticoes", type=int, default=5)
+    args = ap.parse_args()
+
+    base = statistics.median(_executar(DIRETORIA, 'pass') for _ in range(args.repeticoes))
+    print(f"Interpretador (python -c pass): {base * 1000:.1f} ms (descontado abaixo)\n")
+    print(f"{'frio (ms)':>12}{'quente (ms)':>14}{'import (ms)':>14}")
+    print("".join(f"{(statistics.median(t) - base) * 1000:>{w}.1f}"
+                  for t, w in zip(medir(args.repeticoes), (12, 14, 14))))
+
+if __name__ == "__main__":
+    main()
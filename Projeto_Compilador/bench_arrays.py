@@ -0,0 +1,92 @@
+import sys
+
+import medicao
+
+# ---------------------------------------------------
+# Benchmark dos arrays
+#
+# Programas numéricos sobre arrays (crivo de Eratóstenes, ordenação por
+# bolha, somas prefixas), compilados com e sem a verificação dos limites
+# dos índices (opção 'sem_limites', --sem-limites). Para cada um conta as
+# instruções do .ewvm e as executadas pelo interpretador (ewvm.py) e mede o
+# tempo de CPU (medicao.comparar); as duas versões têm de escrever
+# exatamente o mesmo.
+#
+# Uso: python bench_arrays.py [-n TAMANHO] [-r REPETICOES] [--peephole] [--slots]
+# ---------------------------------------------------
+
+def casos(n):
+    """(nome, texto, entrada) dos programas medidos, com arrays de cerca de n elementos."""
+    m = max(2, n // 100)            # a ordenação é quadrática
+    return [
+        ("crivo", f"""program Crivo;
+var i, j, total: integer;
+    composto: array[2..{n}] of boolean;
+begin
+  for i := 2 to {n} do composto[i] := false;
+  total := 0;
+  for i := 2 to {n} do
+    if composto[i] = false then
+    begin
+      total := total + 1;
+      j := i * i;
+      while j <= {n} do
+      begin
+        composto[j] := true;
+        j := j + i
+      end
+    end;
+  writeln(total)
+end.
+""", []),
+        ("ordenacao", f"""program Ordenacao;
+var i, j, t, x, soma: integer;
+    v: array[1..{m}] of integer;
+begin
+  x := 12345;
+  for i := 1 to {m} do
+  begin
+    x := (x * 1103 + 12345) mod 65536;
+    v[i] := x
+  end;
+  for i := {m} downto 2 do
+    for j := 1 to i - 1 do
+      if v[j] > v[j + 1] then
+      begin
+        t := v[j]; v[j] := v[j + 1]; v[j + 1] := t
+      end;
+  soma := 0;
+  for i := 1 to {m} do soma := (soma * 31 + v[i]) mod 1000003;
+  writeln(v[1], ' ', v[{m}], ' ', soma)
+end.
+""", []),
+        ("prefixas", f"""program Prefixas;
+var i, k, s: integer;
+    a: array[0..{n}] of integer;
+    p: array[0..{n}] of integer;
+begin
+  for i := 0 to {n} do a[i] := i mod 7;
+  p[0] := a[0];
+  for i := 1 to {n} do p[i] := p[i - 1] + a[i];
+  s := 0;
+  k := {n} div 2;
+  for i := k to {n} do s := s + p[i] - p[i - k];
+  writeln(p[{n}], ' ', s)
+end.
+""", []),
+    ]
+
+def main():
+    ap = medicao.argumentos("Benchmark dos arrays (com e sem verificação de limites).")
+    ap.add_argument("-n", "--tamanho", type=int, default=20000, help="elementos dos arrays")
+    ap.add_argument("-r", "--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+    opcoes = medicao.opcoes_pedidas(args)
+
+    falhas = medicao.comparar(casos(args.tamanho), medicao.versao(opcoes),
+                              medicao.versao(dict(opcoes, sem_limites=True)),
+                              rotulos=('com', 'sem'), repeticoes=args.repeticoes)
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import sys, copy, time, argparse, tracemalloc
+
+import parser as compilador
+from lexer import build_lexer
+from gerador import GeradorPascal
+from semantica import anotar_tipos
+from arvore import No, campos
+
+# ---------------------------------------------------
+# Benchmark da representação da AST
+#
+# Mede, em entradas grandes, a memória da AST de nós com __slots__
+# (arvore.py) e compara-a com a mesma árvore em tuplos aninhados
+# ('binop', op, esq, dir), a representação anterior (as duas cópias
+# partilham os nomes e os literais, só a estrutura conta). Mede também o
+# tempo de construção (lexer + parser), da análise semântica e da geração
+# de código, e o débito em nós por segundo.
+# Entradas: um programa gerado (gerador.py) com muitas instruções e uma
+# expressão a + a + … + a com muitos termos.
+#
+# Uso: python bench_ast.py [--instrucoes N] [--termos N] [-r REPETICOES]
+# ---------------------------------------------------
+
+def copiar(raiz, em_tuplos):
+    """
+    Cópia da árvore com os mesmos valores (nomes, literais) partilhados:
+    em nós de arvore.py ou, se 'em_tuplos', em tuplos (etiqueta, campos…)
+    com a etiqueta partilhada, como ('binop', op, esq, dir). As listas de
+    statements também são copiadas. Devolve (cópia, nº de nós).
+    """
+    formas = {}                 # classe → (etiqueta, campos)
+    resultados = []
+    nos = 0
+    pendentes = [(raiz, False)]
+    while pendentes:
+        x, pronto = pendentes.pop()
+        if isinstance(x, list):
+            if pronto:
+                inicio = len(resultados) - len(x)
+                lista = resultados[inicio:]
+                del resultados[inicio:]
+                resultados.append(lista)
+            else:
+                pendentes.append((x, True))
+                pendentes.extend((y, False) for y in reversed(x))
+        elif isinstance(x, No):
+            cls = type(x)
+            if cls not in formas:
+                nomes = list(campos(cls))
+                if em_tuplos and 'tipo' in nomes:
+                    nomes.remove('tipo')
+                formas[cls] = (sys.intern(cls.__name__.lower()), nomes)
+            etiqueta, nomes = formas[cls]
+            if pronto:
+                inicio = len(resultados) - len(nomes)
+                if em_tuplos:
+                    no = (etiqueta,) + tuple(resultados[inicio:])
+                else:
+                    no = object.__new__(cls)
+                    for nome, valor in zip(nomes, resultados[inicio:]):
+                        setattr(no, nome, valor)
+                del resultados[inicio:]
+                resultados.append(no)
+                nos += 1
+            else:
+                pendentes.append((x, True))
+                pendentes.extend((getattr(x, c), False) for c in reversed(nomes))
+        else:
+            resultados.append(x)
+    return resultados.pop(), nos
+
+def analisar(texto):
+    ctx = compilador.CompilationContext()
+    lexer = build_lexer()
+    lexer.contexto = ctx
+    return copy.copy(compilador.obter_parser()).parse(texto, lexer=lexer), ctx
+
+def memoria(funcao):
+    """(resultado, bytes alocados por funcao() que continuam vivos no fim)."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcao()
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, depois - antes
+
+def medir(texto, repeticoes):
+    """Melhores tempos (construção, semântica, codegen) em segundos e nº de instruções."""
+    melhores = [float('inf')] * 3
+    instrucoes = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        ast, ctx = analisar(texto)
+        t1 = time.perf_counter()
+        anotar_tipos(ast, ctx.tabela_variaveis)
+        t2 = time.perf_counter()
+        compilador.generate_code(ast, ctx)
+        t3 = time.perf_counter()
+        instrucoes = len(ctx.codigo_meio)
+        for i, t in enumerate((t1 - inicio, t2 - t1, t3 - t2)):
+            melhores[i] = min(melhores[i], t)
+    return melhores, instrucoes
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark da representação da AST.")
+    ap.add_argument("--instrucoes", type=int, default=20_000,
+                    help="instruções do programa gerado")
+    ap.add_argument("--termos", type=int, default=100_000,
+                    help="termos da expressão a + a + … + a")
+    ap.add_argument("-r", "--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+
+    entradas = [
+        (f"programa gerado ({args.instrucoes} instr.)",
+         GeradorPascal(semente=1, instrucoes=args.instrucoes).programa("Grande")),
+        (f"a + a + … ({args.termos} termos)",
+         "program Soma;\nvar a, x: integer;\nbegin\nx := "
+         + " + ".join(["a"] * args.termos) + "\nend.\n"),
+    ]
+
+    for descricao, texto in entradas:
+        (ast, _), bytes_ast = memoria(lambda: analisar(texto))
+        (_, nos), bytes_nos = memoria(lambda: copiar(ast, em_tuplos=False))
+        _, bytes_tuplos = memoria(lambda: copiar(ast, em_tuplos=True))
+        (t_construcao, t_semantica, t_codegen), instrucoes = medir(texto, args.repeticoes)
+
+        print(f"{descricao}: {nos} nós, {instrucoes} instruções")
+        print(f"  AST do parser:    {bytes_ast / 1024:9.0f} KiB (com nomes e literais)")
+        for nome, b in (("nós __slots__:", bytes_nos), ("tuplos:", bytes_tuplos)):
+            print(f"  {nome:<18}{b / 1024:9.0f} KiB ({b / nos:5.1f} B/nó)")
+        for nome, t in (("construção", t_construcao), ("semântica", t_semantica),
+                        ("geração de código", t_codegen)):
+            print(f"  {nome + ':':<18}{t * 1000:9.1f} ms ({nos / t / 1e6:5.2f} M nós/s)")
+        print()
+
+if __name__ == "__main__":
+    main()
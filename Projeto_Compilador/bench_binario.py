@@ -0,0 +1,71 @@
+import os, sys, time, tempfile, argparse
+
+import parser as compilador
+import ewvm
+from instrucoes import escrever
+from divisor import dividir_programas
+from gerador import GeradorPascal
+
+# ---------------------------------------------------
+# Benchmark do formato binário (.ewvmb)
+#
+# Escreve cada programa em texto (.ewvm) e em binário (.ewvmb) numa
+# diretoria temporária e compara o tamanho dos ficheiros e o tempo de os
+# carregar com ewvm.carregar_ficheiro (texto: divisão e análise das linhas
+# e resolução dos rótulos; binário: leitura do mmap, saltos já resolvidos).
+# Os dois Programas carregados têm de ter exatamente as mesmas instruções.
+# Programas: os de input.txt e programas grandes do gerador (gerador.py).
+#
+# Uso: python bench_binario.py [-n INSTRUCOES] [-r REPETICOES]
+# ---------------------------------------------------
+
+ENTRADA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input.txt')
+
+def casos(n):
+    """(nome, texto) dos programas medidos."""
+    with open(ENTRADA, 'r', encoding='utf-8') as f:
+        lista = [(nome, trecho) for nome, trecho, _ in dividir_programas(f)]
+    for semente in (1, 2):
+        lista.append((f"gerado{semente}", GeradorPascal(semente=semente, variaveis=20, instrucoes=n,
+                                                        profundidade=4).programa("G")))
+    return lista
+
+def medir_carga(caminho, repeticoes):
+    """(Programa, melhor tempo de CPU em segundos) de carregar 'caminho'."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.process_time()
+        programa = ewvm.carregar_ficheiro(caminho)
+        melhor = min(melhor, time.process_time() - inicio)
+    return programa, melhor
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark do formato binário (.ewvmb).")
+    ap.add_argument("-n", "--instrucoes", type=int, default=2000, help="statements dos programas gerados")
+    ap.add_argument("-r", "--repeticoes", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'programa':<14}{'instruções':>12}{'bytes texto':>13}{'binário':>9}{'redução':>9}"
+          f"{'ms texto':>10}{'binário':>9}")
+    falhas = 0
+    with tempfile.TemporaryDirectory() as diretoria:
+        for nome, texto in casos(args.instrucoes):
+            programa = compilador.compilar_programa(texto)
+            caminho_texto = os.path.join(diretoria, f"{nome}.ewvm")
+            caminho_binario = os.path.join(diretoria, f"{nome}.ewvmb")
+            escrever(programa, caminho_texto, False)
+            escrever(programa, caminho_binario, True)
+            de_texto, t_texto = medir_carga(caminho_texto, args.repeticoes)
+            de_binario, t_binario = medir_carga(caminho_binario, args.repeticoes)
+            if de_texto.codigo != de_binario.codigo or de_texto.para_texto() != de_binario.para_texto():
+                print(f"{nome}: programas diferentes")
+                falhas += 1
+                continue
+            b_texto = os.path.getsize(caminho_texto)
+            b_binario = os.path.getsize(caminho_binario)
+            print(f"{nome:<14}{len(programa):>12}{b_texto:>13}{b_binario:>9}"
+                  f"{(1 - b_binario / b_texto) * 100:>8.1f}%{t_texto * 1000:>10.2f}{t_binario * 1000:>9.2f}")
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
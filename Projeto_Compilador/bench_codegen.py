@@ -0,0 +1,102 @@
+import sys, copy, time, argparse
+
+import parser as compilador
+from lexer import build_lexer
+from otimizador import dobrar_constantes, otimizar_peephole
+from semantica import anotar_tipos
+from instrucoes import montar
+
+# ---------------------------------------------------
+# Benchmark de stress da geração de código
+#
+# Compila programas com ASTs muito profundas, bem acima do limite de
+# recursão do Python (sys.getrecursionlimit()):
+#   - uma expressão a + a + … + a com 100 000 termos (árvore à esquerda);
+#   - uma expressão (a + (a + (… + a))) com 10 000 níveis de parênteses;
+#   - 10 000 blocos begin … end aninhados;
+#   - 10 000 if … then aninhados.
+# Para cada um mede a análise (lexer, parser e tipos), a dobragem de constantes,
+# a geração de código, o peephole e a montagem/escrita do texto .ewvm, e
+# confirma o número de instruções esperado.
+#
+# Uso: python bench_codegen.py [--termos N] [--profundidade N] [-r REPETICOES]
+# ---------------------------------------------------
+
+def programa(corpo):
+    return f"program Stress;\nvar a, x: integer;\nbegin\n{corpo}\nend.\n"
+
+def casos(termos, profundidade):
+    """Lista de (descrição, texto do programa, instruções esperadas)."""
+    n = profundidade
+    return [
+        (f"a + a + … ({termos} termos)",
+         programa("x := " + " + ".join(["a"] * termos)),
+         # PUSHG por termo, ADD entre termos, STOREG e STOP
+         termos + (termos - 1) + 2),
+        (f"(a + (a + …)) ({n} níveis)",
+         programa("x := " + "(a + " * n + "a" + ")" * n),
+         (n + 1) + n + 2),
+        (f"begin … end ({n} níveis)",
+         programa("begin " * n + "x := a" + " end" * n),
+         2 + 1),
+        (f"if … then ({n} níveis)",
+         programa("if a < 1 then " * n + "x := a"),
+         # por if: PUSHG, PUSHI, INF, JZ, JUMP
+         5 * n + 2 + 1),
+    ]
+
+def analisar(texto):
+    ctx = compilador.CompilationContext()
+    lexer = build_lexer()
+    lexer.contexto = ctx
+    ast = copy.copy(compilador.obter_parser()).parse(texto, lexer=lexer)
+    anotar_tipos(ast, ctx.tabela_variaveis)
+    return ast, ctx
+
+def medir(funcao, repeticoes):
+    """Melhor tempo de 'repeticoes' execuções de funcao() → (resultado, segundos)."""
+    melhor, resultado = float('inf'), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return resultado, melhor
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de stress da geração de código.")
+    ap.add_argument("--termos", type=int, default=100_000)
+    ap.add_argument("--profundidade", type=int, default=10_000)
+    ap.add_argument("-r", "--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"Limite de recursão do Python: {sys.getrecursionlimit()}\n")
+    print(f"{'caso':<30}{'análise':>10}{'dobragem':>10}{'codegen':>10}"
+          f"{'peephole':>10}{'texto':>10}{'instruções':>12}   (ms)")
+    falhas = 0
+    for descricao, texto, esperadas in casos(args.termos, args.profundidade):
+        (ast, ctx), t_analise = medir(lambda: analisar(texto), args.repeticoes)
+        _, t_dobragem = medir(lambda: dobrar_constantes(ast), args.repeticoes)
+
+        def gerar():
+            c = compilador.CompilationContext()
+            c.tabela_variaveis = ctx.tabela_variaveis
+            compilador.generate_code(ast, c)
+            return c.codigo_meio
+        codigo, t_codegen = medir(gerar, args.repeticoes)
+        _, t_peephole = medir(lambda: otimizar_peephole(codigo), args.repeticoes)
+        def escrever():
+            p = montar(ctx.tabela_variaveis, codigo)
+            p.para_texto()
+            return p
+        programa_ewvm, t_texto = medir(escrever, args.repeticoes)
+
+        n = len(programa_ewvm)
+        if n != esperadas:
+            falhas += 1
+        print(f"{descricao:<30}" + "".join(f"{t * 1000:>10.1f}" for t in
+                                           (t_analise, t_dobragem, t_codegen, t_peephole, t_texto))
+              + f"{n:>12}" + ("" if n == esperadas else f"   ESPERADAS {esperadas}"))
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
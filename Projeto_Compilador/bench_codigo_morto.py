@@ -0,0 +1,59 @@
+import sys
+
+import medicao
+
+# ---------------------------------------------------
+# Benchmark da eliminação de código morto (--codigo-morto)
+#
+# Compila cada programa com e sem a opção 'codigo_morto' e, para cada um,
+# conta as instruções e os bytes do .ewvm e as instruções executadas pelo
+# interpretador (ewvm.py), com medicao.comparar; no fim mostra o tempo
+# total da passagem. As duas versões têm de escrever exatamente o mesmo.
+# Programas: os de input.txt, um programa com ramos constantes e escritas
+# mortas, e o corpus sintético do gerador (gerador.py).
+#
+# Uso: python bench_codigo_morto.py [-n ITERACOES] [--programas N] [--peephole] [--slots]
+# ---------------------------------------------------
+
+def casos(n):
+    """(nome, texto, linhas de entrada) dos programas medidos."""
+    lista = [(nome, trecho, ["7", "3", "5"]) for nome, trecho in medicao.programas_entrada()]
+    lista.append(("ramos", f"""program Ramos;
+var i, s, t, ultimo, depurar: integer;
+begin
+  s := 0;
+  for i := 1 to {n} do
+  begin
+    t := i * 3 + 1;
+    ultimo := i;
+    if true then s := s + i mod 7 else s := s - 1;
+    while false do depurar := depurar + 1
+  end;
+  writeln(s)
+end.
+""", []))
+    return lista
+
+def main():
+    ap = medicao.argumentos("Benchmark da eliminação de código morto.")
+    ap.add_argument("-n", "--iteracoes", type=int, default=20000, help="iterações do programa 'ramos'")
+    ap.add_argument("--programas", type=int, default=200, help="programas do corpus sintético")
+    args = ap.parse_args()
+    base = medicao.opcoes_pedidas(args)
+
+    passagem = []
+
+    def sem_codigo_morto(texto):
+        programa, ctx = medicao.compilar(texto, dict(base, codigo_morto=True, perfil=True))
+        passagem.append(ctx.perfil.fases['codigo_morto'])
+        return programa
+
+    lista = casos(args.iteracoes)
+    if args.programas:
+        lista.append(("corpus", medicao.corpus(args.programas), None))
+    falhas = medicao.comparar(lista, medicao.versao(base), sem_codigo_morto)
+    print(f"\nPassagem de código morto: {sum(passagem) * 1000:.2f} ms em {len(passagem)} programa(s).")
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+import gc, sys, copy, json, time, platform, argparse
+
+import parser as compilador
+from lexer import build_lexer
+from lexer_rapido import tokenizar, Token
+from incremental import Fichas
+from semantica import anotar_tipos
+from perfil import Perfil
+from gerador import FORMAS, gerador_forma
+
+# ---------------------------------------------------
+# Benchmark do compilador por fases, com linha de base
+#
+# Gera um programa sintético de cada forma (gerador.py: misto, muitas
+# variáveis, aninhamento profundo, expressões longas, muitos ciclos) e mede
+# separadamente o débito de cada fase:
+#   - lexer:        lexer PLY (tokens/s);
+#   - lexer_rapido: tokenizar() de lexer_rapido.py (tokens/s);
+#   - parser:       só o parser, sobre os tokens já lidos (tokens/s);
+#   - semantica:    anotar_tipos (nós/s);
+#   - codegen:      generate_code (instruções/s).
+# Cada medida é o melhor tempo de CPU de REPETICOES execuções, sem o
+# coletor de lixo.
+# Com --guardar os resultados ficam num ficheiro JSON (a linha de base);
+# com --comparar são comparados com uma linha de base anterior, pelo
+# débito, e uma fase mais lenta do que a tolerância conta como regressão
+# (código de saída 1). Os tempos são divididos pelo de uma carga fixa de
+# Python puro (calibrar()) medida na mesma execução, para que a velocidade
+# variável da máquina (frequência, outros processos) não pareça uma
+# regressão. Ainda assim, as linhas de base dependem da máquina: não vão
+# para o repositório.
+#
+# Uso: python bench_compilador.py [--tamanho N] [--formas F,…] [-r REPETICOES]
+#                                 [--guardar FICHEIRO] [--comparar FICHEIRO] [--tolerancia PCT]
+# ---------------------------------------------------
+
+VERSAO_FORMATO = 1
+
+def _contar_ply(texto):
+    lexer = build_lexer()
+    lexer.input(texto)
+    n = 0
+    while lexer.token() is not None:
+        n += 1
+    return n
+
+def _contar_rapido(texto):
+    return sum(1 for _ in tokenizar(texto))
+
+def _analisar(fichas):
+    ctx = compilador.CompilationContext()
+    return copy.copy(compilador.obter_parser()).parse(lexer=Fichas(fichas, ctx)), ctx
+
+def medir(preparar, funcao, repeticoes):
+    """
+    Melhor tempo de CPU de funcao(preparar()) (preparar não é medido) →
+    (resultado, segundos). Tempo de CPU do processo e não tempo real: não
+    conta o tempo em que outros processos ocupam o processador. Como no
+    timeit, o coletor de lixo fica desligado durante a medição.
+    """
+    melhor, resultado = float('inf'), None
+    for _ in range(repeticoes):
+        dados = preparar()
+        gc.collect()
+        gc.disable()
+        try:
+            inicio = time.process_time()
+            resultado = funcao(dados)
+            melhor = min(melhor, time.process_time() - inicio)
+        finally:
+            gc.enable()
+    return resultado, melhor
+
+def _carga_fixa():
+    # Operações típicas do compilador: dicionários, listas, tuplos e strings
+    d, lista = {}, []
+    for i in range(200_000):
+        chave = f"v{i & 1023}"
+        d[chave] = d.get(chave, 0) + 1
+        lista.append((i, chave))
+    return len(lista) + len(d)
+
+def calibrar(repeticoes):
+    """Segundos da carga fixa de referência nesta máquina, agora."""
+    return medir(lambda: None, lambda _: _carga_fixa(), repeticoes)[1]
+
+def medir_forma(texto, repeticoes):
+    """{fase: {'segundos', 'unidades', 'unidade'}} para o programa 'texto'."""
+    fichas = [Token(*t) for t in tokenizar(texto)]
+    nada = lambda: None
+    resultados = {}
+
+    n, t = medir(nada, lambda _: _contar_ply(texto), repeticoes)
+    resultados['lexer'] = {'segundos': t, 'unidades': n, 'unidade': 'tokens'}
+    n, t = medir(nada, lambda _: _contar_rapido(texto), repeticoes)
+    resultados['lexer_rapido'] = {'segundos': t, 'unidades': n, 'unidade': 'tokens'}
+
+    _, t = medir(nada, lambda _: _analisar(fichas), repeticoes)
+    resultados['parser'] = {'segundos': t, 'unidades': len(fichas), 'unidade': 'tokens'}
+
+    # A análise semântica memoriza os tipos nos nós: cada repetição usa uma AST nova
+    def anotar(dados):
+        anotar_tipos(dados[0], dados[1].tabela_variaveis)
+        return dados
+    (ast, ctx), t = medir(lambda: _analisar(fichas), anotar, repeticoes)
+    perfil = Perfil()
+    perfil.contar_nos(ast)
+    resultados['semantica'] = {'segundos': t, 'unidades': perfil.nos, 'unidade': 'nós'}
+
+    def gerar(_):
+        c = compilador.CompilationContext()
+        c.tabela_variaveis = ctx.tabela_variaveis
+        compilador.generate_code(ast, c)
+        return len(c.codigo_meio)
+    n, t = medir(nada, gerar, repeticoes)
+    resultados['codegen'] = {'segundos': t, 'unidades': n, 'unidade': 'instruções'}
+    return resultados
+
+def comparar(base, atual, tolerancia):
+    """Linhas da comparação com a linha de base e número de regressões."""
+    linhas, regressoes = [], 0
+    for forma, fases in atual['resultados'].items():
+        for fase, r in fases.items():
+            b = base.get('resultados', {}).get(forma, {}).get(fase)
+            if b is None:
+                continue
+            # Compara débitos (unidades/s), não depende do tamanho exato do
+            # programa, em unidades da carga de calibração
+            antes = b['unidades'] / (b['segundos'] / base['calibracao'])
+            agora = r['unidades'] / (r['segundos'] / atual['calibracao'])
+            variacao = antes / agora - 1
+            marca = ""
+            if variacao > tolerancia:
+                marca = "  REGRESSÃO"
+                regressoes += 1
+            elif variacao < -tolerancia:
+                marca = "  melhoria"
+            linhas.append(f"{forma:<14}{fase:<14}{b['segundos'] * 1000:>10.1f}{r['segundos'] * 1000:>10.1f}"
+                          f"{variacao * 100:>+9.1f}%{marca}")
+    return linhas, regressoes
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark do compilador por fases, com linha de base.")
+    ap.add_argument("--tamanho", type=int, default=2000, help="instruções simples de cada programa")
+    ap.add_argument("--formas", default=",".join(FORMAS), help=f"formas a medir (de {', '.join(FORMAS)})")
+    ap.add_argument("--semente", type=int, default=1)
+    ap.add_argument("-r", "--repeticoes", type=int, default=5)
+    ap.add_argument("--guardar", metavar="FICHEIRO", help="guarda os resultados como linha de base")
+    ap.add_argument("--comparar", metavar="FICHEIRO", help="compara com uma linha de base")
+    ap.add_argument("--tolerancia", type=float, default=15.0, metavar="PCT",
+                    help="abrandamento (%%) a partir do qual uma fase conta como regressão")
+    args = ap.parse_args()
+
+    atual = {
+        'versao': VERSAO_FORMATO,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'parametros': {'tamanho': args.tamanho, 'semente': args.semente, 'repeticoes': args.repeticoes},
+        'calibracao': calibrar(args.repeticoes),
+        'resultados': {},
+    }
+    print(f"{'forma':<14}{'fase':<14}{'unidades':>12}{'ms':>10}{'M/s':>8}")
+    for forma in args.formas.split(","):
+        texto = gerador_forma(forma, args.tamanho, args.semente).programa("Bench")
+        resultados = medir_forma(texto, args.repeticoes)
+        atual['resultados'][forma] = resultados
+        for fase, r in resultados.items():
+            print(f"{forma:<14}{fase:<14}{r['unidades']:>12}{r['segundos'] * 1000:>10.1f}"
+                  f"{r['unidades'] / r['segundos'] / 1e6:>8.2f}  {r['unidade']}")
+    # Calibra também no fim: a média aproxima melhor a velocidade durante as medidas
+    atual['calibracao'] = (atual['calibracao'] + calibrar(args.repeticoes)) / 2
+    print(f"\ncalibração: {atual['calibracao'] * 1000:.1f} ms")
+
+    if args.guardar:
+        with open(args.guardar, 'w', encoding='utf-8') as f:
+            json.dump(atual, f, indent=2, ensure_ascii=False)
+        print(f"\nLinha de base guardada em {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        if base.get('versao') != VERSAO_FORMATO:
+            print(f"\nFormato de {args.comparar} desconhecido")
+            return 2
+        if base.get('parametros') != atual['parametros'] or base.get('python') != atual['python']:
+            print(f"\nAviso: a linha de base usou outros parâmetros ou outra versão do Python "
+                  f"({base.get('parametros')}, Python {base.get('python')})")
+        linhas, regressoes = comparar(base, atual, args.tolerancia / 100)
+        print(f"\n{'forma':<14}{'fase':<14}{'base ms':>10}{'atual ms':>10}{'variação':>10}")
+        print("\n".join(linhas))
+        print(f"\n{regressoes} regressão(ões) acima de {args.tolerancia:g}%")
+        return 1 if regressoes else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import sys
+
+import medicao
+
+# ---------------------------------------------------
+# Benchmark das condições em curto-circuito (--curto-circuito)
+#
+# Compila cada programa com e sem a opção 'curto_circuito' e executa-o no
+# interpretador (ewvm.py): conta as instruções executadas e mede o tempo de
+# CPU (medicao.comparar). As duas versões têm de escrever exatamente o mesmo.
+# Programas:
+#   - NumeroPrimo de input.txt, com um primo grande na entrada;
+#   - contagem de primos, com o teste (d * d <= k) and primo;
+#   - múltiplos de 3 ou 5 e contagem num intervalo (if com or / and);
+#   - o corpus sintético do gerador (gerador.py).
+#
+# Uso: python bench_curto_circuito.py [-n LIMITE] [-r REPETICOES] [--programas N]
+#                                     [--peephole] [--slots]
+# ---------------------------------------------------
+
+def _numero_primo():
+    for nome, trecho in medicao.programas_entrada():
+        if nome == 'NumeroPrimo':
+            return trecho
+    raise ValueError(f"NumeroPrimo não encontrado em {medicao.ENTRADA}")
+
+def casos(n):
+    """(nome, texto, linhas de entrada) dos programas com ciclos."""
+    return [
+        ("NumeroPrimo", _numero_primo(), ["100003"]),
+        ("primos", f"""program Primos;
+var k, d, total: integer; primo: boolean;
+begin
+  total := 0;
+  for k := 2 to {n} do
+  begin
+    primo := true;
+    d := 2;
+    while (d * d <= k) and primo do
+    begin
+      if k mod d = 0 then primo := false;
+      d := d + 1
+    end;
+    if primo then total := total + 1
+  end;
+  writeln(total)
+end.
+""", []),
+        ("multiplos", f"""program Multiplos;
+var i, s: integer;
+begin
+  s := 0;
+  for i := 1 to {n * 10} do
+    if (i mod 3 = 0) or (i mod 5 = 0) then s := s + i;
+  writeln(s)
+end.
+""", []),
+        ("intervalo", f"""program Intervalo;
+var i, x, c: integer;
+begin
+  c := 0; x := 7;
+  for i := 1 to {n * 10} do
+  begin
+    x := (x * 31 + 11) mod 1000;
+    if (x >= 250) and (x < 500) or (x = 999) then c := c + 1
+  end;
+  writeln(c)
+end.
+""", []),
+    ]
+
+def main():
+    ap = medicao.argumentos("Benchmark das condições em curto-circuito.")
+    ap.add_argument("-n", "--limite", type=int, default=20000, help="tamanho dos ciclos")
+    ap.add_argument("-r", "--repeticoes", type=int, default=3)
+    ap.add_argument("--programas", type=int, default=200, help="programas do corpus sintético")
+    args = ap.parse_args()
+    base = medicao.opcoes_pedidas(args)
+
+    lista = casos(args.limite) + [("corpus", medicao.corpus(args.programas), None)]
+    falhas = medicao.comparar(lista, medicao.versao(base), medicao.versao(dict(base, curto_circuito=True)),
+                              repeticoes=args.repeticoes)
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import io, sys, time, argparse
+
+from divisor import dividir_programas
+from gerador import GeradorPascal
+
+# ---------------------------------------------------
+# Benchmark da divisão do ficheiro de entrada em programas (divisor.py)
+#
+# Antes de medir faz um teste diferencial: cada caso-limite é dividido com
+# blocos de leitura de vários tamanhos (de 1 carácter ao tamanho normal),
+# que têm de dar exatamente os mesmos programas, e os nomes obtidos têm de
+# ser os esperados. Depois mede o tempo de dividir um ficheiro grande,
+# gerado com gerador.py, com o tamanho de bloco normal.
+#
+# Uso: python bench_divisor.py [--programas N] [-r REPETICOES]
+# ---------------------------------------------------
+
+# (texto, nomes esperados) dos casos-limite
+CASOS = [
+    ("program A; begin writeln('end.') end.\nprogram B; begin end.\n", ['A', 'B']),
+    ("program A; { end. } (* end. *) begin end. program B; begin end.", ['A', 'B']),
+    ("lixo antes\nprogram A; begin end.\nlixo depois", ['A']),
+    # Aspa sem par: ignorada até ao fim da linha, não esconde o "end." nem B
+    ("program A; begin writeln('oops); end.\nprogram B; begin writeln('ok') end.\n", ['A', 'B']),
+    # Ficheiro a acabar a meio de um programa: o resto é devolvido na mesma
+    ("program A; begin end.\nprogram B; begin writeln('oops) end.\n", ['A', 'B']),
+    ("program A; begin writeln(1)\n", ['A']),
+    ("program A; { comentário sem fim\nbegin end.", ['A']),
+    # Comentário sem fecho: ignorado, não esconde o "end." nem B
+    ("program A; { oops\nbegin end.\nprogram B; begin end.\n", ['A', 'B']),
+    ("program A; (* oops\nbegin end.\nprogram B; begin end.\n", ['A', 'B']),
+    ("program A; begin end.\nprogram B; { oops\nbegin writeln(1)\n", ['A', 'B']),
+]
+
+TAMANHOS = (1, 2, 3, 7, 64, 1 << 20)
+
+def teste_diferencial(casos):
+    """Número de casos em que os tamanhos de bloco discordam ou os nomes não são os esperados."""
+    falhas = 0
+    for texto, nomes in casos:
+        resultados = [list(dividir_programas(io.StringIO(texto), t)) for t in TAMANHOS]
+        obtidos = [nome for nome, _, _ in resultados[0]]
+        if any(r != resultados[0] for r in resultados) or obtidos != nomes:
+            print(f"FALHA em {texto!r}: {obtidos} (esperado {nomes})")
+            falhas += 1
+    return falhas
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark da divisão do ficheiro em programas.")
+    ap.add_argument("--programas", type=int, default=2000, help="programas do ficheiro gerado")
+    ap.add_argument("-r", "--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+
+    falhas = teste_diferencial(CASOS)
+    if falhas:
+        return 1
+    print(f"Teste diferencial: {len(CASOS)} casos, {len(TAMANHOS)} tamanhos de bloco, resultados idênticos.\n")
+
+    texto = "\n".join(GeradorPascal(semente=s, instrucoes=20).programa(f"P{s}")
+                      for s in range(args.programas))
+    melhor = float('inf')
+    for _ in range(args.repeticoes):
+        inicio = time.process_time()
+        n = sum(1 for _ in dividir_programas(io.StringIO(texto)))
+        melhor = min(melhor, time.process_time() - inicio)
+    print(f"{n} programas, {len(texto) / 1e6:.1f} MB: {melhor * 1000:.1f} ms "
+          f"({len(texto) / 1e6 / max(melhor, 1e-9):.1f} MB/s)")
+    return 0 if n == args.programas else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import sys, contextlib
+
+import parser as compilador
+import medicao
+from arvore import For
+from instrucoes import PUSHG, STOREG, PUSHI, ADD, SUB, INFEQ, SUPEQ, JZ, JUMP
+
+# ---------------------------------------------------
+# Benchmark da tradução dos ciclos for
+#
+# Compara a tradução clássica (teste no topo, com o limite reavaliado em
+# cada iteração e um JUMP de volta), reconstruída aqui, com a atual (limite
+# avaliado uma vez e teste no fim do ciclo, ver _gerar_for em parser.py).
+# Para cada caso conta as instruções do .ewvm e as executadas pelo
+# interpretador (ewvm.py), e mede o tempo de execução (medicao.comparar);
+# as duas versões têm de escrever exatamente o mesmo.
+# Casos: limite literal, variável e expressão, e ciclos aninhados.
+#
+# Uso: python bench_for.py [-n ITERACOES] [-r REPETICOES] [--peephole] [--slots]
+# ---------------------------------------------------
+
+def _gerar_for_classico(no, ctx, emitir, agenda):
+    """Tradução anterior: i := inicio; L: if not (i <= limite) goto S; corpo; i := i+1; goto L; S:"""
+    tipo_var, idx = ctx.tabela_variaveis[no.var]
+    etiqueta_inicio = ctx.nova_etiqueta()
+    etiqueta_saida = ctx.nova_etiqueta()
+    agenda.append((None, etiqueta_saida))
+    agenda.append((JUMP, etiqueta_inicio))
+    agenda.append((STOREG, idx))
+    agenda.append((ADD if no.direcao == 'to' else SUB, None))
+    agenda.append((PUSHI, 1))
+    agenda.append((PUSHG, idx))
+    agenda.append(no.corpo)
+    agenda.append((JZ, etiqueta_saida))
+    agenda.append((INFEQ if no.direcao == 'to' else SUPEQ, None))
+    agenda.append(no.limite)
+    agenda.append((PUSHG, idx))
+    agenda.append((None, etiqueta_inicio))
+    agenda.append((STOREG, idx))
+    agenda.append(no.inicio)
+
+@contextlib.contextmanager
+def traducao_classica():
+    atual = compilador._GERADORES[For]
+    compilador._GERADORES[For] = _gerar_for_classico
+    try:
+        yield
+    finally:
+        compilador._GERADORES[For] = atual
+
+def casos(n):
+    """(nome, texto, entrada) dos programas medidos; cada um corre cerca de n iterações."""
+    raiz = max(2, int(n ** 0.5))
+    cabecalho = "program B;\nvar i, j, n, m, s: integer;\nbegin\n  n := {n}; m := {m}; s := 0;\n"
+    fim = "  writeln(s, ' ', i)\nend.\n"
+    return [
+        ("literal", cabecalho.format(n=n, m=raiz)
+            + f"  for i := 1 to {n} do s := s + i;\n" + fim, []),
+        ("variável", cabecalho.format(n=n, m=raiz)
+            + "  for i := 1 to n do s := s + i;\n" + fim, []),
+        ("expressão", cabecalho.format(n=n, m=raiz)
+            + "  for i := n * 2 - 1 downto (n div 2) * 2 do s := s + i mod 7;\n" + fim, []),
+        ("aninhados", cabecalho.format(n=n, m=raiz)
+            + "  for i := 1 to m do\n    for j := i to m + i do s := s + j;\n" + fim, []),
+    ]
+
+def main():
+    ap = medicao.argumentos("Benchmark da tradução dos ciclos for.")
+    ap.add_argument("-n", "--iteracoes", type=int, default=20000, help="iterações de cada ciclo")
+    ap.add_argument("-r", "--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+    atual = medicao.versao(medicao.opcoes_pedidas(args))
+
+    def classica(texto):
+        with traducao_classica():
+            return atual(texto)
+
+    falhas = medicao.comparar(casos(args.iteracoes), classica, atual, repeticoes=args.repeticoes)
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import re, sys, time, random, argparse
+
+import parser as compilador
+from gerador import GeradorPascal
+from incremental import CompilacaoIncremental
+
+# ---------------------------------------------------
+# Benchmark da recompilação incremental
+#
+# Gera um programa grande (gerador.py) e aplica-lhe uma sequência de
+# edições pequenas (troca de um literal numérico no corpo, como num editor).
+# Para cada versão mede a compilação completa (compilar_programa) e a
+# recompilação incremental (incremental.py), e confirma que as duas dão
+# exatamente as mesmas instruções (os rótulos podem ter outros nomes, mas
+# os saltos resolvidos têm de coincidir).
+#
+# Uso: python bench_incremental.py [--instrucoes N] [--edicoes N] [--dobragem] [--peephole]
+# ---------------------------------------------------
+
+def editar(texto, rng):
+    """Troca um literal numérico aleatório do corpo do programa."""
+    corpo = texto.index('begin') if 'begin' in texto else 0
+    numeros = [m for m in re.finditer(r'\b\d+\b', texto) if m.start() > corpo]
+    m = rng.choice(numeros)
+    return texto[:m.start()] + str(rng.randrange(1, 100)) + texto[m.end():]
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark da recompilação incremental.")
+    ap.add_argument("--instrucoes", type=int, default=2000, help="instruções do programa gerado")
+    ap.add_argument("--edicoes", type=int, default=20)
+    ap.add_argument("--dobragem", action="store_true")
+    ap.add_argument("--peephole", action="store_true")
+    args = ap.parse_args()
+
+    opcoes = {'dobragem': args.dobragem, 'peephole': args.peephole}
+    rng = random.Random(1)
+    texto = GeradorPascal(semente=1, instrucoes=args.instrucoes).programa("Editado")
+    sessao = CompilacaoIncremental(opcoes)
+
+    inicio = time.perf_counter()
+    sessao.compilar(texto)
+    print(f"{args.instrucoes} instruções, {len(texto.splitlines())} linhas; "
+          f"primeira compilação: {(time.perf_counter() - inicio) * 1000:.1f} ms\n")
+
+    total_completa = total_incremental = 0.0
+    diferentes = 0
+    for _ in range(args.edicoes):
+        texto = editar(texto, rng)
+
+        inicio = time.perf_counter()
+        completo = compilador.compilar_programa(texto, ctx=compilador.CompilationContext(opcoes))
+        t_completa = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        incremental = sessao.compilar(texto)
+        t_incremental = time.perf_counter() - inicio
+
+        total_completa += t_completa
+        total_incremental += t_incremental
+        if completo.codigo != incremental.codigo:
+            diferentes += 1
+
+    n = args.edicoes
+    print(f"compilação completa:    {total_completa / n * 1000:8.1f} ms por edição")
+    print(f"recompilação incremental: {total_incremental / n * 1000:6.1f} ms por edição "
+          f"({total_completa / max(total_incremental, 1e-9):.0f}x)")
+    print(f"resultados diferentes:  {diferentes}")
+    return 1 if diferentes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import io, os, re, sys, time, tempfile, argparse, contextlib
+import importlib.util
+
+import lexer as lexer_atual
+import lexer_rapido
+from gerador import GeradorPascal
+
+# ---------------------------------------------------
+# Benchmark do analisador léxico
+#
+# Compara três analisadores léxicos:
+#   - o lexer PLY clássico (uma regra t_PALAVRA com \b…\b por palavra
+#     reservada, antes de t_ID), reconstruído aqui a partir das regras atuais;
+#   - o lexer PLY atual (palavras reservadas classificadas por dicionário);
+#   - o lexer rápido de lexer_rapido.py (sem PLY), pela interface token() e
+#     pelo gerador de tuplos tokenizar().
+# Antes de medir faz um teste diferencial: todos têm de produzir exatamente
+# os mesmos tokens (tipo, valor, linha, posição) e as mesmas mensagens de
+# erro, no corpus sintético e num conjunto de casos-limite.
+#
+# Uso: python bench_lexer.py [-n PROGRAMAS] [-r REPETICOES]
+# ---------------------------------------------------
+
+def construir_lexer_classico():
+    """Lexer PLY com uma regra por palavra reservada (versão anterior)."""
+    import ply.lex as lex
+
+    fonte = []
+    for palavra, tipo in lexer_atual.reservadas.items():
+        fonte.append(f"def t_{tipo}(t):\n    r'\\b{palavra}\\b'\n")
+        if tipo in ('TRUE', 'FALSE'):
+            fonte.append(f"    t.value = {tipo == 'TRUE'}\n")
+        fonte.append("    return t\n\n")
+    fonte.append("def t_ID(t):\n    r'[A-Za-z_][A-Za-z0-9_]*'\n    return t\n")
+
+    # O PLY valida as regras lendo a fonte do módulo, por isso este tem de
+    # existir num ficheiro
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = os.path.join(tmp, 'lexer_classico.py')
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(''.join(fonte))
+        spec = importlib.util.spec_from_file_location('lexer_classico', caminho)
+        modulo = importlib.util.module_from_spec(spec)
+        sys.modules['lexer_classico'] = modulo
+        try:
+            spec.loader.exec_module(modulo)
+            for nome in dir(lexer_atual):
+                if (nome.startswith('t_') and nome != 't_ID') or nome == 'tokens':
+                    setattr(modulo, nome, getattr(lexer_atual, nome))
+            return lex.lex(module=modulo, reflags=re.IGNORECASE)
+        finally:
+            del sys.modules['lexer_classico']
+
+# Casos-limite para o teste diferencial
+CASOS = [
+    "",
+    "program P; begin end.",
+    "PROGRAM p; VAR x: Integer; BEGIN x := 10 DIV 3 MoD 2 END.",
+    "a:=b..c<>d<=e>=f<g>h=i+j-k*l/m;n,o:p.q(r)[s]",
+    "x1 _y z_9 programa endx begin_ ifthen",
+    "'texto' 'com \\'aspas\\'' '' 'multi\nlinha' 'end.'",
+    "{ comentario }a{ multi\nlinha }b(* outro *)c(** x **)d(*a*b*)e",
+    "(* nao fechado ( * x",
+    "{ nao fechado",
+    "'nao fechada",
+    "1end 12abc 007 3..4",
+    "true FALSE True falsey",
+    "a @ b # c $ d ! e ? f ~ g",
+    "\n\n  \t\r\n x \n\n\n y",
+    "writeln write readln WRITELN Writeln",
+    "x := 1   ",
+    "   \t\r",
+]
+
+def tokens_ply(lx, texto):
+    lx = lx.clone()
+    lx.input(texto)
+    lx.lineno = 1
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in iter(lx.token, None)]
+
+def tokens_rapido(texto):
+    lx = lexer_rapido.LexerRapido()
+    lx.input(texto)
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in iter(lx.token, None)]
+
+def com_saida(funcao, texto):
+    """Executa funcao(texto) e devolve (resultado, mensagens escritas)."""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        resultado = funcao(texto)
+    return resultado, buf.getvalue()
+
+def teste_diferencial(lexers, textos):
+    """
+    Compara os tokens e mensagens de erro de cada lexer com os do primeiro.
+    Devolve a lista de falhas (descrição, texto).
+    """
+    falhas = []
+    for texto in textos:
+        referencia = com_saida(lexers[0][1], texto)
+        for nome, funcao in lexers[1:]:
+            if com_saida(funcao, texto) != referencia:
+                falhas.append((nome, texto))
+    return falhas
+
+def contar_tokens(lx, texto):
+    lx = lx.clone()
+    lx.input(texto)
+    token = lx.token
+    n = 0
+    while token():
+        n += 1
+    return n
+
+def medir(contar, repeticoes):
+    """Melhor tempo de 'repeticoes' execuções de contar() → (tokens, segundos)."""
+    melhor, n = float('inf'), 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        n = contar()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return n, melhor
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark do analisador léxico.")
+    ap.add_argument("-n", "--programas", type=int, default=400)
+    ap.add_argument("-r", "--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+
+    texto = GeradorPascal(semente=42).corpus(args.programas)
+    print(f"Corpus sintético: {args.programas} programas, {len(texto) / 1024:.0f} KiB")
+
+    classico = construir_lexer_classico()
+    atual = lexer_atual.build_lexer()
+
+    lexers = [
+        ('PLY clássico', lambda t: tokens_ply(classico, t)),
+        ('PLY atual', lambda t: tokens_ply(atual, t)),
+        ('rápido', tokens_rapido),
+    ]
+    falhas = teste_diferencial(lexers, CASOS + [texto])
+    for nome, caso in falhas:
+        print(f"DIFERENÇA no lexer {nome} para o texto {caso[:60]!r}")
+    if falhas:
+        return 1
+    print(f"Teste diferencial: {len(CASOS) + 1} textos, tokens e erros idênticos nos três lexers.\n")
+
+    def contar_tuplos():
+        n = 0
+        for _ in lexer_rapido.tokenizar(texto):
+            n += 1
+        return n
+
+    resultados = [
+        ('PLY, uma regra por palavra reservada', medir(lambda: contar_tokens(classico, texto), args.repeticoes)),
+        ('PLY, dicionário de palavras reservadas', medir(lambda: contar_tokens(atual, texto), args.repeticoes)),
+        ('rápido, token()', medir(lambda: contar_tokens(lexer_rapido.LexerRapido(), texto), args.repeticoes)),
+        ('rápido, tokenizar() (tuplos)', medir(contar_tuplos, args.repeticoes)),
+    ]
+    base = resultados[0][1][1]
+    for nome, (n, seg) in resultados:
+        print(f"{nome:<42}{n / seg:>14,.0f} tokens/s   ({base / seg:.2f}x)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
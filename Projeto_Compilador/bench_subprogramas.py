@@ -0,0 +1,79 @@
+import sys
+
+import medicao
+
+# ---------------------------------------------------
+# Benchmark dos subprogramas (procedure / function)
+#
+# Compila cada programa com a expansão em linha automática (por omissão) e
+# sem ela (opção 'sem_inline', --sem-inline), em que todas as chamadas usam
+# PUSHA/CALL/RETURN. Para cada um conta as instruções do .ewvm e as
+# executadas pelo interpretador (ewvm.py) e mede o tempo de CPU
+# (medicao.comparar); as duas versões têm de escrever exatamente o mesmo.
+# Programas:
+#   - função pequena chamada num ciclo (expandida em linha);
+#   - fib recursivo (nunca expandido: as duas versões coincidem);
+#   - procedimento que acumula em variáveis globais.
+#
+# Uso: python bench_subprogramas.py [-n ITERACOES] [-r REPETICOES] [--peephole] [--slots]
+# ---------------------------------------------------
+
+def casos(n):
+    """(nome, texto, entrada) dos programas medidos; cada um faz cerca de n chamadas."""
+    f = 10
+    while f < 25 and 1.618 ** (f + 1) < n:   # fib(f) faz cerca de 1.6^f chamadas
+        f += 1
+    return [
+        ("quadrado", f"""program Quadrado;
+var i, s: integer;
+function quad(x: integer): integer;
+begin
+  quad := x * x mod 1000
+end;
+begin
+  s := 0;
+  for i := 1 to {n} do s := s + quad(i);
+  writeln(s)
+end.
+""", []),
+        ("fib", f"""program Fib;
+function fib(k: integer): integer;
+begin
+  if k < 2 then fib := k
+  else fib := fib(k - 1) + fib(k - 2)
+end;
+begin
+  writeln(fib({f}))
+end.
+""", []),
+        ("acumular", f"""program Acumular;
+var i, soma, maximo: integer;
+procedure juntar(v: integer);
+var t: integer;
+begin
+  t := v mod 97;
+  soma := soma + t;
+  if t > maximo then maximo := t
+end;
+begin
+  soma := 0; maximo := 0;
+  for i := 1 to {n} do juntar(i * 31);
+  writeln(soma, ' ', maximo)
+end.
+""", []),
+    ]
+
+def main():
+    ap = medicao.argumentos("Benchmark dos subprogramas (com e sem expansão em linha).")
+    ap.add_argument("-n", "--iteracoes", type=int, default=20000, help="chamadas de cada programa")
+    ap.add_argument("-r", "--repeticoes", type=int, default=3)
+    args = ap.parse_args()
+    opcoes = medicao.opcoes_pedidas(args)
+
+    falhas = medicao.comparar(casos(args.iteracoes), medicao.versao(dict(opcoes, sem_inline=True)),
+                              medicao.versao(opcoes), rotulos=('chamada', 'linha'),
+                              repeticoes=args.repeticoes)
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import os
+import hashlib
+from collections import OrderedDict
+
+# ---------------------------------------------------
+# Cache persistente de compilação (EWVM)
+#
+# Cada entrada é o .ewvm de um programa, guardado num ficheiro cujo nome é
+# o hash do texto do programa e do carimbo de versão do compilador. O texto
+# não é normalizado: os espaços e as mudanças de linha dentro de uma string
+# fazem parte da saída (os fins de linha '\r\n' já chegam como '\n', porque
+# o driver lê a entrada em modo texto). Um acerto devolve o código guardado
+# sem voltar a fazer análise léxica, sintática ou geração de código.
+# ---------------------------------------------------
+
+TAMANHO_MAXIMO = 64 * 1024 * 1024
+
+class CacheCompilacao:
+    """
+    Cache em disco, endereçada pelo conteúdo, com remoção LRU quando o
+    tamanho total ultrapassa 'tamanho_maximo' bytes.
+    """
+
+    def __init__(self, diretoria, versao, tamanho_maximo=TAMANHO_MAXIMO):
+        self.diretoria = diretoria
+        self.versao = versao
+        self.tamanho_maximo = tamanho_maximo
+        self.acertos = 0
+        self.falhas = 0
+        self.removidas = 0
+
+        # Índice LRU: caminho → tamanho, do menos para o mais recente
+        self._entradas = OrderedDict()
+        self.tamanho = 0
+        encontradas = []
+        os.makedirs(diretoria, exist_ok=True)
+        for sub in os.scandir(diretoria):
+            if not sub.is_dir():
+                continue
+            for e in os.scandir(sub.path):
+                if e.name.endswith('.ewvm'):
+                    st = e.stat()
+                    encontradas.append((st.st_mtime, e.path, st.st_size))
+        for _, caminho, tam in sorted(encontradas):
+            self._entradas[caminho] = tam
+            self.tamanho += tam
+
+    def chave(self, trecho):
+        """Hash do carimbo de versão e do texto do programa."""
+        h = hashlib.sha256(self.versao.encode('utf-8'))
+        h.update(b'\0')
+        h.update(trecho.encode('utf-8'))
+        return h.hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretoria, chave[:2], chave + '.ewvm')
+
+    def obter(self, chave):
+        """Devolve as linhas EWVM guardadas para 'chave', ou None."""
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'r', encoding='utf-8', newline='') as f:
+                linhas = f.read().split('\n')[:-1]
+        except (FileNotFoundError, UnicodeDecodeError):
+            # Entrada removida ou corrompida: volta a ser escrita por guardar()
+            self.tamanho -= self._entradas.pop(caminho, 0)
+            self.falhas += 1
+            return None
+
+        # Marca a entrada como a mais recente (também no disco, para a
+        # ordem LRU sobreviver entre execuções)
+        os.utime(caminho)
+        if caminho in self._entradas:
+            self._entradas.move_to_end(caminho)
+        self.acertos += 1
+        return linhas
+
+    def descartar(self, chave):
+        """
+        Remove a entrada de 'chave' depois de um acerto que não se conseguiu
+        ler (conta como falha).
+        """
+        caminho = self._caminho(chave)
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
+        self.tamanho -= self._entradas.pop(caminho, 0)
+        self.acertos -= 1
+        self.falhas += 1
+
+    def guardar(self, chave, linhas):
+        """Guarda as linhas EWVM de um programa e aplica o limite de tamanho."""
+        caminho = self._caminho(chave)
+        dados = ''.join(linha + '\n' for linha in linhas).encode('utf-8')
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'wb') as f:
+            f.write(dados)
+        os.replace(temporario, caminho)
+
+        self.tamanho += len(dados) - self._entradas.pop(caminho, 0)
+        self._entradas[caminho] = len(dados)
+        while self.tamanho > self.tamanho_maximo and len(self._entradas) > 1:
+            antigo, tam = self._entradas.popitem(last=False)
+            try:
+                os.remove(antigo)
+            except FileNotFoundError:
+                pass
+            self.tamanho -= tam
+            self.removidas += 1
+
+    def resumo(self):
+        total = self.acertos + self.falhas
+        taxa = 100 * self.acertos / total if total else 0.0
+        return (f"Cache: {self.acertos} acertos, {self.falhas} falhas ({taxa:.1f}% acertos), "
+                f"{self.removidas} removidas, {len(self._entradas)} entradas / "
+                f"{self.tamanho // 1024} KiB")
@@ -0,0 +1,47 @@
+import os, sys
+
+import ewvm
+from instrucoes import MAGICO, escrever
+
+# ---------------------------------------------------
+# Conversão entre o .ewvm em texto e o binário (.ewvmb)
+#
+# Lê um programa EWVM num dos formatos (ewvm.carregar_ficheiro reconhece o
+# binário pelo cabeçalho) e escreve-o no outro: texto → .ewvmb com
+# Programa.para_binario, binário → .ewvm com Programa.para_texto. O binário
+# guarda os nomes dos rótulos, por isso texto → binário → texto devolve as
+# mesmas instruções e rótulos (sem comentários nem linhas em branco).
+#
+# Uso: python conversor.py ENTRADA [-o SAIDA]
+# ---------------------------------------------------
+
+def e_binario(caminho):
+    """True se o ficheiro começa pelo cabeçalho do formato binário."""
+    with open(caminho, 'rb') as f:
+        return f.read(len(MAGICO)) == MAGICO
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Converte um programa EWVM entre texto (.ewvm) e binário (.ewvmb).")
+    ap.add_argument("entrada", help="ficheiro .ewvm ou .ewvmb")
+    ap.add_argument("-o", "--saida",
+                    help="ficheiro a escrever (por omissão, a entrada com a outra extensão)")
+    args = ap.parse_args(argv)
+
+    try:
+        para_binario = not e_binario(args.entrada)
+        programa = ewvm.carregar_ficheiro(args.entrada)
+    except (OSError, ewvm.ErroEWVM) as e:
+        print(f"[ERRO] {e}", file=sys.stderr)
+        return 1
+    saida = args.saida or os.path.splitext(args.entrada)[0] + ('.ewvmb' if para_binario else '.ewvm')
+    if os.path.abspath(saida) == os.path.abspath(args.entrada):
+        print(f"[ERRO] A saída {saida} é o próprio ficheiro de entrada", file=sys.stderr)
+        return 1
+    escrever(programa, saida, para_binario)
+    print(f"{args.entrada} → {saida} ({os.path.getsize(args.entrada)} → {os.path.getsize(saida)} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import re
+
+# ---------------------------------------------------
+# Divisão incremental de um ficheiro em programas Pascal
+#
+# Lê a fonte aos blocos e devolve um programa "program Nome; … end." de
+# cada vez, sem nunca ter o ficheiro inteiro em memória. Ao contrário de
+# uma regex sobre o texto todo, ignora "end." dentro de comentários
+# ({ … } e (* … *)) e de strings entre aspas simples.
+# Uma string acaba na própria linha: uma aspa sem par é ignorada, como o
+# lexer faz a um carácter ilegal, e não esconde o "end." nem os programas
+# seguintes. O mesmo para um "{" ou "(*" sem fecho até ao fim do ficheiro:
+# a procura continua logo a seguir. Se o ficheiro acaba a meio de um
+# programa (sem "end."), o texto que falta é devolvido na mesma, para que
+# a compilação indique o erro.
+# ---------------------------------------------------
+
+TAMANHO_BLOCO = 1 << 20
+
+# Cabeçalho "program Nome;" (fora de qualquer programa)
+_CABECALHO = re.compile(r'(?<![A-Za-z0-9_])program\s+([A-Za-z_][A-Za-z0-9_]*)\s*;', re.IGNORECASE)
+
+# Dentro de um programa: início de comentário, de string, ou o "end." final
+_INTERESSE = re.compile(r"\{|\(\*|'|(?<![A-Za-z0-9_])end\.", re.IGNORECASE)
+
+# String literal completa, numa só linha (a definição do lexer, sem '\n')
+_STRING = re.compile(r"'([^\\'\n]|\\.)*'")
+
+# Bytes mantidos ao descartar texto entre programas, para não cortar um
+# cabeçalho que esteja a meio de ser lido
+_CAUDA = 256
+
+def _inicio_palavra(buf, pos):
+    """Recua 'pos' até não cortar uma palavra a meio."""
+    while pos > 0 and (buf[pos - 1].isalnum() or buf[pos - 1] == '_'):
+        pos -= 1
+    return pos
+
+def dividir_programas(fonte, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Gera tuplos (nome, trecho, linha_inicial) para cada programa em 'fonte'
+    (um ficheiro aberto em modo texto). 'linha_inicial' é a linha do
+    ficheiro onde o programa começa.
+
+    A memória usada é limitada pelo maior programa mais um bloco de leitura,
+    independentemente do tamanho do ficheiro.
+    """
+    buf = ''
+    pos = 0          # posição a partir da qual ainda falta analisar buf
+    inicio = None    # início do programa atual em buf (None = entre programas)
+    nome = None
+    linha = 1        # linha do ficheiro correspondente a buf[contadas]
+    contadas = 0     # até onde já foram contadas as mudanças de linha em buf
+    fim_ficheiro = False
+
+    while True:
+        if inicio is None:
+            m = _CABECALHO.search(buf, pos)
+            if m:
+                inicio, nome, pos = m.start(), m.group(1), m.end()
+                continue
+            if fim_ficheiro:
+                return
+            # Só falta analisar uma pequena cauda (um cabeçalho incompleto)
+            corte = _inicio_palavra(buf, max(pos, len(buf) - _CAUDA))
+        else:
+            m = _INTERESSE.search(buf, pos)
+            if m:
+                c = m.group(0)
+                if c == '{':
+                    fim = buf.find('}', m.end())
+                    fim = fim + 1 if fim >= 0 else -1
+                elif c == '(*':
+                    fim = buf.find('*)', m.end())
+                    fim = fim + 2 if fim >= 0 else -1
+                elif c == "'":
+                    s = _STRING.match(buf, m.start())
+                    if s:
+                        fim = s.end()
+                    elif fim_ficheiro or buf.find('\n', m.end()) >= 0:
+                        fim = m.end()           # aspa sem par na linha: ignorada
+                    else:
+                        fim = -1
+                else:
+                    # "end." fora de comentários e strings: fim do programa
+                    linha += buf.count('\n', contadas, inicio)
+                    contadas = inicio
+                    yield nome, buf[inicio:m.end()], linha
+                    inicio, pos = None, m.end()
+                    continue
+
+                if fim < 0 and fim_ficheiro:
+                    fim = m.end()               # comentário sem fim: o início é ignorado
+                if fim >= 0:
+                    pos = fim
+                    continue
+                # Comentário ou string ainda por fechar: é preciso ler mais
+                pos = m.start()
+            else:
+                if fim_ficheiro:
+                    yield nome, buf[inicio:], linha + buf.count('\n', contadas, inicio)
+                    return
+                # Um "end." ou "(*" pode estar dividido entre dois blocos
+                pos = max(_inicio_palavra(buf, max(pos, len(buf) - 3)), inicio)
+            corte = inicio
+
+        # Descarta o texto já processado antes de ler o bloco seguinte
+        linha += buf.count('\n', contadas, corte)
+        buf = buf[corte:]
+        pos -= corte
+        if inicio is not None:
+            inicio -= corte
+        contadas = 0
+
+        bloco = fonte.read(tamanho_bloco)
+        if not bloco:
+            fim_ficheiro = True
+        buf += bloco
@@ -0,0 +1,257 @@
+import os, sys, mmap, time
+
+from instrucoes import (Programa, MAGICO, div_pascal, mod_pascal, PUSHG, PUSHI, STOREG, JZ, JUMP,
+                        ADD, SUB, MUL, DIV, MOD, EQUAL, NOT, INF, INFEQ, SUP, SUPEQ, AND, OR, PUSHS, PUSHF,
+                        WRITEI, WRITEF, WRITES, WRITELN, READ, ATOI, ATOF, POP, DUP, PUSHN, STOP,
+                        PUSHL, STOREL, PUSHGP, PADD, LOAD, STORE, CHECK, PUSHA, CALL, RETURN, ITOF)
+
+# ---------------------------------------------------
+# Interpretador EWVM local
+#
+# Executa os programas gerados pelo compilador sem a ferramenta web: um
+# Programa de instrucoes.py (vindo diretamente do compilador ou lido de um
+# .ewvm em texto ou de um .ewvmb binário) já é uma lista de pares (opcode,
+# operando), com opcodes inteiros, rótulos resolvidos para índices de
+# instrução e as strings de PUSHS sem aspas. O ciclo de execução
+# só faz comparações de inteiros, pela ordem de frequência das instruções,
+# e só conta as instruções executadas quando o controlo salta (cada troço
+# sem saltos é somado de uma vez).
+# Os endereços (PUSHGP, PADD, LOAD, STORE) são índices na lista das
+# variáveis globais: PUSHGP empilha 0, o início da área global.
+# CALL guarda (pc, fp) numa pilha de chamadas à parte e o novo frame começa
+# no topo da pilha: PUSHL/STOREL k acedem a pilha[fp + k] (os argumentos,
+# empilhados por quem chama, ficam em fp-n … fp-1). RETURN repõe pc e fp.
+# O frame do programa principal começa no fundo da pilha (fp = 0).
+#
+# Uso: python ewvm.py programa.ewvm|programa.ewvmb [--entrada FICHEIRO] [--estatisticas]
+# ---------------------------------------------------
+
+class ErroEWVM(Exception):
+    """Erro ao carregar ou executar um programa EWVM."""
+
+def carregar(linhas):
+    """Lê as linhas de um .ewvm para um Programa (instrucoes.py)."""
+    try:
+        return Programa.de_texto(linhas)
+    except ValueError as e:
+        raise ErroEWVM(str(e)) from None
+
+def carregar_ficheiro(caminho):
+    """
+    Lê um .ewvm em texto ou um .ewvmb (Programa.para_binario). O binário é
+    lido de um mmap do ficheiro, sem o copiar para memória: as instruções
+    saem prontas a executar, com os saltos já resolvidos.
+    """
+    with open(caminho, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > len(MAGICO):
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+                if dados[:len(MAGICO)] == MAGICO:
+                    try:
+                        return Programa.de_binario(dados)
+                    except ValueError as e:
+                        raise ErroEWVM(f"Ficheiro binário inválido: {e}") from None
+        texto = f.read()
+    return carregar(texto.decode('utf-8').splitlines())
+
+def executar(programa, entrada=None, saida=None, limite=None):
+    """
+    Executa um Programa (instrucoes.py). 'entrada' é um iterável de linhas
+    para READ (por omissão, sys.stdin) e 'saida' um objeto com write() (por
+    omissão, sys.stdout). 'limite' interrompe a execução no primeiro salto depois de
+    executadas tantas instruções (um ciclo infinito tem sempre um salto).
+    Devolve (instruções executadas, lista final das variáveis globais).
+    """
+    entrada = iter(entrada if entrada is not None else sys.stdin)
+    escrever = (saida if saida is not None else sys.stdout).write
+    codigo = programa.codigo
+    g = [0] * programa.globais()
+    pilha = []
+    push = pilha.append
+    pop = pilha.pop
+    pc = base = 0                  # 'base': início do troço sem saltos em curso
+    fp = 0
+    chamadas = []                  # (pc de retorno, fp) de cada CALL em curso
+    executadas = 0
+    limite = limite if limite is not None else float('inf')
+
+    try:
+        while True:
+            op, arg = codigo[pc]
+            pc += 1
+            if op == PUSHG:
+                push(g[arg])
+            elif op == PUSHI:
+                push(arg)
+            elif op == STOREG:
+                g[arg] = pop()
+            elif op == JZ:
+                if pop() == 0:
+                    executadas += pc - base
+                    pc = base = arg
+                    if executadas >= limite:
+                        break
+            elif op == JUMP:
+                executadas += pc - base
+                pc = base = arg
+                if executadas >= limite:
+                    break
+            elif op == PUSHL:
+                push(pilha[fp + arg])
+            elif op == STOREL:
+                pilha[fp + arg] = pop()
+            elif op == PUSHGP:
+                push(0)
+            elif op == PADD:
+                b = pop()
+                pilha[-1] += b
+            elif op == LOAD:
+                k = pop() + arg
+                if not 0 <= k < len(g):
+                    raise ErroEWVM(f"Endereço fora da área global: {k} (instrução {pc - 1})")
+                push(g[k])
+            elif op == STORE:
+                v = pop()
+                k = pop() + arg
+                if not 0 <= k < len(g):
+                    raise ErroEWVM(f"Endereço fora da área global: {k} (instrução {pc - 1})")
+                g[k] = v
+            elif op == CHECK:
+                if not arg[0] <= pilha[-1] <= arg[1]:
+                    raise ErroEWVM(f"Índice {pilha[-1]} fora dos limites [{arg[0]}..{arg[1]}] "
+                                   f"(instrução {pc - 1})")
+            elif op == ADD:
+                b = pop()
+                pilha[-1] += b
+            elif op == SUB:
+                b = pop()
+                pilha[-1] -= b
+            elif op == DUP:
+                # DUP 1 (o incremento dos ciclos for) é o caso frequente
+                if arg == 1:
+                    push(pilha[-1])
+                else:
+                    pilha.extend(pilha[len(pilha) - arg:])
+            elif op == SUP:
+                b = pop()
+                pilha[-1] = int(pilha[-1] > b)
+            elif op == INFEQ:
+                b = pop()
+                pilha[-1] = int(pilha[-1] <= b)
+            elif op == INF:
+                b = pop()
+                pilha[-1] = int(pilha[-1] < b)
+            elif op == EQUAL:
+                b = pop()
+                pilha[-1] = int(pilha[-1] == b)
+            elif op == MUL:
+                b = pop()
+                pilha[-1] *= b
+            elif op == MOD:
+                b = pop()
+                a = pilha[-1]
+                pilha[-1] = mod_pascal(a, b) if type(a) is int and type(b) is int else a % b
+            elif op == DIV:
+                b = pop()
+                a = pilha[-1]
+                pilha[-1] = div_pascal(a, b) if type(a) is int and type(b) is int else a / b
+            elif op == SUPEQ:
+                b = pop()
+                pilha[-1] = int(pilha[-1] >= b)
+            elif op == AND:
+                b = pop()
+                pilha[-1] = int(bool(pilha[-1]) and bool(b))
+            elif op == OR:
+                b = pop()
+                pilha[-1] = int(bool(pilha[-1]) or bool(b))
+            elif op == NOT:
+                pilha[-1] = int(not pilha[-1])
+            elif op == PUSHS or op == PUSHF:
+                push(arg)
+            elif op == WRITEI:
+                escrever(str(pop()))
+            elif op == WRITES:
+                escrever(pop())
+            elif op == WRITELN:
+                escrever("\n")
+            elif op == WRITEF:
+                escrever(str(float(pop())))
+            elif op == READ:
+                push(next(entrada, '').rstrip('\n'))
+            elif op == ATOI:
+                pilha[-1] = int(pilha[-1])
+            elif op == ATOF or op == ITOF:
+                pilha[-1] = float(pilha[-1])
+            elif op == POP:
+                del pilha[len(pilha) - arg:]
+            elif op == PUSHN:
+                pilha.extend([0] * arg)
+            elif op == PUSHA:
+                push(arg)
+            elif op == CALL:
+                destino = pop()
+                chamadas.append((pc, fp))
+                fp = len(pilha)
+                executadas += pc - base
+                pc = base = destino
+                if executadas >= limite:
+                    break
+            elif op == RETURN:
+                if not chamadas:
+                    raise ErroEWVM(f"RETURN fora de um subprograma (instrução {pc - 1})")
+                executadas += pc - base
+                pc, fp = chamadas.pop()
+                base = pc
+            elif op == STOP:
+                executadas += pc - base
+                break
+    except ZeroDivisionError:
+        raise ErroEWVM(f"Divisão por zero (instrução {pc - 1})") from None
+    except IndexError:
+        if pc >= len(codigo):
+            raise ErroEWVM("Execução passou do fim do programa sem STOP") from None
+        op, arg = codigo[pc - 1]
+        if (op == PUSHG or op == STOREG) and not 0 <= arg < len(g):
+            raise ErroEWVM(f"Endereço fora da área global: {arg} (instrução {pc - 1})") from None
+        if (op == PUSHL or op == STOREL) and not 0 <= fp + arg < len(pilha):
+            raise ErroEWVM(f"Endereço fora da pilha: fp{arg:+d} (instrução {pc - 1})") from None
+        raise ErroEWVM(f"Pilha vazia (instrução {pc - 1})") from None
+    except ValueError as e:
+        raise ErroEWVM(f"Conversão inválida (instrução {pc - 1}): {e}") from None
+    return executadas, g
+
+# ---------------------------------------------------
+# Linha de comandos
+# ---------------------------------------------------
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Executa um programa EWVM.")
+    ap.add_argument("programa", help="ficheiro .ewvm (texto) ou .ewvmb (binário)")
+    ap.add_argument("--entrada", help="ficheiro com as linhas lidas por READ (por omissão, stdin)")
+    ap.add_argument("--limite", type=int, help="máximo de instruções a executar")
+    ap.add_argument("--estatisticas", action="store_true",
+                    help="mostra em stderr as instruções executadas e o tempo")
+    args = ap.parse_args(argv)
+
+    try:
+        programa = carregar_ficheiro(args.programa)
+        entrada = open(args.entrada, 'r', encoding='utf-8') if args.entrada else None
+        inicio = time.perf_counter()
+        try:
+            executadas, _ = executar(programa, entrada, limite=args.limite)
+        finally:
+            if entrada:
+                entrada.close()
+        segundos = time.perf_counter() - inicio
+    except ErroEWVM as e:
+        print(f"[ERRO EWVM] {e}", file=sys.stderr)
+        return 1
+
+    if args.estatisticas:
+        print(f"{executadas} instruções em {segundos * 1000:.1f} ms "
+              f"({executadas / max(segundos, 1e-9) / 1e6:.2f} M instruções/s)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
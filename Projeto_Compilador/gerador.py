@@ -0,0 +1,221 @@
+import random
+
+# ---------------------------------------------------
+# Gerador de programas Pascal sintéticos
+#
+# Produz programas válidos para a gramática de parser.py, com tamanho
+# controlado, para benchmarks do compilador. Os ciclos usam variáveis de
+# controlo próprias (c0, c1, …) que mais nenhuma instrução altera, por
+# isso todos os programas gerados terminam.
+# ---------------------------------------------------
+
+_OPS_ARIT = ['+', '-', '*', '+', '-']
+_OPS_REL = ['=', '<>', '<', '<=', '>', '>=']
+
+class GeradorPascal:
+    """
+    Gera o texto de programas Pascal aleatórios (mas reprodutíveis, dada a
+    semente). Os parâmetros controlam o número de variáveis, o número de
+    instruções, a profundidade máxima de aninhamento e o número de termos
+    das expressões. Com arrays > 0 declara também os arrays a0, a1, … (a_j
+    com índices j..j+9) e usa os seus elementos nas expressões, atribuições
+    e leituras; alguns índices saem dos limites, para exercitar o CHECK.
+    """
+
+    def __init__(self, semente=0, variaveis=8, instrucoes=40, profundidade=3, termos=4, arrays=0):
+        self.rng = random.Random(semente)
+        self.variaveis = variaveis
+        self.instrucoes = instrucoes
+        self.profundidade = profundidade
+        self.termos = termos
+        self.arrays = arrays
+
+    # ---------------- palavras e expressões ----------------
+
+    def _kw(self, palavra):
+        """Palavra reservada com capitalização variada (o Pascal ignora-a)."""
+        r = self.rng.random()
+        if r < 0.7:
+            return palavra
+        if r < 0.85:
+            return palavra.capitalize()
+        return palavra.upper()
+
+    def _var(self):
+        return f"v{self.rng.randrange(self.variaveis)}"
+
+    def _elemento(self):
+        j = self.rng.randrange(self.arrays)
+        r = self.rng.random()
+        if r < 0.3:
+            indice = str(self.rng.randint(j, j + 9))
+        elif r < 0.6:
+            indice = f"c{self.rng.randrange(self.profundidade + 1)} + {j}"
+        else:
+            indice = f"{self._var()} {self._kw('mod')} 10 + {j}"
+        return f"a{j}[{indice}]"
+
+    def _termo(self):
+        # Sem arrays não se tira mais nenhum número aleatório: os programas
+        # de cada semente continuam os mesmos
+        if self.arrays and self.rng.random() < 0.2:
+            return self._elemento()
+        if self.rng.random() < 0.6:
+            return self._var()
+        return str(self.rng.randrange(100))
+
+    def expressao(self, termos=None):
+        termos = termos or self.rng.randint(1, self.termos)
+        partes = [self._termo()]
+        for _ in range(termos - 1):
+            r = self.rng.random()
+            if r < 0.1:
+                partes.append(f"{self._kw('div')} {self.rng.randint(1, 9)}")
+            elif r < 0.2:
+                partes.append(f"{self._kw('mod')} {self.rng.randint(1, 9)}")
+            else:
+                partes.append(f"{self.rng.choice(_OPS_ARIT)} {self._termo()}")
+        texto = ' '.join(partes)
+        if termos > 2 and self.rng.random() < 0.3:
+            texto = f"({texto})"
+        return texto
+
+    def condicao(self):
+        cond = f"{self.expressao(2)} {self.rng.choice(_OPS_REL)} {self._termo()}"
+        if self.rng.random() < 0.3:
+            outra = f"{self._var()} {self.rng.choice(_OPS_REL)} {self._termo()}"
+            cond = f"({cond}) {self._kw(self.rng.choice(['and', 'or']))} ({outra})"
+        return cond
+
+    # ---------------- instruções ----------------
+
+    def instrucao(self, nivel, indent):
+        pad = '    ' * indent
+        r = self.rng.random()
+        if nivel < self.profundidade and r < 0.12:
+            then_s = self.instrucao(nivel + 1, indent + 1)
+            texto = f"{pad}{self._kw('if')} {self.condicao()} {self._kw('then')}\n{then_s}"
+            if self.rng.random() < 0.5:
+                texto += f"\n{pad}{self._kw('else')}\n{self.instrucao(nivel + 1, indent + 1)}"
+            return texto
+        if nivel < self.profundidade and r < 0.2:
+            c = f"c{nivel}"
+            return (f"{pad}{self._kw('for')} {c} := 1 {self._kw('to')} {self.rng.randint(2, 5)} {self._kw('do')}\n"
+                    f"{self.instrucao(nivel + 1, indent + 1)}")
+        if nivel < self.profundidade and r < 0.26:
+            # begin c := 0; while c < k do begin …; c := c + 1 end end
+            c = f"c{nivel}"
+            corpo = self.bloco(nivel + 1, indent + 2, self.rng.randint(1, 3),
+                               extra=f"{c} := {c} + 1")
+            return (f"{pad}{self._kw('begin')}\n{pad}    {c} := 0;\n"
+                    f"{pad}    {self._kw('while')} {c} < {self.rng.randint(2, 5)} {self._kw('do')}\n{corpo}\n"
+                    f"{pad}{self._kw('end')}")
+        if nivel < self.profundidade and r < 0.32:
+            return self.bloco(nivel + 1, indent, self.rng.randint(1, 4))
+        if r < 0.42:
+            texto = self.rng.choice(['Resultado: ', 'valor = ', 'fim', 'x'])
+            return f"{pad}{self._kw('writeln')}('{texto}', {self._var()})"
+        if r < 0.45:
+            kw = self._kw('readln')
+            alvo = self._elemento() if self.arrays and self.rng.random() < 0.3 else self._var()
+            return f"{pad}{kw}({alvo})"
+        if self.arrays and self.rng.random() < 0.3:
+            return f"{pad}{self._elemento()} := {self.expressao()}"
+        return f"{pad}{self._var()} := {self.expressao()}"
+
+    def bloco(self, nivel, indent, n, extra=None):
+        pad = '    ' * indent
+        corpo = [self.instrucao(nivel, indent + 1) for _ in range(n)]
+        if extra:
+            corpo.append(f"{pad}    {extra}")
+        return f"{pad}{self._kw('begin')}\n" + ';\n'.join(corpo) + f"\n{pad}{self._kw('end')}"
+
+    # ---------------- programas ----------------
+
+    def programa(self, nome):
+        nomes_v = ', '.join(f"v{i}" for i in range(self.variaveis))
+        nomes_c = ', '.join(f"c{i}" for i in range(self.profundidade + 1))
+        corpo = ';\n'.join(self.instrucao(0, 1) for _ in range(self.instrucoes))
+        arrays = "".join(f"    a{j}: {self._kw('array')}[{j}..{j + 9}] {self._kw('of')} {self._kw('integer')};\n"
+                         for j in range(self.arrays))
+        return (f"{self._kw('program')} {nome};\n"
+                f"{{ programa gerado automaticamente }}\n"
+                f"{self._kw('var')}\n"
+                f"    {nomes_v}: {self._kw('integer')};\n"
+                f"    {nomes_c}: {self._kw('integer')};\n"
+                f"{arrays}"
+                f"{self._kw('begin')}\n{corpo}\n{self._kw('end')}.\n")
+
+    def corpus(self, n_programas, prefixo="Gerado"):
+        """Texto com n_programas programas seguidos (formato de input.txt)."""
+        return '\n'.join(self.programa(f"{prefixo}{i}") for i in range(n_programas))
+
+# ---------------------------------------------------
+# Formas de carga para benchmarks
+#
+# Cada forma acentua uma dimensão do programa; 'tamanho' é, em todas, o
+# número aproximado de instruções simples (atribuições, escritas, …):
+#   - misto:       o GeradorPascal base;
+#   - variaveis:   uma variável declarada por instrução;
+#   - aninhamento: cadeias de if/while/for/begin com profundidade 'tamanho' / 10
+#                  (ciclos aninhados: para compilar, não para executar);
+#   - expressoes:  atribuições com expressões longas (até 200 termos);
+#   - ciclos:      quase todas as instruções compostas são for ou while.
+# ---------------------------------------------------
+
+class GeradorAninhado(GeradorPascal):
+    """
+    Cada instrução abaixo da profundidade máxima é composta. A indentação
+    não cresce com o nível, senão o texto cresceria com o quadrado da
+    profundidade.
+    """
+
+    def instrucao(self, nivel, indent):
+        if nivel >= self.profundidade:
+            return super().instrucao(nivel, indent)
+        pad = '    ' * indent
+        r = self.rng.random()
+        corpo = self.instrucao(nivel + 1, indent)
+        if r < 0.3:
+            return f"{pad}{self._kw('if')} {self.condicao()} {self._kw('then')}\n{corpo}"
+        if r < 0.5:
+            c = f"c{nivel}"
+            return (f"{pad}{self._kw('for')} {c} := 1 {self._kw('to')} 2 {self._kw('do')}\n"
+                    f"{corpo}")
+        if r < 0.7:
+            return f"{pad}{self._kw('while')} {self.condicao()} {self._kw('do')}\n{corpo}"
+        return f"{pad}{self._kw('begin')}\n{corpo};\n{pad}    {self._var()} := {self.expressao()}\n{pad}{self._kw('end')}"
+
+class GeradorCiclos(GeradorPascal):
+    """Instruções compostas quase sempre for ou while (com o controlo de GeradorPascal)."""
+
+    def instrucao(self, nivel, indent):
+        if nivel < self.profundidade and self.rng.random() < 0.4:
+            pad = '    ' * indent
+            c = f"c{nivel}"
+            if self.rng.random() < 0.5:
+                return (f"{pad}{self._kw('for')} {c} := 1 {self._kw('to')} {self.rng.randint(2, 5)} "
+                        f"{self._kw('do')}\n{self.bloco(nivel + 1, indent + 1, self.rng.randint(1, 3))}")
+            corpo = self.bloco(nivel + 1, indent + 2, self.rng.randint(1, 3), extra=f"{c} := {c} + 1")
+            return (f"{pad}{self._kw('begin')}\n{pad}    {c} := 0;\n"
+                    f"{pad}    {self._kw('while')} {c} < {self.rng.randint(2, 5)} {self._kw('do')}\n{corpo}\n"
+                    f"{pad}{self._kw('end')}")
+        return super().instrucao(nivel, indent)
+
+FORMAS = ('misto', 'variaveis', 'aninhamento', 'expressoes', 'ciclos')
+
+def gerador_forma(forma, tamanho, semente=0):
+    """GeradorPascal para uma das FORMAS, com cerca de 'tamanho' instruções simples."""
+    if forma == 'misto':
+        return GeradorPascal(semente, instrucoes=tamanho)
+    if forma == 'variaveis':
+        return GeradorPascal(semente, variaveis=max(tamanho, 1), instrucoes=tamanho, profundidade=1)
+    if forma == 'aninhamento':
+        profundidade = max(tamanho // 10, 1)
+        # Cada cadeia tem cerca de 1,3 instruções simples por nível
+        return GeradorAninhado(semente, instrucoes=max(tamanho // profundidade, 1), profundidade=profundidade)
+    if forma == 'expressoes':
+        return GeradorPascal(semente, instrucoes=max(tamanho // 20, 1), profundidade=0, termos=200)
+    if forma == 'ciclos':
+        return GeradorCiclos(semente, instrucoes=max(tamanho // 4, 1), profundidade=4)
+    raise ValueError(f"Forma desconhecida: {forma} (formas: {', '.join(FORMAS)})")
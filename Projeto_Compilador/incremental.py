@@ -0,0 +1,326 @@
+import copy, functools, itertools
+
+import parser as compilador
+from lexer_rapido import tokenizar, Token
+from semantica import anotar_tipos
+from otimizador import dobrar_constantes, otimizar_peephole, eliminar_codigo_morto
+from alocacao import alocar_slots
+from instrucoes import separar, montar, montar_partes, STOP
+from arvore import Block, Program
+
+# ---------------------------------------------------
+# Recompilação incremental
+#
+# Para editores e modo watch: um programa é compilado uma vez por inteiro
+# e, a cada alteração do texto, só se refaz o statement afetado.
+#   - O corpo do programa fica numa árvore de segmentos: um por statement,
+#     com a sua posição no texto (do primeiro token até ao ';' ou 'end'
+#     seguinte), o nó da AST e o código EWVM gerado. Os blocos begin … end
+#     dividem-se nos seus statements, recursivamente.
+#   - Numa alteração, o prefixo e o sufixo comuns ao texto anterior dão o
+#     intervalo alterado; desce-se até ao segmento mais interior que o
+#     contém. Só o texto desse statement volta a passar pelo lexer e pelo
+#     parser (envolvido em "program _; begin … end.", com a tabela de
+#     variáveis já conhecida), pela análise semântica e pela geração de
+#     código. Os restantes segmentos mantêm o código (e os rótulos: os
+#     rótulos novos continuam a numeração do contexto), e as posições dos
+#     seguintes são deslocadas.
+#   - Alterações nas declarações (e nos subprogramas), entre statements do
+#     bloco principal ou que mudam a divisão em statements, e erros de
+#     sintaxe no statement, levam a uma compilação completa (que indica o
+#     erro real, se houver).
+# O código final é a concatenação dos segmentos, mais STOP e o código dos
+# corpos dos subprogramas (gerado na compilação completa), montada num
+# Programa como em compilar_programa. Cada segmento guarda o seu código já
+# separado dos rótulos (instrucoes.separar), e juntá-los só copia listas e
+# resolve os saltos; com a eliminação de código morto, o peephole ou a
+# alocação de posições (slots), o código todo volta a passar por essas
+# passagens.
+# Os tokens vêm sempre de lexer_rapido.tokenizar (os mesmos do PLY).
+# ---------------------------------------------------
+
+class _Segmento:
+    """
+    Statement do corpo: [inicio, fim) no texto, linha do primeiro token,
+    nó da AST e código gerado ('codigo', simbólico, e 'parte', o mesmo
+    dividido por instrucoes.separar) ou, num bloco begin … end, a lista de
+    segmentos dos seus statements ('filhos').
+    """
+    __slots__ = ('stmt', 'inicio', 'fim', 'linha', 'codigo', 'parte', 'filhos')
+
+    def __init__(self, stmt, inicio, fim, linha):
+        self.stmt = stmt
+        self.inicio = inicio
+        self.fim = fim
+        self.linha = linha
+        self.codigo = None
+        self.parte = None
+        self.filhos = None
+
+class Fichas:
+    """Lexer mínimo para o ply.yacc: devolve tokens já lidos."""
+
+    def __init__(self, fichas, contexto):
+        self.token = functools.partial(next, iter(fichas), None)
+        self.contexto = contexto
+
+def _ler(texto, linha, deslocamento=0):
+    """Tokens (lexer_rapido.Token) de 'texto', com lexpos somado de 'deslocamento'."""
+    return [Token(tipo, valor, n, pos + deslocamento)
+            for tipo, valor, n, pos in tokenizar(texto, 0, linha)]
+
+def _pares(fichas):
+    """Índice de cada BEGIN → índice do END correspondente."""
+    pares, abertos = {}, []
+    for k, ficha in enumerate(fichas):
+        if ficha.type == 'BEGIN':
+            abertos.append(k)
+        elif ficha.type == 'END' and abertos:
+            pares[abertos.pop()] = k
+    return pares
+
+def _dividir(fichas, pares, i, j):
+    """
+    Statements entre fichas[i] e fichas[j] (exclusivo): pares (a, b) de
+    índices do primeiro e do último token, separados por ';' fora de blocos
+    begin … end. Os blocos internos são saltados de uma vez.
+    """
+    partes = []
+    a = k = i
+    while k < j:
+        tipo = fichas[k].type
+        if tipo == 'BEGIN' and k in pares:
+            k = pares[k]
+        elif tipo == 'SEMICOLON':
+            if k > a:
+                partes.append((a, k - 1))
+            a = k + 1
+        k += 1
+    if j > a:
+        partes.append((a, j - 1))
+    return partes
+
+def _segmentos(fichas, pares, i, j, stmt, fim):
+    """
+    Árvore de segmentos do statement 'stmt' (tokens fichas[i..j]), que
+    termina na posição 'fim'. Sem recursão, como o resto do compilador.
+    """
+    raiz = _Segmento(stmt, fichas[i].lexpos, fim, fichas[i].lineno)
+    pendentes = [(raiz, i, j)]
+    while pendentes:
+        seg, i, j = pendentes.pop()
+        if type(seg.stmt) is not Block or fichas[i].type != 'BEGIN' or pares.get(i) != j:
+            continue
+        partes = _dividir(fichas, pares, i + 1, j)
+        if len(partes) != len(seg.stmt.instrucoes):
+            continue                          # não devia acontecer: fica um segmento só
+        seg.filhos = []
+        for (a, b), filho in zip(partes, seg.stmt.instrucoes):
+            novo = _Segmento(filho, fichas[a].lexpos, fichas[b + 1].lexpos, fichas[a].lineno)
+            seg.filhos.append(novo)
+            pendentes.append((novo, a, b))
+    return raiz
+
+def _folhas(raiz):
+    """Segmentos com código, pela ordem do programa."""
+    pendentes = [raiz]
+    while pendentes:
+        seg = pendentes.pop()
+        if seg.filhos is None:
+            yield seg
+        else:
+            pendentes.extend(reversed(seg.filhos))
+
+def _prefixo_comum(x, y):
+    """
+    Comprimento do maior prefixo comum de x e y, por pesquisa binária: cada
+    passo só compara (em C) a fatia ainda não confirmada.
+    """
+    igual, limite = 0, min(len(x), len(y))
+    while igual < limite:
+        meio = (igual + limite + 1) // 2
+        if x[igual:meio] == y[igual:meio]:
+            igual = meio
+        else:
+            limite = meio - 1
+    return igual
+
+def _sufixo_comum(x, y, maximo):
+    """Comprimento do maior sufixo comum de x e y, até 'maximo'."""
+    igual, limite = 0, maximo
+    while igual < limite:
+        meio = (igual + limite + 1) // 2
+        if x[len(x) - meio:len(x) - igual] == y[len(y) - meio:len(y) - igual]:
+            igual = meio
+        else:
+            limite = meio - 1
+    return igual
+
+def _identificador(c):
+    return c.isalnum() or c == '_'
+
+class CompilacaoIncremental:
+    """
+    Compila sucessivas versões do texto de um programa ("program … end."),
+    reaproveitando o trabalho da versão anterior. compilar(texto) devolve o
+    Programa EWVM (instrucoes.py), como compilar_programa; 'ultima' diz como
+    foi obtido: 'completa', 'incremental' ou 'sem alterações'.
+    """
+
+    def __init__(self, opcoes=None):
+        self.opcoes = opcoes or {}
+        self.texto = None
+        self.linha_inicial = 1
+        self.ctx = None
+        self.nome = None
+        self.raiz = None             # segmento do bloco principal
+        self.subprogramas = None     # código dos corpos dos subprogramas (simbólico e separado)
+        self.programa = None
+        self.ultima = None
+
+    def compilar(self, texto, linha_inicial=1):
+        if self.texto is None or linha_inicial != self.linha_inicial:
+            return self._compilar_tudo(texto, linha_inicial)
+        if texto == self.texto:
+            self.ultima = 'sem alterações'
+            return self.programa
+        try:
+            return self._recompilar(texto)
+        except SyntaxError:
+            return self._compilar_tudo(texto, linha_inicial)
+
+    # ---------------- compilação completa ----------------
+
+    def _compilar_tudo(self, texto, linha_inicial):
+        ctx = compilador.CompilationContext(self.opcoes)
+        fichas = _ler(texto, linha_inicial)
+        ast = self._analisar(fichas, ctx)
+        anotar_tipos(ast, ctx.tabela_variaveis)
+        if ctx.opcoes.get('slots'):
+            ctx.agrupar_arrays()
+
+        # Bloco principal: do BEGIN que corresponde ao END antes do '.'
+        # final (os corpos dos subprogramas vêm antes)
+        pares = _pares(fichas)
+        inicio = next(k for k, fim in pares.items() if fim == len(fichas) - 2)
+        raiz = _segmentos(fichas, pares, inicio, pares[inicio], ast.bloco, fichas[-1].lexpos)
+
+        self.ctx, self.nome, self.raiz = ctx, ast.nome, raiz
+        if ctx.opcoes.get('dobragem') and ast.subprogramas:
+            ast, _ = dobrar_constantes(ast)
+            anotar_tipos(ast, ctx.tabela_variaveis)
+        codigo = compilador.generate_subprogram_code(ast, ctx)
+        self.subprogramas = (codigo, separar(codigo))
+        for seg in _folhas(raiz):
+            self._gerar(seg)
+        self.texto, self.linha_inicial = texto, linha_inicial
+        self.ultima = 'completa'
+        return self._montar()
+
+    def _analisar(self, fichas, ctx):
+        return copy.copy(compilador.obter_parser()).parse(lexer=Fichas(fichas, ctx))
+
+    def _gerar(self, seg):
+        """Gera o código do segmento (com dobragem de constantes, se pedida)."""
+        ctx = self.ctx
+        stmt = seg.stmt
+        if ctx.opcoes.get('dobragem'):
+            programa, _ = dobrar_constantes(Program(self.nome, Block([stmt])))
+            anotar_tipos(programa, ctx.tabela_variaveis)
+            stmt = programa.bloco
+        ctx.codigo_meio = []
+        compilador.generate_stmt_code(stmt, ctx)
+        seg.codigo = ctx.codigo_meio
+        seg.parte = separar(seg.codigo)
+
+    def _montar(self):
+        folhas = list(_folhas(self.raiz))
+        if any(self.opcoes.get(opcao) for opcao in ('codigo_morto', 'peephole', 'slots')):
+            # Estas passagens veem o código todo (saltos e tempos de vida
+            # entre statements)
+            codigo = list(itertools.chain.from_iterable(seg.codigo for seg in folhas))
+            codigo.append((STOP, None))
+            codigo.extend(self.subprogramas[0])
+            variaveis = self.ctx.variaveis_globais()
+            if self.opcoes.get('codigo_morto'):
+                codigo, _, _ = eliminar_codigo_morto(codigo, self.ctx.globais_partilhadas)
+            if self.opcoes.get('peephole'):
+                codigo, _ = otimizar_peephole(codigo)
+            if self.opcoes.get('slots'):
+                codigo, _ = alocar_slots(codigo, self.ctx.next_global_index, self.ctx.globais_partilhadas,
+                                         self.ctx.posicoes_arrays)
+                variaveis = self.ctx.variaveis_globais(slots=True)
+            self.programa = montar(variaveis, codigo)
+        else:
+            partes = [seg.parte for seg in folhas]
+            partes.append(([(STOP, None)], {}, []))
+            partes.append(self.subprogramas[1])
+            self.programa = montar_partes(self.ctx.variaveis_globais(), partes)
+        return self.programa
+
+    # ---------------- recompilação incremental ----------------
+
+    def _recompilar(self, texto):
+        antigo = self.texto
+
+        # Intervalo alterado: [a, fim_antigo) no texto anterior, [a, fim_novo) no novo
+        a = _prefixo_comum(antigo, texto)
+        b = _sufixo_comum(antigo, texto, min(len(antigo), len(texto)) - a)
+        fim_antigo, fim_novo = len(antigo) - b, len(texto) - b
+        delta = len(texto) - len(antigo)
+
+        # Segmento mais interior que contém a alteração
+        pai, indice, alvo = None, None, self.raiz
+        while alvo.filhos is not None:
+            for i, filho in enumerate(alvo.filhos):
+                if filho.inicio <= a and fim_antigo <= filho.fim:
+                    pai, indice, alvo = alvo, i, filho
+                    break
+            else:
+                break
+        if pai is None:
+            return self._compilar_tudo(texto, self.linha_inicial)
+
+        # Novo texto do statement; não pode colar-se aos tokens vizinhos
+        inicio, fim = alvo.inicio, alvo.fim + delta
+        trecho = texto[inicio:fim]
+        if not trecho.strip() \
+                or (inicio > 0 and _identificador(texto[inicio - 1]) and _identificador(trecho[0])) \
+                or (fim < len(texto) and _identificador(texto[fim]) and _identificador(trecho[-1])):
+            return self._compilar_tudo(texto, self.linha_inicial)
+
+        # Lexer e parser só sobre o statement
+        fichas = _ler(trecho, alvo.linha, inicio)
+        pares = _pares(fichas)
+        if not fichas or _dividir(fichas, pares, 0, len(fichas)) != [(0, len(fichas) - 1)]:
+            return self._compilar_tudo(texto, self.linha_inicial)
+        linha = fichas[0].lineno
+        envolvido = ([Token('PROGRAM', 'program', linha, 0), Token('ID', '_', linha, 0),
+                      Token('SEMICOLON', ';', linha, 0), Token('BEGIN', 'begin', linha, 0)]
+                     + fichas + [Token('END', 'end', linha, fim), Token('DOT', '.', linha, fim)])
+        stmt = self._analisar(envolvido, self.ctx).bloco.instrucoes[0]
+        anotar_tipos(Program(self.nome, Block([stmt])), self.ctx.tabela_variaveis)
+
+        novo = _segmentos(fichas, pares, 0, len(fichas) - 1, stmt, fim)
+        for seg in _folhas(novo):
+            self._gerar(seg)
+
+        # Só agora se altera o estado: desloca os segmentos seguintes e troca o alvo
+        linhas = texto.count('\n', a, fim_novo) - antigo.count('\n', a, fim_antigo)
+        pendentes = [self.raiz]
+        while pendentes:
+            seg = pendentes.pop()
+            if seg.inicio >= fim_antigo:
+                seg.inicio += delta
+                seg.fim += delta
+                seg.linha += linhas
+            elif seg.fim >= fim_antigo:
+                seg.fim += delta
+            if seg.filhos is not None:
+                pendentes.extend(seg.filhos)
+        pai.filhos[indice] = novo
+        pai.stmt.instrucoes[indice] = stmt
+
+        self.texto = texto
+        self.ultima = 'incremental'
+        return self._montar()
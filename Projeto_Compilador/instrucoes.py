@@ -0,0 +1,490 @@
+import enum, struct
+
+# ---------------------------------------------------
+# Representação estruturada do código EWVM
+#
+# O gerador de código emite pares (opcode, operando) em vez de texto:
+#   (PUSHG, 3)      → PUSHG 3
+#   (PUSHS, 'olá')  → PUSHS "olá"
+#   (JZ, 'L2')      → JZ L2      (rótulo simbólico durante a geração)
+#   (None, 'L2')    → L2:        (definição de um rótulo)
+# Os opcodes são inteiros: as constantes PUSHG, PUSHI, … deste módulo, com
+# os valores e nomes do enum Op.
+# montar() junta as variáveis globais e resolve os rótulos, produzindo um
+# Programa cujas instruções só têm operandos numéricos (ou strings/reais
+# literais). Um Programa serializa-se para o texto .ewvm habitual ou para
+# um formato binário compacto (.ewvmb), e é o que o interpretador (ewvm.py)
+# executa.
+# ---------------------------------------------------
+
+class Op(enum.IntEnum):
+    """Opcodes EWVM usados pelo compilador (o valor é o código binário)."""
+    PUSHG = 0
+    PUSHI = 1
+    STOREG = 2
+    JZ = 3
+    JUMP = 4
+    ADD = 5
+    SUB = 6
+    MUL = 7
+    DIV = 8
+    MOD = 9
+    EQUAL = 10
+    NOT = 11
+    INF = 12
+    INFEQ = 13
+    SUP = 14
+    SUPEQ = 15
+    AND = 16
+    OR = 17
+    PUSHS = 18
+    PUSHF = 19
+    WRITEI = 20
+    WRITEF = 21
+    WRITES = 22
+    WRITELN = 23
+    READ = 24
+    ATOI = 25
+    ATOF = 26
+    POP = 27
+    DUP = 28
+    PUSHN = 29
+    STOP = 30
+    PUSHL = 31
+    STOREL = 32
+    PUSHGP = 33
+    PADD = 34
+    LOAD = 35
+    STORE = 36
+    CHECK = 37
+    PUSHA = 38
+    CALL = 39
+    RETURN = 40
+    ITOF = 41
+
+# Constantes inteiras simples (PUSHG == Op.PUSHG), pela mesma ordem que Op:
+# aceder a Op.PUSHG custa uma consulta ao enum, e o gerador e o
+# interpretador usam-nas a cada instrução
+(PUSHG, PUSHI, STOREG, JZ, JUMP, ADD, SUB, MUL, DIV, MOD, EQUAL, NOT, INF, INFEQ, SUP, SUPEQ,
+ AND, OR, PUSHS, PUSHF, WRITEI, WRITEF, WRITES, WRITELN, READ, ATOI, ATOF, POP, DUP, PUSHN,
+ STOP, PUSHL, STOREL, PUSHGP, PADD, LOAD, STORE, CHECK, PUSHA, CALL, RETURN, ITOF) = range(len(Op))
+assert all(globals()[op.name] == op for op in Op)
+
+# DIV e MOD com dois inteiros, como no Pascal (e na EWVM): usados pelo
+# interpretador (ewvm.py) e pela dobragem de constantes (otimizador.py)
+def div_pascal(a, b):
+    """'div' do Pascal: quociente truncado para zero (-7 div 2 = -3)."""
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+def mod_pascal(a, b):
+    """'mod' do Pascal: o resto tem o sinal do dividendo (-7 mod 2 = -1)."""
+    return a - b * div_pascal(a, b)
+
+# Nome de cada opcode, indexado pelo valor
+NOMES = tuple(op.name for op in Op)
+_CODIGOS = {op.name: int(op) for op in Op}
+
+# Tipo do operando de cada opcode
+ROTULOS = frozenset({JZ, JUMP, PUSHA})                           # rótulo / índice
+INTEIROS = frozenset({PUSHG, PUSHI, STOREG, POP, DUP, PUSHN, PUSHL, STOREL, LOAD, STORE})
+# CHECK: par (mínimo, máximo); PUSHS: string; PUSHF: real; os restantes não têm operando
+
+def _string_fechada(texto):
+    """True se 'texto' é "…" com as aspas finais não escapadas por '\\'."""
+    if len(texto) < 2 or texto[0] != '"' or texto[-1] != '"':
+        return False
+    barras = len(texto) - 1 - len(texto[:-1].rstrip('\\'))
+    return barras % 2 == 0
+
+class Programa:
+    """
+    Programa EWVM montado:
+      - variaveis: nomes das variáveis globais, pela ordem dos índices;
+      - codigo:    lista de pares (Op, operando), a partir de START; os
+                   operandos de saltos já são índices nesta lista;
+      - rotulos:   índice → nomes dos rótulos definidos nesse ponto, e
+      - alvos:     índice de um salto → nome do rótulo que usava
+                   (ambos só servem para voltar a escrever o mesmo texto).
+    """
+
+    def __init__(self, variaveis, codigo, rotulos=None, alvos=None):
+        self.variaveis = variaveis
+        self.codigo = codigo
+        self.rotulos = rotulos or {}
+        self.alvos = alvos or {}
+
+    def __len__(self):
+        return len(self.codigo)
+
+    def globais(self):
+        """Número de posições globais necessárias (declaradas ou usadas)."""
+        usadas = [arg for op, arg in self.codigo if op == PUSHG or op == STOREG]
+        return max([len(self.variaveis)] + [i + 1 for i in usadas])
+
+    # ---------------- texto (.ewvm) ----------------
+
+    def para_texto(self):
+        """Linhas do ficheiro .ewvm (sem '\\n'), no formato do compilador."""
+        linhas = [f"{var}: 0:" for var in self.variaveis]
+        linhas.append("")
+        linhas.append("START:")
+        nomes = self._nomes_rotulos()
+        for i, (op, arg) in enumerate(self.codigo):
+            for nome in self.rotulos.get(i, ()):
+                linhas.append(f"{nome}:")
+            if op in ROTULOS:
+                linhas.append(f"{NOMES[op]} {self.alvos.get(i) or nomes[arg]}")
+            elif op == PUSHS:
+                texto = arg.replace('"', '\\"')
+                linhas.append(f'PUSHS "{texto}"')
+            elif op == CHECK:
+                linhas.append(f"CHECK {arg[0]}, {arg[1]}")
+            elif arg is None:
+                linhas.append(NOMES[op])
+            else:
+                linhas.append(f"{NOMES[op]} {arg}")
+        for nome in self.rotulos.get(len(self.codigo), ()):
+            linhas.append(f"{nome}:")
+        return linhas
+
+    def _nomes_rotulos(self):
+        """Índice → nome usado nos saltos (o primeiro rótulo do ponto, ou Ln)."""
+        nomes = {i: lista[0] for i, lista in self.rotulos.items() if lista}
+        for op, arg in self.codigo:
+            if op in ROTULOS and arg not in nomes:
+                nomes[arg] = f"L{arg}"
+                self.rotulos.setdefault(arg, []).append(nomes[arg])
+        return nomes
+
+    @classmethod
+    def de_texto(cls, linhas):
+        """
+        Lê as linhas de um .ewvm. As linhas "nome: 0:" antes de START:
+        declaram as variáveis globais. Uma string de PUSHS com mudanças de
+        linha (como as escreve para_texto) continua nas linhas seguintes,
+        até às aspas finais. Erros de formato → ValueError.
+        """
+        variaveis = []
+        codigo = []
+        rotulos = {}
+        comecou = False
+        linhas = enumerate(linhas, 1)
+        for n, bruta in linhas:
+            linha = bruta.strip()
+            if not linha or linha.startswith('//'):
+                continue
+            if linha.endswith(':'):
+                if not comecou and ' ' in linha:
+                    variaveis.append(linha.split(':', 1)[0])
+                elif linha == 'START:':
+                    comecou = True
+                else:
+                    rotulos.setdefault(len(codigo), []).append(linha[:-1])
+                continue
+            nome, _, texto = linha.partition(' ')
+            texto = texto.strip()
+            op = _CODIGOS.get(nome.upper())
+            if op is None:
+                raise ValueError(f"Instrução desconhecida na linha {n}: {nome}")
+            if op == PUSHS:
+                texto = bruta.lstrip()[len(nome):].lstrip()
+                while texto[:1] == '"' and not _string_fechada(texto.rstrip()):
+                    seguinte = next(linhas, None)
+                    if seguinte is None:
+                        break
+                    texto += '\n' + seguinte[1]
+                texto = texto.rstrip()
+                if not _string_fechada(texto):
+                    raise ValueError(f"String inválida na linha {n}: {texto}")
+                arg = texto[1:-1].replace('\\"', '"')
+            elif op == PUSHF:
+                arg = float(texto)
+            elif op in ROTULOS:
+                arg = texto
+            elif op == CHECK:
+                minimo, _, maximo = texto.partition(',')
+                arg = (int(minimo), int(maximo))
+            elif texto:
+                arg = int(texto)
+            else:
+                arg = 1 if op in (POP, DUP) else None
+            codigo.append((op, arg))
+        return montar(variaveis, codigo, rotulos)
+
+    # ---------------- binário (.ewvmb) ----------------
+
+    def para_binario(self):
+        """
+        Codificação binária (.ewvmb, ver o formato mais abaixo): as strings dos
+        PUSHS e os nomes dos rótulos ficam uma só vez numa tabela e as
+        instruções são 1 byte de opcode mais o operando em varint, com os
+        saltos já resolvidos para o índice da instrução de destino.
+        """
+        tabela = {}                                 # string → índice na tabela
+        corpo = bytearray()
+        _varint(corpo, len(self.codigo))
+        for op, arg in self.codigo:
+            corpo.append(op)
+            if op in ROTULOS:
+                _varint(corpo, arg)
+            elif op in INTEIROS:
+                _varint(corpo, _zigzag(arg))
+            elif op == CHECK:
+                _varint(corpo, _zigzag(arg[0]))
+                _varint(corpo, _zigzag(arg[1]))
+            elif op == PUSHS:
+                _varint(corpo, tabela.setdefault(arg, len(tabela)))
+            elif op == PUSHF:
+                corpo += struct.pack('<d', arg)
+
+        # Nomes dos rótulos e dos saltos que não usam o primeiro nome do destino
+        rotulos = sorted((i, nomes) for i, nomes in self.rotulos.items() if nomes)
+        _varint(corpo, len(rotulos))
+        for i, nomes in rotulos:
+            _varint(corpo, i)
+            _varint(corpo, len(nomes))
+            for nome in nomes:
+                _varint(corpo, tabela.setdefault(nome, len(tabela)))
+        alvos = sorted((i, nome) for i, nome in self.alvos.items()
+                       if nome != (self.rotulos.get(self.codigo[i][1]) or (None,))[0])
+        _varint(corpo, len(alvos))
+        for i, nome in alvos:
+            _varint(corpo, i)
+            _varint(corpo, tabela.setdefault(nome, len(tabela)))
+
+        saida = bytearray(MAGICO)
+        saida.append(VERSAO_BINARIO)
+        _varint(saida, len(self.variaveis))
+        for var in self.variaveis:
+            _bytes(saida, var.encode('utf-8'))
+        _varint(saida, len(tabela))
+        for texto in tabela:                        # pela ordem dos índices
+            _bytes(saida, texto.encode('utf-8'))
+        return bytes(saida + corpo)
+
+    @classmethod
+    def de_binario(cls, dados):
+        """
+        Lê a codificação de para_binario. 'dados' pode ser bytes ou o mmap
+        de um ficheiro: é percorrido uma vez, sem cópias nem análise de texto.
+        Erros de formato → ValueError.
+        """
+        if dados[:len(MAGICO)] != MAGICO:
+            raise ValueError("Não é um programa EWVM binário")
+        try:
+            return cls._ler_binario(dados)
+        except (IndexError, struct.error):
+            raise ValueError("Programa EWVM binário truncado") from None
+
+    @classmethod
+    def _ler_binario(cls, dados):
+        versao = dados[len(MAGICO)]
+        if versao != VERSAO_BINARIO:
+            raise ValueError(f"Versão do formato binário desconhecida: {versao}")
+        pos = len(MAGICO) + 1
+        n, pos = _ler_varint(dados, pos)
+        variaveis = []
+        for _ in range(n):
+            nome, pos = _ler_bytes(dados, pos)
+            variaveis.append(nome.decode('utf-8'))
+        n, pos = _ler_varint(dados, pos)
+        tabela = []
+        for _ in range(n):
+            texto, pos = _ler_bytes(dados, pos)
+            tabela.append(texto.decode('utf-8'))
+
+        n, pos = _ler_varint(dados, pos)
+        codigo = []
+        push = codigo.append
+        operandos = _OPERANDOS
+        n_opcodes = len(NOMES)
+        for _ in range(n):
+            op = dados[pos]
+            if op >= n_opcodes:
+                raise ValueError(f"Opcode inválido: {op}")
+            tipo = operandos[op]
+            pos += 1
+            if tipo is None:
+                push((op, None))
+                continue
+            if tipo == _REAL:
+                push((op, struct.unpack_from('<d', dados, pos)[0]))
+                pos += 8
+                continue
+            # Varint, lido aqui (sem chamar _ler_varint) por ser o caso comum
+            z = dados[pos]
+            pos += 1
+            if z >= 0x80:
+                z &= 0x7f
+                desloc = 7
+                while True:
+                    byte = dados[pos]
+                    pos += 1
+                    z |= (byte & 0x7f) << desloc
+                    if byte < 0x80:
+                        break
+                    desloc += 7
+            if tipo == _ZIGZAG:
+                push((op, (z >> 1) ^ -(z & 1)))
+            elif tipo == _INDICE:
+                if z > n:
+                    raise ValueError(f"Salto para fora do programa: {z}")
+                push((op, z))
+            elif tipo == _TABELA:
+                push((op, tabela[z]))
+            else:                                   # CHECK: segundo varint
+                w, pos = _ler_varint(dados, pos)
+                push((op, ((z >> 1) ^ -(z & 1), (w >> 1) ^ -(w & 1))))
+
+        rotulos, alvos = {}, {}
+        m, pos = _ler_varint(dados, pos)
+        for _ in range(m):
+            i, pos = _ler_varint(dados, pos)
+            k, pos = _ler_varint(dados, pos)
+            nomes = rotulos[i] = []
+            for _ in range(k):
+                j, pos = _ler_varint(dados, pos)
+                nomes.append(tabela[j])
+        m, pos = _ler_varint(dados, pos)
+        for _ in range(m):
+            i, pos = _ler_varint(dados, pos)
+            j, pos = _ler_varint(dados, pos)
+            alvos[i] = tabela[j]
+        return cls(variaveis, codigo, rotulos, alvos)
+
+def escrever(programa, caminho, binario):
+    """Escreve o Programa em 'caminho', em binário (.ewvmb) ou em texto (.ewvm)."""
+    if binario:
+        with open(caminho, 'wb') as f:
+            f.write(programa.para_binario())
+    else:
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for linha in programa.para_texto():
+                f.write(linha + "\n")
+
+# ---------------------------------------------------
+# Formato binário (.ewvmb)
+#
+# Um .ewvmb tem, por esta ordem (varint: 7 bits por byte, o bit mais
+# alto indica que há mais bytes; inteiros com sinal em zigzag):
+#   - MAGICO e um byte com a versão (VERSAO_BINARIO);
+#   - variáveis globais: quantidade e, para cada uma, o nome (comprimento
+#     em varint e UTF-8);
+#   - tabela de strings, sem repetições: quantidade e cada string;
+#   - instruções: quantidade e, para cada uma, o opcode (1 byte) e o
+#     operando: índice da instrução de destino (JZ, JUMP, PUSHA), índice
+#     na tabela (PUSHS), inteiro (PUSHI, PUSHG, …), dois inteiros (CHECK)
+#     ou real em 8 bytes little-endian (PUSHF);
+#   - nomes dos rótulos: quantidade de pontos com rótulos e, para cada um,
+#     o índice da instrução, o número de nomes e os índices na tabela;
+#   - saltos que não usam o primeiro nome do destino: quantidade e pares
+#     (índice do salto, índice do nome na tabela).
+# Os nomes servem apenas para voltar a escrever o mesmo texto (conversor.py);
+# a execução só precisa das instruções.
+# ---------------------------------------------------
+
+MAGICO = b'EWVM'
+VERSAO_BINARIO = 1
+
+# Tipo do operando de cada opcode no binário
+_INDICE, _ZIGZAG, _PAR, _TABELA, _REAL = range(5)
+
+def _tipos_operandos():
+    tipos = []
+    for op in range(len(NOMES)):
+        if op in ROTULOS:
+            tipos.append(_INDICE)
+        elif op in INTEIROS:
+            tipos.append(_ZIGZAG)
+        elif op == CHECK:
+            tipos.append(_PAR)
+        elif op == PUSHS:
+            tipos.append(_TABELA)
+        elif op == PUSHF:
+            tipos.append(_REAL)
+        else:
+            tipos.append(None)
+    return tuple(tipos)
+
+_OPERANDOS = _tipos_operandos()
+
+def _varint(saida, n):
+    while n >= 0x80:
+        saida.append((n & 0x7f) | 0x80)
+        n >>= 7
+    saida.append(n)
+
+def _zigzag(n):
+    """Inteiro com sinal → natural (0, -1, 1, -2, … → 0, 1, 2, 3, …) para _varint."""
+    return n << 1 if n >= 0 else (-n << 1) - 1
+
+def _bytes(saida, b):
+    _varint(saida, len(b))
+    saida += b
+
+def _ler_varint(dados, pos):
+    n = desloc = 0
+    while True:
+        byte = dados[pos]
+        pos += 1
+        n |= (byte & 0x7f) << desloc
+        if byte < 0x80:
+            return n, pos
+        desloc += 7
+
+def _ler_bytes(dados, pos):
+    n, pos = _ler_varint(dados, pos)
+    return dados[pos:pos + n], pos + n
+
+def separar(codigo):
+    """
+    Divide código simbólico (pares (Op, operando) e definições (None,
+    rótulo)) em (instruções, rótulos, saltos): as instruções sem as
+    definições de rótulos, posição → nomes dos rótulos aí definidos e as
+    posições dos saltos (cujo operando ainda é o nome do rótulo).
+    """
+    instrucoes, rotulos, saltos = [], {}, []
+    for op, arg in codigo:
+        if op is None:
+            rotulos.setdefault(len(instrucoes), []).append(arg)
+        else:
+            if op in ROTULOS:
+                saltos.append(len(instrucoes))
+            instrucoes.append((op, arg))
+    return instrucoes, rotulos, saltos
+
+def montar(variaveis, codigo, rotulos=None):
+    """
+    Monta um Programa a partir das variáveis globais e do código simbólico
+    (pares (Op, operando) e definições (None, rótulo)), resolvendo cada
+    rótulo para o índice da instrução seguinte. 'rotulos' (índice → nomes)
+    acrescenta rótulos já retirados do código.
+    """
+    return montar_partes(variaveis, [separar(codigo)], rotulos)
+
+def montar_partes(variaveis, partes, rotulos=None):
+    """
+    Como montar(), mas com o código já dividido por separar() em partes,
+    que são concatenadas pela ordem dada: juntar as partes só copia listas
+    e resolve os saltos (a recompilação incremental guarda uma parte por
+    statement e só volta a separar a que mudou).
+    """
+    instrucoes, saltos = [], []
+    rotulos = {i: list(nomes) for i, nomes in (rotulos or {}).items()}
+    for parte, rotulos_parte, saltos_parte in partes:
+        base = len(instrucoes)
+        instrucoes.extend(parte)
+        for i, nomes in rotulos_parte.items():
+            rotulos.setdefault(base + i, []).extend(nomes)
+        saltos.extend([base + i for i in saltos_parte] if base else saltos_parte)
+
+    indice = {nome: i for i, nomes in rotulos.items() for nome in nomes}
+    alvos = {}
+    for i in saltos:
+        op, arg = instrucoes[i]
+        if arg not in indice:
+            raise ValueError(f"Rótulo não definido: {arg}")
+        instrucoes[i] = (op, indice[arg])
+        alvos[i] = arg
+    return Programa(list(variaveis), instrucoes, rotulos, alvos)
@@ -1,4 +1,3 @@
-import ply.lex as lex
 import re
 
 # ---------------------------------------------------
@@ -31,133 +30,45 @@ tokens = [
 ]
 
 # ---------------------------------------------------
-# 1) Definição de cada keyword (REGEX antes de ID)
-#    Usaremos re.IGNORECASE ao construir o lexer para case-insensitive
+# 1) Palavras reservadas
+#    Não têm regra própria: cada identificador é reconhecido uma única vez
+#    por t_ID e classificado neste dicionário (chaves em minúsculas, pois
+#    o Pascal não distingue maiúsculas de minúsculas).
 # ---------------------------------------------------
-
-def t_PROGRAM(t):
-    r'\bprogram\b'
-    return t
-
-def t_VAR(t):
-    r'\bvar\b'
-    return t
-
-def t_BEGIN(t):
-    r'\bbegin\b'
-    return t
-
-def t_END(t):
-    r'\bend\b'
-    return t
-
-def t_FUNCTION(t):
-    r'\bfunction\b'
-    return t
-
-def t_PROCEDURE(t):
-    r'\bprocedure\b'
-    return t
-
-def t_IF(t):
-    r'\bif\b'
-    return t
-
-def t_THEN(t):
-    r'\bthen\b'
-    return t
-
-def t_ELSE(t):
-    r'\belse\b'
-    return t
-
-def t_WHILE(t):
-    r'\bwhile\b'
-    return t
-
-def t_DO(t):
-    r'\bdo\b'
-    return t
-
-def t_AND(t):
-    r'\band\b'
-    return t
-
-def t_OR(t):
-    r'\bor\b'
-    return t
-
-def t_FOR(t):
-    r'\bfor\b'
-    return t
-
-def t_TO(t):
-    r'\bto\b'
-    return t
-
-def t_DOWNTO(t):
-    r'\bdownto\b'
-    return t
-
-def t_WRITELN(t):
-    r'\bwriteln\b'
-    return t
-
-def t_WRITE(t):
-    r'\bwrite\b'
-    return t
-
-def t_READLN(t):
-    r'\breadln\b'
-    return t
-
-def t_INTEGER(t):
-    r'\binteger\b'
-    return t
-
-def t_BOOLEAN(t):
-    r'\bboolean\b'
-    return t
-
-def t_STRING(t):
-    r'\bstring\b'
-    return t
-
-def t_REAL(t):
-    r'\breal\b'
-    return t
-
-def t_TRUE(t):
-    r'\btrue\b'
-    t.value = True
-    return t
-
-def t_FALSE(t):
-    r'\bfalse\b'
-    t.value = False
-    return t
-
-def t_DIV(t):
-    r'\bdiv\b'
-    return t
-
-def t_MOD(t):
-    r'\bmod\b'
-    return t
-
-def t_ARRAY(t):
-    r'\barray\b'
-    return t
-
-def t_OF(t):
-    r'\bof\b'
-    return t
+reservadas = {
+    'program': 'PROGRAM', 'var': 'VAR', 'begin': 'BEGIN', 'end': 'END',
+    'function': 'FUNCTION', 'procedure': 'PROCEDURE',
+    'if': 'IF', 'then': 'THEN', 'else': 'ELSE',
+    'while': 'WHILE', 'do': 'DO',
+    'and': 'AND', 'or': 'OR',
+    'for': 'FOR', 'to': 'TO', 'downto': 'DOWNTO',
+    'writeln': 'WRITELN', 'write': 'WRITE', 'readln': 'READLN',
+    'integer': 'INTEGER', 'boolean': 'BOOLEAN', 'string': 'STRING', 'real': 'REAL',
+    'true': 'TRUE', 'false': 'FALSE',
+    'div': 'DIV', 'mod': 'MOD',
+    'array': 'ARRAY', 'of': 'OF',
+}
+
+# Valor dos literais booleanos (também usado por lexer_rapido.py)
+valores_reservados = {'TRUE': True, 'FALSE': False}
+
+def _colado(texto, pos):
+    """
+    Indica se o lexema em 'pos' vem colado a um número (ex.: "1end"). Nesse
+    caso não é palavra reservada, tal como com as regras \bpalavra\b.
+    """
+    return pos > 0 and (texto[pos - 1].isalnum() or texto[pos - 1] == '_')
 
 # ---------------------------------------------------
-# 2) Identificador (ID): tudo que não bate em uma keyword
+# 2) Identificador (ID) ou palavra reservada
 # ---------------------------------------------------
 def t_ID(t):
     r'[A-Za-z_][A-Za-z0-9_]*'
+    tipo = reservadas.get(t.value.lower())
+    if tipo is not None and not _colado(t.lexer.lexdata, t.lexpos):
+        t.type = tipo
+        if tipo in valores_reservados:
+            t.value = valores_reservados[tipo]
     return t
 
 # ---------------------------------------------------
@@ -220,8 +131,27 @@ def t_error(t):
     print(f"[LEX ERROR] Caractere ilegal '{t.value[0]}' na linha {t.lexer.lineno}")
     t.lexer.skip(1)
 
-# Constrói o lexer com case-insensitive
-lexer = lex.lex(reflags=re.IGNORECASE)
-
-def build_lexer():
-    return lexer
\ No newline at end of file
+# ---------------------------------------------------
+# 7) Construção do lexer (adiada até ao primeiro uso)
+# ---------------------------------------------------
+_lexer_base = None
+
+def _construir_lexer():
+    import ply.lex as lex
+    return lex.lex(reflags=re.IGNORECASE)
+
+def build_lexer(backend='ply'):
+    """
+    Devolve um lexer independente (clone do lexer base), pronto a usar numa
+    compilação sem interferir com outras que decorram ao mesmo tempo.
+    O lexer base (regex mestra) só é construído na primeira chamada.
+    Com backend='rapido' devolve o lexer sem PLY de lexer_rapido.py, que
+    produz os mesmos tokens.
+    """
+    global _lexer_base
+    if backend == 'rapido':
+        from lexer_rapido import LexerRapido
+        return LexerRapido()
+    if _lexer_base is None:
+        _lexer_base = _construir_lexer()
+    return _lexer_base.clone()
@@ -0,0 +1,106 @@
+import re, functools, itertools
+
+from lexer import reservadas, valores_reservados, _colado
+
+# ---------------------------------------------------
+# Lexer rápido (sem PLY)
+#
+# Percorre o texto diretamente com uma única regex de alternativas e
+# classifica cada lexema por dicionário, sem a maquinaria genérica do PLY
+# (regex mestra com um grupo por regra, chamada de função por token e
+# objetos LexToken). Produz os mesmos tipos, valores (int para NUMBER, bool
+# para TRUE/FALSE) e números de linha que o lexer de lexer.py, incluindo
+# as mensagens de erro para caracteres ilegais.
+# ---------------------------------------------------
+
+# Cada lexema absorve os espaços que o precedem (menos iterações); o último
+# grupo apanha qualquer caráter ilegal, para o finditer só saltar espaços
+# (os do fim do texto, que não precedem nenhum lexema).
+_LEXEMA = re.compile(r"""
+    [ \t\r]*                                             # espaços (ignorados)
+    (?:
+      ([A-Za-z_][A-Za-z0-9_]*)                          # 1 identificador / reservada
+    | (\d+)                                             # 2 número inteiro
+    | (\n+)                                             # 3 mudanças de linha
+    | ('(?:[^\\']|\\.)*')                               # 4 string literal
+    | (\{[^}]*\}|\(\*(?:[^*]|\*+[^*)])*\*+\))           # 5 comentário
+    | (\.\.|:=|<>|<=|>=|[-+*/=<>()\[\]:;,.])            # 6 operador / símbolo
+    | ([^ \t\r])                                        # 7 caráter ilegal
+    )
+""", re.VERBOSE)
+
+_SIMBOLOS = {
+    '..': 'DOTDOT', ':=': 'ASSIGN', '<>': 'NE', '<=': 'LE', '>=': 'GE',
+    '.': 'DOT', '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'DIVIDE',
+    '=': 'EQUAL', '<': 'LT', '>': 'GT', '(': 'LPAREN', ')': 'RPAREN',
+    '[': 'LBRACKET', ']': 'RBRACKET', ':': 'COLON', ';': 'SEMICOLON', ',': 'COMMA',
+}
+
+def tokenizar(texto, pos=0, linha=1):
+    """
+    Gera tuplos (tipo, valor, linha, posição) para os tokens de 'texto' a
+    partir de 'pos'; 'linha' é o número da linha nessa posição.
+    """
+    reservada = reservadas.get
+    simbolo = _SIMBOLOS.__getitem__
+    for m in _LEXEMA.finditer(texto, pos):
+        grupo = m.lastindex
+        if grupo == 1:
+            valor = m.group(1)
+            inicio = m.start(1)
+            tipo = reservada(valor.lower())
+            if tipo is None or _colado(texto, inicio):
+                yield 'ID', valor, linha, inicio
+            elif tipo in valores_reservados:
+                yield tipo, valores_reservados[tipo], linha, inicio
+            else:
+                yield tipo, valor, linha, inicio
+        elif grupo == 6:
+            valor = m.group(6)
+            yield simbolo(valor), valor, linha, m.start(6)
+        elif grupo == 3:
+            linha += m.end() - m.start(3)
+        elif grupo == 2:
+            yield 'NUMBER', int(m.group(2)), linha, m.start(2)
+        elif grupo == 4:
+            yield 'STRING_LITERAL', m.group(4)[1:-1], linha, m.start(4)
+        elif grupo == 7:
+            print(f"[LEX ERROR] Caractere ilegal '{m.group(7)}' na linha {linha}")
+        # grupo 5: comentário, ignorado
+
+class Token:
+    """
+    Token com a interface que o ply.yacc espera (type, value, lineno, lexpos;
+    'lexer' só é preenchido pelo yacc no token de um erro de sintaxe).
+    """
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, tipo, valor, linha, posicao):
+        self.type = tipo
+        self.value = valor
+        self.lineno = linha
+        self.lexpos = posicao
+
+    def __repr__(self):
+        return f"Token({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+class LexerRapido:
+    """
+    Adaptador de tokenizar() para o ply.yacc: input(texto) e token(), como um
+    lexer do PLY. 'lineno' deve ser definido antes de input().
+    """
+
+    def __init__(self):
+        self.lineno = 1
+        self.token = _fim
+
+    def input(self, texto):
+        # token() fica ligado diretamente ao gerador (sem frame Python extra)
+        tokens = itertools.starmap(Token, tokenizar(texto, 0, self.lineno))
+        self.token = functools.partial(next, tokens, None)
+
+    def clone(self):
+        return LexerRapido()
+
+def _fim():
+    return None
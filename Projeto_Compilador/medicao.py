@@ -0,0 +1,110 @@
+import io, os, time, random, argparse
+
+import parser as compilador
+import ewvm
+from divisor import dividir_programas
+from gerador import GeradorPascal
+
+# ---------------------------------------------------
+# Funções comuns aos benchmarks que comparam duas versões do código gerado
+# (bench_for.py, bench_curto_circuito.py, bench_arrays.py,
+# bench_subprogramas.py, bench_codigo_morto.py)
+#
+# Cada caso é compilado das duas maneiras e executado no interpretador
+# (ewvm.py); as duas versões têm de escrever exatamente o mesmo. comparar()
+# mostra, por caso, as instruções e os bytes do .ewvm, as instruções
+# executadas e o melhor tempo de CPU de cada versão.
+# ---------------------------------------------------
+
+ENTRADA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input.txt')
+
+# Instruções executadas a partir das quais um programa é interrompido
+LIMITE = 10_000_000
+
+def argumentos(descricao):
+    """ArgumentParser com as opções de compilação comuns (--peephole, --slots)."""
+    ap = argparse.ArgumentParser(description=descricao)
+    ap.add_argument("--peephole", action="store_true", help="compila com o otimizador peephole")
+    ap.add_argument("--slots", action="store_true", help="compila com a alocação de posições")
+    return ap
+
+def opcoes_pedidas(args):
+    """Opções de compilação pedidas na linha de comandos (ver argumentos)."""
+    return {'peephole': args.peephole, 'slots': args.slots}
+
+def compilar(texto, opcoes):
+    """(Programa, CompilationContext) de 'texto' compilado com 'opcoes'."""
+    ctx = compilador.CompilationContext(opcoes)
+    return compilador.compilar_programa(texto, ctx=ctx), ctx
+
+def versao(opcoes):
+    """Função texto → Programa que compila com 'opcoes' (para comparar)."""
+    return lambda texto: compilar(texto, opcoes)[0]
+
+def executar(programa, entrada=(), repeticoes=1):
+    """(saída, instruções executadas, melhor tempo de CPU em segundos)."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        saida = io.StringIO()
+        inicio = time.process_time()
+        try:
+            executadas, _ = ewvm.executar(programa, entrada=list(entrada), saida=saida, limite=LIMITE)
+        except ewvm.ErroEWVM as e:
+            return f"[ERRO EWVM] {e}", 0, time.process_time() - inicio
+        melhor = min(melhor, time.process_time() - inicio)
+    return saida.getvalue(), executadas, melhor
+
+def tamanho(programa):
+    """Bytes do .ewvm em texto."""
+    return sum(len(linha.encode('utf-8')) + 1 for linha in programa.para_texto())
+
+def programas_entrada():
+    """(nome, texto) dos programas de input.txt."""
+    with open(ENTRADA, 'r', encoding='utf-8') as f:
+        return [(nome, trecho) for nome, trecho, _ in dividir_programas(f)]
+
+def corpus(n):
+    """n pares (texto, linhas de entrada) do corpus sintético (gerador.py)."""
+    lista = []
+    for s in range(n):
+        rng = random.Random(s)
+        texto = GeradorPascal(semente=s, instrucoes=rng.randint(5, 40),
+                              profundidade=rng.randint(1, 4)).programa("T")
+        lista.append((texto, [str(rng.randint(-5, 50)) for _ in range(200)]))
+    return lista
+
+def _medir(gerar, texto, entrada, repeticoes):
+    programa = gerar(texto)
+    saida, executadas, segundos = executar(programa, entrada, repeticoes)
+    return saida, len(programa), tamanho(programa), executadas, segundos
+
+def comparar(casos, antes, depois, rotulos=('antes', 'depois'), repeticoes=1):
+    """
+    Compila cada caso (nome, texto, linhas de entrada) com as funções
+    'antes' e 'depois' (texto → Programa), executa as duas versões e
+    mostra uma linha por caso. Um caso cujo texto é uma lista de pares
+    (texto, entrada), como a de corpus(), dá uma só linha com as somas.
+    Devolve o número de casos em que as duas versões escrevem coisas
+    diferentes.
+    """
+    a, b = rotulos
+    w = max(len(a), len(b), 7) + 2
+    print(f"{'programa':<14}{'instr. ' + a:>{w + 7}}{b:>{w}}{'bytes ' + a:>{w + 6}}{b:>{w}}"
+          f"{'executadas ' + a:>{w + 11}}{b:>{w}}{'redução':>9}{'ms ' + a:>{w + 3}}{b:>{w}}")
+    falhas = 0
+    for nome, texto, entrada in casos:
+        programas = texto if isinstance(texto, list) else [(texto, entrada)]
+        medidas = []
+        for gerar in (antes, depois):
+            saidas, *numeros = zip(*(_medir(gerar, t, e, repeticoes) for t, e in programas))
+            medidas.append(("".join(saidas), *map(sum, numeros)))
+        (saida_a, *ma), (saida_d, *md) = medidas
+        if saida_a != saida_d:
+            detalhe = f" ({saida_a.strip()!r} != {saida_d.strip()!r})" if len(programas) == 1 else ""
+            print(f"{nome}: saídas diferentes{detalhe}")
+            falhas += 1
+            continue
+        reducao = (1 - md[2] / ma[2]) * 100 if ma[2] else 0.0
+        print(f"{nome:<14}{ma[0]:>{w + 7}}{md[0]:>{w}}{ma[1]:>{w + 6}}{md[1]:>{w}}"
+              f"{ma[2]:>{w + 11}}{md[2]:>{w}}{reducao:>8.1f}%{ma[3] * 1000:>{w + 3}.1f}{md[3] * 1000:>{w}.1f}")
+    return falhas
@@ -0,0 +1,486 @@
+import re, operator
+
+from instrucoes import (ROTULOS, PUSHG, STOREG, PUSHL, PUSHI, JZ, JUMP, ADD, SUB, MUL, DIV, NOT, PUSHS, PUSHF,
+                        POP, DUP, STOP, PUSHA, CALL, RETURN, ITOF, EQUAL, INF, INFEQ, SUP, SUPEQ, AND, OR,
+                        montar, div_pascal, mod_pascal)
+from alocacao import blocos_basicos, variaveis_vivas
+from arvore import (Num, Str, Bool, Id, Index, Call, BinOp, Assign, AssignIndex, ReadIndex, Write, If,
+                    While, For, ProcCall, Block, Program, Subprograma, LITERAIS)
+
+# ---------------------------------------------------
+# Otimizações sobre o código EWVM gerado
+# ---------------------------------------------------
+
+# Rótulos criados por CompilationContext.nova_etiqueta (L0, L1, …)
+_ETIQUETA_GERADA = re.compile(r'L\d+$')
+
+# Instruções depois das quais a execução nunca segue para a linha seguinte
+_INCONDICIONAIS = {JUMP, STOP, RETURN}
+
+# Pares "PUSHI k; OP" que deixam o valor anterior inalterado (x+0, x*1, …)
+_NEUTROS = {(0, ADD), (0, SUB), (1, MUL), (1, DIV)}
+
+# Instruções que apenas empilham um valor (sem outros efeitos)
+_EMPILHAM = {PUSHI, PUSHF, PUSHS, PUSHG}
+
+def _destino_final(codigo, posicoes, proxima, etiqueta, destinos):
+    """
+    Segue cadeias de saltos: se o rótulo 'etiqueta' é seguido de "JUMP M",
+    saltar para 'etiqueta' é o mesmo que saltar para M. 'proxima[i]' é o
+    índice da primeira instrução (não rótulo) a partir de i, e 'destinos'
+    guarda as cadeias já resolvidas nesta passagem.
+    """
+    if etiqueta in destinos:
+        return destinos[etiqueta]
+    cadeia = [etiqueta]
+    vistos = {etiqueta}
+    while etiqueta in posicoes:
+        i = proxima[posicoes[etiqueta]]
+        if i >= len(codigo) or codigo[i][0] != JUMP:
+            break
+        if codigo[i][1] in vistos:
+            return etiqueta             # ciclo: não se guarda
+        etiqueta = codigo[i][1]
+        if etiqueta in destinos:
+            etiqueta = destinos[etiqueta]
+            break
+        vistos.add(etiqueta)
+        cadeia.append(etiqueta)
+    for nome in cadeia:
+        destinos[nome] = etiqueta
+    return etiqueta
+
+def _passagem(codigo):
+    """Uma passagem de todas as regras; devolve (novo código, houve mudança)."""
+    mudou = False
+
+    posicoes = {arg: i for i, (op, arg) in enumerate(codigo) if op is None}
+    proxima = [len(codigo)] * (len(codigo) + 1)
+    for i in range(len(codigo) - 1, -1, -1):
+        proxima[i] = proxima[i + 1] if codigo[i][0] is None else i
+
+    # 1) Encadeamento de saltos: JUMP/JZ para um rótulo seguido de JUMP M
+    destinos = {}
+    for i, (op, arg) in enumerate(codigo):
+        if op in ROTULOS:
+            destino = _destino_final(codigo, posicoes, proxima, arg, destinos)
+            if destino != arg:
+                codigo[i] = (op, destino)
+                mudou = True
+
+    novo = []
+    i = 0
+    while i < len(codigo):
+        op, arg = codigo[i]
+        seguinte = codigo[i + 1] if i + 1 < len(codigo) else (None, None)
+
+        # 2) JUMP L seguido (só com rótulos pelo meio) do próprio L
+        if op == JUMP and i < posicoes.get(arg, -1) < proxima[i + 1]:
+            i += 1
+            mudou = True
+            continue
+
+        # 3) Pares de instruções consecutivas
+        if seguinte[0] is not None:
+            if op == PUSHI and seguinte[0] == JZ:
+                # Condição constante: salta sempre (0) ou nunca (≠ 0)
+                if arg == 0:
+                    novo.append((JUMP, seguinte[1]))
+                i += 2
+                mudou = True
+                continue
+            if (op == NOT and seguinte[0] == NOT) \
+                    or (op == PUSHI and (arg, seguinte[0]) in _NEUTROS) \
+                    or (op in _EMPILHAM and seguinte == (POP, 1)):
+                i += 2
+                mudou = True
+                continue
+
+        novo.append((op, arg))
+        i += 1
+
+        # 4) Código inalcançável depois de um salto incondicional
+        if op in _INCONDICIONAIS:
+            while i < len(codigo) and codigo[i][0] is not None:
+                i += 1
+                mudou = True
+
+    # 5) Rótulos gerados que já nenhuma instrução referencia
+    usados = {arg for op, arg in novo if op in ROTULOS}
+    final = [instr for instr in novo
+             if not (instr[0] is None and _ETIQUETA_GERADA.match(instr[1]) and instr[1] not in usados)]
+    return final, mudou or len(final) != len(novo)
+
+def otimizar_peephole(codigo):
+    """
+    Otimização peephole do código gerado (ctx.codigo_meio: pares (opcode,
+    operando) e rótulos (None, nome)), repetida até não haver mais
+    alterações:
+      - saltos para a instrução seguinte e cadeias JUMP → JUMP;
+      - código inalcançável depois de JUMP/STOP/RETURN;
+      - rótulos Lx que deixaram de ser usados;
+      - condições constantes (PUSHI k; JZ L), NOT NOT, x+0, x-0, x*1, x div 1
+        e valores empilhados só para serem descartados.
+    Devolve (novo código, número de instruções eliminadas).
+    """
+    antes = sum(1 for op, _ in codigo if op is not None)
+    codigo = list(codigo)
+    mudou = True
+    while mudou:
+        codigo, mudou = _passagem(codigo)
+    return codigo, antes - sum(1 for op, _ in codigo if op is not None)
+
+# ---------------------------------------------------
+# Eliminação de código morto (grafo de fluxo de controlo)
+#
+# Sobre o código simbólico já gerado, dividido em blocos básicos
+# (alocacao.blocos_basicos):
+#   1. blocos inalcançáveis: percorre o grafo a partir do início do programa
+#      e das entradas dos subprogramas (rótulos de PUSHA); um "PUSHI k; JZ L"
+#      só tem uma saída (o ramo else de 'if true', o corpo de 'while false').
+#      Os blocos que não se alcançam são retirados, com os seus rótulos, e
+#      as condições constantes passam a JUMP L ou desaparecem;
+#   2. escritas mortas, até não haver mais: com a liveness das variáveis
+#      globais (alocacao.variaveis_vivas), um STOREG de uma variável que não
+#      volta a ser lida antes de ser escrita de novo (ou do fim do programa)
+#      passa a POP 1; se o valor vem de uma expressão sem efeitos (literais,
+#      variáveis, + - * e comparações), sai também a expressão. As outras
+#      continuam a ser avaliadas (podem ler do teclado ou falhar numa
+#      divisão por zero). Um CALL lê, e um RETURN deixa vivas, as globais
+#      usadas nos corpos dos subprogramas.
+# ---------------------------------------------------
+
+# Efeito na pilha das instruções sem outros efeitos (valores empilhados)
+_PURAS_PILHA = {PUSHI: 1, PUSHF: 1, PUSHS: 1, PUSHG: 1, PUSHL: 1, NOT: 0, ITOF: 0,
+                ADD: -1, SUB: -1, MUL: -1, EQUAL: -1, INF: -1, INFEQ: -1, SUP: -1, SUPEQ: -1,
+                AND: -1, OR: -1}
+
+def _inicio_valor(codigo):
+    """
+    Índice onde começa a expressão sem efeitos que deixou o valor no topo
+    da pilha no fim de 'codigo' (DUP 1 conta como tal), ou None.
+    """
+    if codigo and codigo[-1] == (DUP, 1):
+        return len(codigo) - 1
+    falta = 1                               # valores ainda por encontrar
+    for k in range(len(codigo) - 1, -1, -1):
+        efeito = _PURAS_PILHA.get(codigo[k][0])
+        if efeito is None:
+            return None
+        falta -= efeito
+        if falta == 0:
+            return k
+    return None
+
+def _alcancaveis(codigo):
+    """Código sem os blocos inalcançáveis e sem as condições constantes."""
+    blocos, sucessores = blocos_basicos(codigo)
+    bloco_de = {codigo[i][1]: b for b, (i, _) in enumerate(blocos) if codigo[i][0] is None}
+
+    # "PUSHI k; JZ L" no fim de um bloco: só salta (k = 0) ou só segue (k ≠ 0)
+    constantes = {}
+    for b, (inicio, fim) in enumerate(blocos):
+        if fim - inicio >= 2 and codigo[fim - 1][0] == JZ and codigo[fim - 2][0] == PUSHI:
+            salta = codigo[fim - 2][1] == 0
+            constantes[b] = salta
+            sucessores[b] = [bloco_de[codigo[fim - 1][1]]] if salta else sucessores[b][1:]
+
+    pendentes = [0] if blocos else []
+    pendentes.extend(bloco_de[arg] for op, arg in codigo if op == PUSHA)
+    vistos = set(pendentes)
+    while pendentes:
+        for x in sucessores[pendentes.pop()]:
+            if x not in vistos:
+                vistos.add(x)
+                pendentes.append(x)
+
+    if len(vistos) == len(blocos) and not constantes:
+        return codigo
+    novo = []
+    for b, (inicio, fim) in enumerate(blocos):
+        if b not in vistos:
+            continue
+        if b in constantes:
+            novo.extend(codigo[inicio:fim - 2])
+            if constantes[b]:
+                novo.append((JUMP, codigo[fim - 1][1]))
+        else:
+            novo.extend(codigo[inicio:fim])
+    return novo
+
+def _escritas_mortas(codigo, chamadas):
+    """Retira as escritas em variáveis que já não são lidas; devolve (código, houve mudança)."""
+    blocos, sucessores = blocos_basicos(codigo)
+    saida = variaveis_vivas(codigo, blocos, sucessores, chamadas)
+
+    mortas = set()
+    for (inicio, fim), vivas in zip(blocos, saida):
+        for k in range(fim - 1, inicio - 1, -1):
+            op, arg = codigo[k]
+            if op == STOREG:
+                if not vivas >> arg & 1:
+                    mortas.add(k)
+                vivas &= ~(1 << arg)
+            elif op == PUSHG:
+                vivas |= 1 << arg
+            elif op == CALL:
+                vivas |= chamadas
+    if not mortas:
+        return codigo, False
+
+    novo = []
+    for k, instr in enumerate(codigo):
+        if k not in mortas:
+            novo.append(instr)
+            continue
+        inicio = _inicio_valor(novo)
+        if inicio is None:
+            novo.append((POP, 1))
+        else:
+            del novo[inicio:]               # o valor só foi calculado para a escrita
+    return novo, True
+
+def _bytes_texto(codigo):
+    """Bytes das linhas do .ewvm com este código (sem as declarações das variáveis)."""
+    return sum(len(linha.encode('utf-8')) + 1 for linha in montar([], codigo).para_texto())
+
+def eliminar_codigo_morto(codigo, partilhadas=frozenset()):
+    """
+    Eliminação de código morto sobre o código gerado (ctx.codigo_meio):
+    blocos inalcançáveis, condições constantes e escritas em variáveis que
+    não voltam a ser lidas. 'partilhadas' são as posições globais usadas
+    nos corpos dos subprogramas (ctx.globais_partilhadas).
+    Devolve (novo código, instruções eliminadas, bytes do .ewvm poupados).
+    """
+    chamadas = 0
+    for pos in partilhadas:
+        chamadas |= 1 << pos
+    instrucoes, tamanho = sum(1 for op, _ in codigo if op is not None), _bytes_texto(codigo)
+    # Retirar escritas não muda os saltos: os blocos alcançáveis ficam os mesmos
+    codigo = _alcancaveis(codigo)
+    mudou = True
+    while mudou:
+        codigo, mudou = _escritas_mortas(codigo, chamadas)
+
+    # Saltos para a instrução seguinte (o que estava entre os dois era
+    # inalcançável) e rótulos gerados que deixaram de ser usados
+    seguintes = set()
+    final = []
+    for op, arg in reversed(codigo):
+        if op == JUMP and arg in seguintes:
+            continue
+        if op is None:
+            seguintes.add(arg)
+        else:
+            seguintes.clear()
+        final.append((op, arg))
+    final.reverse()
+    usados = {arg for op, arg in final if op in ROTULOS}
+    codigo = [instr for instr in final
+              if not (instr[0] is None and _ETIQUETA_GERADA.match(instr[1]) and instr[1] not in usados)]
+    return (codigo, instrucoes - sum(1 for op, _ in codigo if op is not None),
+            tamanho - _bytes_texto(codigo))
+
+# ---------------------------------------------------
+# Otimizações sobre a AST (antes da geração de código)
+# ---------------------------------------------------
+
+# Operadores com dois inteiros → inteiro ('/' gera DIV, tal como 'div')
+_ARITMETICOS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul,
+    '/': div_pascal, 'div': div_pascal, 'mod': mod_pascal,
+}
+
+# Operadores com dois valores do mesmo tipo (inteiros ou booleanos) → booleano
+_RELACIONAIS = {
+    '=': operator.eq, '<>': operator.ne, '<': operator.lt,
+    '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+# Expressões sem efeitos, que podem ser descartadas (ex.: 'false and x')
+_PURAS = {Num, Str, Bool, Id}
+
+# Literais neutros à direita (x+0, x*1, …) e à esquerda (0+x, 1*x, …),
+# como (operador, classe do literal, valor)
+_NEUTRO_DIREITA = {
+    ('+', Num, 0), ('-', Num, 0), ('*', Num, 1),
+    ('/', Num, 1), ('div', Num, 1),
+    ('and', Bool, True), ('or', Bool, False),
+}
+
+_NEUTRO_ESQUERDA = {
+    ('+', Num, 0), ('*', Num, 1),
+    ('and', Bool, True), ('or', Bool, False),
+}
+
+# Elementos absorventes: false and x = false, true or x = true
+_ABSORVENTES = {('and', Bool, False), ('or', Bool, True)}
+
+def _pura(expr):
+    """True se avaliar 'expr' não tem efeitos (pode ser descartada)."""
+    pendentes = [expr]
+    while pendentes:
+        no = pendentes.pop()
+        if type(no) is BinOp:
+            pendentes.append(no.esq)
+            pendentes.append(no.dir)
+        elif type(no) not in _PURAS:
+            return False
+    return True
+
+def dobrar_constantes(ast_program):
+    """
+    Dobragem de constantes e simplificação algébrica da AST de um programa
+    (arvore.Program, com os corpos dos subprogramas):
+      - operações entre literais são calculadas (div/mod com a semântica do
+        Pascal; divisões por zero ficam para a execução);
+      - x+0, 0+x, x-0, x*1, 1*x, x div 1, true and x, false or x → x;
+        false and x → false e true or x → true (se x não tiver efeitos);
+      - if/while com condição constante são substituídos pelo ramo que
+        executa (ou por um bloco vazio).
+    A AST recebida não é alterada: os nós simplificados são nós novos e os
+    sub-nós que não mudam são partilhados.
+    Como a geração de código, a AST é percorrida com pilhas explícitas (sem
+    recursão), para aceitar expressões e aninhamentos muito profundos.
+    Devolve (nova AST, número de simplificações).
+    """
+    simplificacoes = 0
+
+    def simplificar(expr, esq, dir_):
+        """Simplifica o binop 'expr' cujos operandos já simplificados são esq e dir_."""
+        nonlocal simplificacoes
+        op = expr.op
+        tipo_esq, tipo_dir = type(esq), type(dir_)
+
+        if tipo_esq is tipo_dir is Num and op in _ARITMETICOS:
+            if not (op in ('/', 'div', 'mod') and dir_.valor == 0):
+                simplificacoes += 1
+                return Num(_ARITMETICOS[op](esq.valor, dir_.valor))
+        if tipo_esq is tipo_dir and tipo_esq in LITERAIS and op in _RELACIONAIS:
+            simplificacoes += 1
+            return Bool(_RELACIONAIS[op](esq.valor, dir_.valor))
+        if tipo_esq is tipo_dir is Bool and op in ('and', 'or'):
+            simplificacoes += 1
+            return Bool(esq.valor and dir_.valor if op == 'and' else esq.valor or dir_.valor)
+
+        # Identidades (só se compara com as tabelas quando há um literal)
+        if tipo_dir in LITERAIS and (op, tipo_dir, dir_.valor) in _NEUTRO_DIREITA:
+            simplificacoes += 1
+            return esq
+        if tipo_esq in LITERAIS and (op, tipo_esq, esq.valor) in _NEUTRO_ESQUERDA:
+            simplificacoes += 1
+            return dir_
+        for lado, outro in ((esq, dir_), (dir_, esq)):
+            if type(lado) in LITERAIS and (op, type(lado), lado.valor) in _ABSORVENTES \
+                    and _pura(outro):
+                simplificacoes += 1
+                return lado
+
+        if esq is expr.esq and dir_ is expr.dir:
+            return expr
+        return BinOp(op, esq, dir_)
+
+    def expressao(raiz):
+        # Pós-ordem: (nó, False) ainda por expandir; (nó, True) com os dois
+        # operandos já simplificados no topo de 'feitos'
+        feitos = []
+        pendentes = [(raiz, False)]
+        while pendentes:
+            no, expandido = pendentes.pop()
+            if type(no) is Index:
+                # O índice é uma expressão à parte (a profundidade é a dos [ ] aninhados)
+                indice = expressao(no.indice)
+                feitos.append(no if indice is no.indice else Index(no.nome, indice))
+            elif type(no) is Call:
+                # Os argumentos também (a profundidade é a das chamadas aninhadas)
+                args = argumentos(no.args)
+                feitos.append(no if args is no.args else Call(no.nome, args))
+            elif type(no) is not BinOp:
+                feitos.append(no)
+            elif not expandido:
+                pendentes.append((no, True))
+                pendentes.append((no.dir, False))
+                pendentes.append((no.esq, False))
+            else:
+                dir_ = feitos.pop()
+                esq = feitos.pop()
+                feitos.append(simplificar(no, esq, dir_))
+        return feitos.pop()
+
+    def argumentos(args):
+        """Argumentos de uma chamada simplificados (a mesma lista, se nenhum mudou)."""
+        novos = [expressao(a) for a in args]
+        return args if all(n is a for n, a in zip(novos, args)) else novos
+
+    def instrucao(raiz):
+        # ('visitar', stmt) simplifica um statement; as entradas 'if',
+        # 'while', 'for' e 'block' reconstroem o nó com os statements filhos
+        # já simplificados, que estão no topo de 'feitos'
+        nonlocal simplificacoes
+        feitos = []
+        pendentes = [('visitar', raiz)]
+        while pendentes:
+            acao, stmt = pendentes.pop()
+            tipo = type(stmt)
+
+            if acao == 'if':
+                senao = feitos.pop() if stmt.senao is not None else None
+                feitos.append(If(stmt.cond, feitos.pop(), senao))
+            elif acao == 'while':
+                feitos.append(While(stmt.cond, feitos.pop()))
+            elif acao == 'for':
+                feitos.append(For(stmt.var, stmt.inicio, stmt.limite, feitos.pop(), stmt.direcao))
+            elif acao == 'block':
+                inicio = len(feitos) - len(stmt.instrucoes)
+                filhos = [s for s in feitos[inicio:] if not (type(s) is Block and not s.instrucoes)]
+                del feitos[inicio:]
+                feitos.append(Block(filhos))
+
+            elif tipo is Assign:
+                feitos.append(Assign(stmt.var, expressao(stmt.expr)))
+            elif tipo is AssignIndex:
+                feitos.append(AssignIndex(stmt.var, expressao(stmt.indice), expressao(stmt.expr)))
+            elif tipo is ReadIndex:
+                feitos.append(ReadIndex(stmt.var, expressao(stmt.indice)))
+            elif tipo is ProcCall:
+                feitos.append(ProcCall(stmt.nome, argumentos(stmt.args)))
+            elif tipo is Write:
+                feitos.append(Write([expressao(e) for e in stmt.exprs], stmt.nova_linha))
+            elif tipo is If:
+                cond = expressao(stmt.cond)
+                if type(cond) in LITERAIS:
+                    simplificacoes += 1
+                    ramo = stmt.entao if cond.valor else stmt.senao
+                    if ramo is None:
+                        feitos.append(Block([]))
+                    else:
+                        pendentes.append(('visitar', ramo))
+                else:
+                    pendentes.append(('if', If(cond, stmt.entao, stmt.senao)))
+                    if stmt.senao is not None:
+                        pendentes.append(('visitar', stmt.senao))
+                    pendentes.append(('visitar', stmt.entao))
+            elif tipo is While:
+                cond = expressao(stmt.cond)
+                if type(cond) in LITERAIS and not cond.valor:
+                    simplificacoes += 1
+                    feitos.append(Block([]))
+                else:
+                    pendentes.append(('while', While(cond, stmt.corpo)))
+                    pendentes.append(('visitar', stmt.corpo))
+            elif tipo is For:
+                pendentes.append(('for', For(stmt.var, expressao(stmt.inicio), expressao(stmt.limite),
+                                             stmt.corpo, stmt.direcao)))
+                pendentes.append(('visitar', stmt.corpo))
+            elif tipo is Block:
+                pendentes.append(('block', stmt))
+                pendentes.extend(('visitar', s) for s in reversed(stmt.instrucoes))
+            else:
+                feitos.append(stmt)
+        return feitos.pop()
+
+    # Os corpos dos subprogramas são nós novos; a tabela local é partilhada
+    subprogramas = [Subprograma(sub.nome, sub.parametros, sub.retorno, sub.tabela, sub.locais,
+                                instrucao(sub.corpo))
+                    for sub in ast_program.subprogramas]
+    return Program(ast_program.nome, instrucao(ast_program.bloco), subprogramas), simplificacoes
@@ -1,6 +1,19 @@
 from lexer import tokens, build_lexer
-import ply.yacc as yacc
-import sys, re
+from divisor import dividir_programas
+from cache import CacheCompilacao
+from otimizador import otimizar_peephole, dobrar_constantes, eliminar_codigo_morto
+from alocacao import alocar_slots
+from semantica import ErroSemantico, anotar_tipos
+from perfil import Perfil, SEM_PERFIL
+from perfil import registo as perfil_registo, linha_json as perfil_json, tabela as perfil_tabela
+from arvore import (Num, Real, Str, Bool, Id, Index, Call, BinOp, Assign, AssignIndex, Read, ReadIndex,
+                    Write, If, While, For, ProcCall, Block, Program, TipoArray, Subprograma, nos)
+from instrucoes import (Programa, montar, escrever, PUSHG, PUSHI, STOREG, JZ, JUMP, ADD, SUB, MUL, DIV,
+                        MOD, EQUAL, NOT, INF, INFEQ, SUP, SUPEQ, AND, OR, PUSHS, PUSHF,
+                        WRITEI, WRITEF, WRITES, WRITELN, READ, ATOI, ATOF, POP, DUP, PUSHN, STOP,
+                        PUSHL, STOREL, PUSHGP, PADD, LOAD, STORE, CHECK, PUSHA, CALL, RETURN, ITOF)
+import sys, os, copy, hashlib
+from collections import deque
 
 # ---------------------------------------------------
 # Precedência de operadores
@@ -14,333 +27,657 @@ precedence = (
 )
 
 # ---------------------------------------------------
-# Estruturas AST e tabelas auxiliares
+# Contexto de compilação
 # ---------------------------------------------------
 
-codigo_meio = []          # lista de linhas (strings) do .ewvm que vamos gerar
-tabela_variaveis = {}     # dicionário: nome_variável → (tipo, índice_global)
-contador_etiquetas = 0    # para gerar L0, L1, L2, …
-next_global_index = 0     # para atribuir índices a variáveis globais
-
-# ---------------------------------------------------
-# Funções auxiliares de geração de código (EWVM)
-# ---------------------------------------------------
-
-def nova_etiqueta():
+class Ambito:
     """
-    Retorna um novo rótulo Lx (sem espaços antes), 
-    e incrementa o contador interno.
+    Onde estão as variáveis do código em geração. No programa principal
+    'locais' está vazio e tudo é global (PUSHG/STOREG). No corpo de um
+    subprograma, 'locais' é a tabela local (nome → (tipo, posição)) e as
+    posições são do frame, relativas ao fp (PUSHL/STOREL). No corpo de um
+    subprograma expandido em linha (inline), 'locais' aponta para posições
+    reservadas no âmbito de quem chama, com as instruções desse âmbito.
+    'base' é o âmbito dono das posições: a área global (tamanho None) ou um
+    frame com 'tamanho' posições; guarda as posições escondidas dos limites
+    dos ciclos for ('ocultas', uma por nível) e os âmbitos dos subprogramas
+    expandidos nele ('expansoes', nome → Ambito).
     """
-    global contador_etiquetas
-    etiqueta = f"L{contador_etiquetas}"
-    contador_etiquetas += 1
-    return etiqueta
-
-def generate_expr_code(expr):
+    __slots__ = ('locais', 'ler', 'escrever', 'base', 'tamanho', 'ocultas', 'expansoes')
+
+    def __init__(self, locais, ler, escrever, base=None, tamanho=None):
+        self.locais = locais
+        self.ler = ler
+        self.escrever = escrever
+        self.base = base if base is not None else self
+        self.tamanho = tamanho
+        self.ocultas = []
+        self.expansoes = {}
+
+class CompilationContext:
     """
-    Gera instruções EWVM para avaliar 'expr' e deixar o valor no topo da pilha.
-    Em cada caso, usamos exatamente os opcodes da documentação:
-      - Para inteiro literal: PUSHI <n>
-      - Para real literal:    PUSHF <x>
-      - Para string literal:  PUSHS "texto"
-      - Para variável (id):   PUSHG <índice>
-      - Para boolean literal: PUSHI 1 (True) ou PUSHI 0 (False)
-      - Para binop: empilha esquerda, empilha direita, emite opcode aritmético/booleano
+    Estado de uma compilação: opções, código gerado, tabela de símbolos,
+    contador de etiquetas, próximo índice global livre, estatísticas e
+    perfil (com a opção 'perfil'). Cada programa é compilado com o
+    seu próprio contexto, por isso várias compilações podem correr ao mesmo
+    tempo no mesmo processo (threads, asyncio, ...) sem estado partilhado.
     """
-    tp = expr[0]
 
-    if tp == 'num':
-        # Literais inteiros
-        val = expr[1]
-        codigo_meio.append(f"PUSHI {val}")
+    def __init__(self, opcoes=None):
+        self.opcoes = opcoes or {}     # opções de compilação (ex.: {'lexer': 'rapido'})
+        self.codigo_meio = []          # código gerado: pares (opcode, operando) e (None, rótulo)
+        self.tabela_variaveis = {}     # dicionário: nome_variável → (tipo, índice_global); um array
+                                       # (arvore.TipoArray) ocupa len(tipo) posições a partir do índice;
+                                       # um subprograma fica como (arvore.Subprograma, None)
+        self.contador_etiquetas = 0    # para gerar L0, L1, L2, …
+        self.next_global_index = 0     # para atribuir índices a variáveis globais
+        self.ambito = Ambito({}, PUSHG, STOREG)   # onde estão as variáveis do código em geração
+        self.nivel_for = 0             # ciclos for com limite guardado à volta do código em geração
+        self.declarando = None         # subprograma cujas declarações o parser está a ler
+        self.subprogramas = {}         # nome → arvore.Subprograma, na geração de código
+        self.expandir = frozenset()    # nomes dos subprogramas expandidos em linha (inline)
+        self.globais_partilhadas = frozenset()   # posições globais usadas nos corpos dos subprogramas
+        self.posicoes_arrays = 0       # com 'slots': posições 0…n-1, onde agrupar_arrays pôs os arrays
+        self.estatisticas = {}         # contadores das otimizações (ex.: {'peephole': 12})
+        self.perfil = Perfil() if self.opcoes.get('perfil') else None   # tempos e contadores (perfil.py)
+
+    def nova_etiqueta(self):
+        """
+        Retorna um novo rótulo Lx (sem espaços antes),
+        e incrementa o contador interno.
+        """
+        etiqueta = f"L{self.contador_etiquetas}"
+        self.contador_etiquetas += 1
+        return etiqueta
+
+    def alocar_global(self, n=1):
+        """Reserva os próximos n índices globais livres e devolve o primeiro."""
+        idx = self.next_global_index
+        self.next_global_index += n
+        return idx
+
+    def agrupar_arrays(self):
+        """
+        Para a opção 'slots', antes da geração de código: os arrays passam
+        para as primeiras posições globais e as variáveis simples para as
+        seguintes (pela ordem da declaração). Os arrays são acedidos com
+        deslocamentos a partir de gp e não podem mudar de posição depois de
+        gerado o código; assim, as variáveis simples que alocar_slots passa
+        a locais não deixam buracos antes deles.
+        """
+        proxima = 0
+        for simples in (False, True):
+            for nome, (tipo, _) in self.tabela_variaveis.items():
+                if type(tipo) is Subprograma or (type(tipo) is not TipoArray) != simples:
+                    continue
+                self.tabela_variaveis[nome] = (tipo, proxima)
+                proxima += len(tipo) if type(tipo) is TipoArray else 1
+            if not simples:
+                self.posicoes_arrays = proxima
+
+    def variaveis_globais(self, slots=False):
+        """
+        Nomes das posições globais declaradas, pela ordem dos índices, para
+        montar(): cada elemento de um array tem a sua ('a[1]', 'a[2]', …).
+        Com a opção 'slots' (depois de agrupar_arrays e de alocar_slots) as
+        variáveis simples passam a locais e a área global só tem os arrays e,
+        a seguir, as variáveis usadas nos subprogramas.
+        """
+        posicoes = []
+        for nome, (tipo, idx) in self.tabela_variaveis.items():
+            if type(tipo) is TipoArray:
+                posicoes.extend((idx + k, f"{nome}[{i}]")
+                                for k, i in enumerate(range(tipo.inicio, tipo.fim + 1)))
+            elif type(tipo) is not Subprograma and (not slots or idx in self.globais_partilhadas):
+                posicoes.append((idx, nome))
+        return [nome for _, nome in sorted(posicoes)]
+
+    def reservar(self):
+        """
+        Nova posição sem nome no âmbito em geração: global no programa
+        principal (depois das declaradas), local no frame de um subprograma.
+        """
+        base = self.ambito.base
+        if base.tamanho is None:
+            return self.alocar_global()
+        base.tamanho += 1
+        return base.tamanho - 1
+
+    def posicao_oculta(self, nivel):
+        """
+        Posição escondida onde um ciclo for de nível 'nivel' guarda o
+        limite, no âmbito em geração. Ciclos ao mesmo nível nunca estão
+        ativos ao mesmo tempo e partilham-na; é reservada no primeiro uso.
+        """
+        ocultas = self.ambito.base.ocultas
+        while len(ocultas) <= nivel:
+            ocultas.append(self.reservar())
+        return ocultas[nivel]
 
-    elif tp == 'real':
-        # Literais reais (caso seu lexer retorne floats)
-        val = expr[1]
-        codigo_meio.append(f"PUSHF {val}")
-
-    elif tp == 'str':
-        # Literais de string → PUSHS "texto"
-        texto = expr[1].replace('"', '\\"')
-        codigo_meio.append(f'PUSHS "{texto}"')
-
-    elif tp == 'bool':
-        # Booleano → mapeamos True → 1, False → 0
-        if expr[1]:
-            codigo_meio.append("PUSHI 1")
-        else:
-            codigo_meio.append("PUSHI 0")
-
-    elif tp == 'id':
-        # Variável global: empilha o valor via PUSHG <índice>
-        nome_var = expr[1]
-        tipo_var, idx = tabela_variaveis[nome_var]
-        codigo_meio.append(f"PUSHG {idx}")
-
-    elif tp == 'binop':
-        # Operação binária: ('binop', operador, esquerdo, direito)
-        op    = expr[1].lower()
-        e_esq = expr[2]
-        e_dir = expr[3]
-
-        # 1) Empilha recursivamente o valor de e_esq
-        generate_expr_code(e_esq)
-        # 2) Empilha recursivamente o valor de e_dir
-        generate_expr_code(e_dir)
-
-        # 3) Emite o opcode correto
-        if op == '+':
-            codigo_meio.append("ADD")
-        elif op == '-':
-            codigo_meio.append("SUB")
-        elif op == '*':
-            codigo_meio.append("MUL")
-        elif op == '/':
-            codigo_meio.append("DIV")
-        elif op == 'div':
-            codigo_meio.append("DIV")
-        elif op == 'mod':
-            codigo_meio.append("MOD")
-        elif op == '=':
-            codigo_meio.append("EQUAL")
-        elif op == '<>':
-            # “<>” → EQUAL + NOT
-            codigo_meio.append("EQUAL")
-            codigo_meio.append("NOT")
-        elif op == '<':
-            codigo_meio.append("INF")
-        elif op == '<=':
-            codigo_meio.append("INFEQ")
-        elif op == '>':
-            codigo_meio.append("SUP")
-        elif op == '>=':
-            codigo_meio.append("SUPEQ")
-        elif op == 'and':
-            codigo_meio.append("AND")
-        elif op == 'or':
-            codigo_meio.append("OR")
-        else:
-            raise ValueError(f"Operador desconhecido no codegen: {op}")
+# ---------------------------------------------------
+# Funções auxiliares de geração de código (EWVM)
+#
+# A geração não é recursiva: os nós a tratar ficam numa pilha explícita, a
+# agenda. Cada nó retirado ou emite as suas instruções ou volta a pôr na
+# agenda, pela ordem inversa, o que falta gerar: sub-nós e instruções já
+# prontas, (opcode, operando) ou (None, rótulo), que são só emitidas. Por
+# exemplo, um binop agenda o operando esquerdo, o direito e o opcode; um
+# 'if' agenda a condição, o JZ, o ramo THEN, …
+# Assim a profundidade da AST (expressões a+a+…+a com milhares de termos,
+# begin…end muito aninhados) não está limitada pelo limite de recursão do
+# Python, e o código gerado é exatamente o de um percurso recursivo.
+# Cada classe de nó (arvore.py) tem a sua função em _GERADORES.
+# ---------------------------------------------------
 
+# Opcodes de cada operador binário
+_OPERADORES = {
+    '+': (ADD,), '-': (SUB,), '*': (MUL,), '/': (DIV,),
+    'div': (DIV,), 'mod': (MOD,), '=': (EQUAL,),
+    '<>': (EQUAL, NOT),     # “<>” → EQUAL + NOT
+    '<': (INF,), '<=': (INFEQ,), '>': (SUP,), '>=': (SUPEQ,),
+    'and': (AND,), 'or': (OR,),
+}
+
+# As mesmas instruções, já pela ordem em que entram na agenda
+_AGENDA_OPERADORES = {op: tuple((opcode, None) for opcode in reversed(opcodes))
+                      for op, opcodes in _OPERADORES.items()}
+
+# Opcode de escrita de cada tipo (os restantes escrevem-se com WRITEI)
+_ESCRITA = {'real': WRITEF, 'string': WRITES}
+
+# Conversão do texto lido por READ para cada tipo (as strings não se convertem)
+_CONVERSAO = {'integer': ATOI, 'real': ATOF, 'boolean': ATOI}
+
+# ---------------- expressões ----------------
+
+def _gerar_id(no, ctx, emitir, agenda):
+    # Variável global: empilha o valor via PUSHG <índice>; local do âmbito
+    # em geração: com a instrução dele (PUSHL <posição> num subprograma)
+    local = ctx.ambito.locais.get(no.nome)
+    if local is None:
+        emitir((PUSHG, ctx.tabela_variaveis[no.nome][1]))
     else:
-        raise ValueError(f"Tipo de expressão inesperado em generate_expr_code: {tp}")
-
-def generate_stmt_code(stmt):
-    """
-    Gera instruções EWVM para o nó de statement 'stmt', sem espaços à esquerda.
-    Cada tipo de stmt mapeia para as instruções exatas da sua VM.
-    """
-    tp = stmt[0]
-
-    if tp == 'assign':
-        # ('assign', var, expr)
-        var  = stmt[1]
-        expr = stmt[2]
-
-        # 1) Empilha o valor de 'expr'
-        generate_expr_code(expr)
-
-        # 2) Grava em 'var' usando STOREG <índice>
-        tipo_var, idx = tabela_variaveis[var]
-        codigo_meio.append(f"STOREG {idx}")
-
-    elif tp == 'read':
-        # ('read', var)
-        var = stmt[1]
-        tipo_var, idx = tabela_variaveis[var]
-
-        # 1) Lê string do teclado
-        codigo_meio.append("READ")
-
-        # 2) Converte conforme tipo
-        if tipo_var == 'integer':
-            codigo_meio.append("ATOI")
-        elif tipo_var == 'real':
-            codigo_meio.append("ATOF")
-        elif tipo_var == 'boolean':
-            codigo_meio.append("ATOI")
-        # se for 'string', não converte
-
-        # 3) Grava em var → STOREG <índice>
-        codigo_meio.append(f"STOREG {idx}")
-
-    elif tp == 'write':
-        # ('write', [expressions], newline_flag)
-        lista_expr = stmt[1]
-        newline    = stmt[2]
-
-        for e in lista_expr:
-            # 1) empilha o valor de 'e'
-            generate_expr_code(e)
-
-            # 2) escolhe o opcode de impressão:
-            if e[0] == 'num' or e[0] == 'bool':
-                codigo_meio.append("WRITEI")
-            elif e[0] == 'real':
-                codigo_meio.append("WRITEF")
-            elif e[0] == 'str':
-                codigo_meio.append("WRITES")
-            elif e[0] == 'id':
-                nome_var = e[1]
-                tipo_v, _ = tabela_variaveis[nome_var]
-                if tipo_v in ('integer', 'boolean'):
-                    codigo_meio.append("WRITEI")
-                elif tipo_v == 'real':
-                    codigo_meio.append("WRITEF")
-                elif tipo_v == 'string':
-                    codigo_meio.append("WRITES")
-                else:
-                    codigo_meio.append("WRITEI")
-            else:
-                # Se for binop, infere tipo do resultado
-                def infer_tipo(no):
-                    if no[0] == 'binop':
-                        opb = no[1].lower()
-                        if opb in ['=', '<>', '<', '<=', '>', '>=', 'and', 'or']:
-                            return 'boolean'
-                        t1 = infer_tipo(no[2]) if no[2][0] == 'binop' else no[2][0]
-                        t2 = infer_tipo(no[3]) if no[3][0] == 'binop' else no[3][0]
-                        if t1 == 'real' or t2 == 'real':
-                            return 'real'
-                        return 'integer'
-                    return no[0]
-
-                tipo_res = infer_tipo(e)
-                if tipo_res == 'real':
-                    codigo_meio.append("WRITEF")
-                else:
-                    codigo_meio.append("WRITEI")
-
-        if newline:
-            codigo_meio.append("WRITELN")
-
-    elif tp == 'if':
-        # ('if', cond, then_stmt, else_stmt)
-        cond   = stmt[1]
-        then_s = stmt[2]
-        else_s = stmt[3]
-
-        etiqueta_else = nova_etiqueta()
-        etiqueta_fim  = nova_etiqueta()
-
-        # 1) Empilha condição
-        generate_expr_code(cond)
-        # 2) Se zero, JZ → vai para etiqueta_else
-        codigo_meio.append(f"JZ {etiqueta_else}")
-        # 3) Gera THEN
-        generate_stmt_code(then_s)
-        # 4) Pula para fim
-        codigo_meio.append(f"JUMP {etiqueta_fim}")
-        # 5) Rótulo ELSE
-        codigo_meio.append(f"{etiqueta_else}:")
-        if else_s is not None:
-            generate_stmt_code(else_s)
-        # 6) Rótulo FIM
-        codigo_meio.append(f"{etiqueta_fim}:")
-
-    elif tp == 'while':
-        # ('while', cond, corpo_stmt)
-        cond  = stmt[1]
-        corpo = stmt[2]
-
-        etiqueta_inicio = nova_etiqueta()
-        etiqueta_saida  = nova_etiqueta()
-
-        # 1) Rótulo início
-        codigo_meio.append(f"{etiqueta_inicio}:")
-        # 2) Empilha condição
-        generate_expr_code(cond)
-        # 3) Se falso, pula para etiqueta_saida
-        codigo_meio.append(f"JZ {etiqueta_saida}")
-        # 4) Gera corpo
-        generate_stmt_code(corpo)
-        # 5) Pula de volta para início
-        codigo_meio.append(f"JUMP {etiqueta_inicio}")
-        # 6) Rótulo saída
-        codigo_meio.append(f"{etiqueta_saida}:")
-
-    elif tp == 'for':
-        # stmt = ('for', var, expr_inicio, expr_limite, corpo_stmt, direction)
-        var_nome     = stmt[1]
-        expr_inicio  = stmt[2]
-        expr_limite  = stmt[3]
-        corpo        = stmt[4]
-        direction    = stmt[5]  # 'to' ou 'downto'
-
-        # 1) Atribui à variável de controle o valor inicial
-        generate_expr_code(expr_inicio)
-        tipo_var, idx = tabela_variaveis[var_nome]
-        codigo_meio.append(f"STOREG {idx}")  # var := expr_inicio
-
-        # 2) Cria etiquetas para início e saída do loop
-        etiqueta_inicio = nova_etiqueta()
-        etiqueta_saida  = nova_etiqueta()
-
-        # 3) Rótulo de início
-        codigo_meio.append(f"{etiqueta_inicio}:")
-
-        # 4) Carrega a variável de controle e compara com o limite
-        #    Para 'to': empilha var e limite, usa INFEQ para i <= limite
-        #    Para 'downto': usa SUPEQ para i >= limite
-        codigo_meio.append(f"PUSHG {idx}")
-        generate_expr_code(expr_limite)
-        if direction == 'to':
-            codigo_meio.append("INFEQ")
-        else:  # 'downto'
-            codigo_meio.append("SUPEQ")
-        # Se comparação for zero, significa condição falhou → sai do loop
-        codigo_meio.append(f"JZ {etiqueta_saida}")
-
-        # 5) Gera o corpo do loop
-        generate_stmt_code(corpo)
-
-        # 6) Incrementa ou decrementa a variável de controle
-        codigo_meio.append(f"PUSHG {idx}")    # empilha var atual
-        codigo_meio.append("PUSHI 1")         # empilha constante 1
-        if direction == 'to':
-            codigo_meio.append("ADD")         # var + 1
+        emitir((ctx.ambito.ler, local[1]))
+
+def _gerar_num(no, ctx, emitir, agenda):
+    # Literais inteiros
+    emitir((PUSHI, no.valor))
+
+def _gerar_str(no, ctx, emitir, agenda):
+    # Literais de string → PUSHS "texto" (as aspas são escapadas ao escrever o .ewvm)
+    emitir((PUSHS, no.valor))
+
+def _gerar_bool(no, ctx, emitir, agenda):
+    # Booleano → mapeamos True → 1, False → 0
+    emitir((PUSHI, 1 if no.valor else 0))
+
+def _gerar_real(no, ctx, emitir, agenda):
+    # Literais reais (caso seu lexer retorne floats)
+    emitir((PUSHF, no.valor))
+
+def _gerar_index(no, ctx, emitir, agenda):
+    # PUSHGP, endereço do elemento e LOAD com o deslocamento constante
+    tipo, base = ctx.tabela_variaveis[no.nome]
+    agenda.append((LOAD, _deslocamento(tipo, base, no.indice)))
+    _agendar_endereco(tipo, no.indice, ctx, agenda)
+
+def _gerar_binop(no, ctx, emitir, agenda):
+    # 1) empilha o valor de esq, 2) o de dir, 3) emite o opcode
+    instrucoes = _AGENDA_OPERADORES.get(no.op)
+    if instrucoes is None:
+        raise ValueError(f"Operador desconhecido no codegen: {no.op}")
+    agenda.extend(instrucoes)
+    agenda.append(no.dir)
+    agenda.append(no.esq)
+
+# ---------------- arrays ----------------
+#
+# Um array ocupa posições globais seguidas, a partir do índice 'base' que
+# lhe foi atribuído na declaração. O elemento a[i] está no endereço
+# gp + i + (base - inicio): o deslocamento constante vai no próprio LOAD /
+# STORE e só o índice é somado em tempo de execução:
+#   a[i]        →  PUSHGP  <i>  [CHECK inicio, fim]  PADD  LOAD base-inicio
+#   a[i] := e   →  PUSHGP  <i>  [CHECK inicio, fim]  PADD  <e>  STORE base-inicio
+# Com um índice constante k (já verificado na análise semântica) não há
+# soma: PUSHGP e LOAD/STORE base+k-inicio. O CHECK (verificação dos
+# limites) é omitido com a opção 'sem_limites'.
+
+def _deslocamento(tipo, base, indice):
+    """Deslocamento de LOAD/STORE para o elemento 'indice' do array."""
+    if type(indice) is Num:
+        return base + indice.valor - tipo.inicio
+    return base - tipo.inicio
+
+def _agendar_endereco(tipo, indice, ctx, agenda):
+    """Agenda o endereço (sem o deslocamento) do elemento 'indice' do array."""
+    if type(indice) is not Num:
+        agenda.append((PADD, None))
+        if not ctx.opcoes.get('sem_limites'):
+            agenda.append((CHECK, (tipo.inicio, tipo.fim)))
+        agenda.append(indice)
+    agenda.append((PUSHGP, None))
+
+# ---------------- condições em curto-circuito (opção 'curto_circuito') ----------------
+#
+# A condição de um if/while com and/or passa a ser traduzida em saltos:
+# cada operando salta diretamente para o destino quando já decide o
+# resultado, e o outro não é avaliado. A EWVM só tem JZ, por isso "saltar
+# se verdadeiro" usa a comparação contrária (EQUAL para '<>'; SUPEQ para
+# '<' entre inteiros, …) ou, nos outros casos, NOT + JZ:
+#   a and b, salta se falso para F:   a JZ F  b JZ F
+#   a or b,  salta se falso para F:   a NOT JZ V  b JZ F  V:
+# Sem a opção, and/or avaliam os dois lados e usam AND/OR.
+
+# Comparação contrária de cada operador, para saltar se verdadeiro com JZ.
+# As de ordem só entre inteiros: com reais, NaN falha em ambas
+_CONTRARIOS = {'<>': EQUAL, '<': SUPEQ, '<=': SUP, '>': INFEQ, '>=': INF}
+
+class _Condicao:
+    """Condição a gerar como saltos: vai para 'etiqueta' se o valor de 'no' for 'salta_se'."""
+    __slots__ = ('no', 'etiqueta', 'salta_se')
+
+    def __init__(self, no, etiqueta, salta_se):
+        self.no = no
+        self.etiqueta = etiqueta
+        self.salta_se = salta_se
+
+def _agendar_condicao(cond, etiqueta_falso, ctx, agenda):
+    """Agenda 'cond' seguida de um salto para etiqueta_falso se for falsa."""
+    if ctx.opcoes.get('curto_circuito'):
+        agenda.append(_Condicao(cond, etiqueta_falso, False))
+    else:
+        agenda.append((JZ, etiqueta_falso))
+        agenda.append(cond)
+
+def _gerar_condicao(c, ctx, emitir, agenda):
+    no = c.no
+    op = no.op if type(no) is BinOp else None
+    if op == 'and' or op == 'or':
+        # O operando esquerdo decide quando é falso (and) ou verdadeiro (or):
+        # se esse é o caso do salto, salta também para c.etiqueta; senão
+        # salta para depois do operando direito
+        decide = op == 'or'
+        if decide == c.salta_se:
+            agenda.append(_Condicao(no.dir, c.etiqueta, c.salta_se))
+            agenda.append(_Condicao(no.esq, c.etiqueta, c.salta_se))
         else:
-            codigo_meio.append("SUB")         # var - 1
-        codigo_meio.append(f"STOREG {idx}")   # armazena de volta em var
-
-        # 7) Pula de volta para o início
-        codigo_meio.append(f"JUMP {etiqueta_inicio}")
-
-        # 8) Rótulo de saída
-        codigo_meio.append(f"{etiqueta_saida}:")
-
-    elif tp == 'block':
-        # ('block', [lista_de_statements])
-        for s in stmt[1]:
-            generate_stmt_code(s)
-
+            seguinte = ctx.nova_etiqueta()
+            agenda.append((None, seguinte))
+            agenda.append(_Condicao(no.dir, c.etiqueta, c.salta_se))
+            agenda.append(_Condicao(no.esq, seguinte, decide))
+    elif not c.salta_se:
+        agenda.append((JZ, c.etiqueta))
+        agenda.append(no)
+    elif op in _CONTRARIOS and (op == '<>' or no.esq.tipo == no.dir.tipo == 'integer'):
+        agenda.append((JZ, c.etiqueta))          # ex.: a < b verdadeiro ⇔ a >= b dá 0
+        agenda.append((_CONTRARIOS[op], None))
+        agenda.append(no.dir)
+        agenda.append(no.esq)
     else:
-        raise ValueError(f"Tipo de statement inesperado em generate_stmt_code: {tp}")
-
-def generate_code(ast_program):
+        agenda.append((JZ, c.etiqueta))
+        agenda.append((NOT, None))
+        agenda.append(no)
+
+# ---------------- statements ----------------
+
+def _agendar_valor(expr, tipo, agenda):
+    """Agenda 'expr' para ser guardada num destino do tipo 'tipo' (integer → real com ITOF)."""
+    if tipo == 'real' and expr.tipo == 'integer':
+        agenda.append((ITOF, None))
+    agenda.append(expr)
+
+def _gerar_assign(no, ctx, emitir, agenda):
+    # 1) empilha o valor de 'expr' (convertido, se for um inteiro numa
+    #    variável real), 2) grava em 'var' usando STOREG <índice> (ou
+    #    STOREL <posição>, se for local)
+    tipo_var, _, escrever, idx = _variavel(ctx, no.var)
+    agenda.append((escrever, idx))
+    _agendar_valor(no.expr, tipo_var, agenda)
+
+def _gerar_assign_index(no, ctx, emitir, agenda):
+    # 1) endereço do elemento, 2) valor de 'expr', 3) STORE com o deslocamento
+    tipo, base = ctx.tabela_variaveis[no.var]
+    agenda.append((STORE, _deslocamento(tipo, base, no.indice)))
+    _agendar_valor(no.expr, tipo.elemento, agenda)
+    _agendar_endereco(tipo, no.indice, ctx, agenda)
+
+def _gerar_block(no, ctx, emitir, agenda):
+    agenda.extend(reversed(no.instrucoes))
+
+def _gerar_if(no, ctx, emitir, agenda):
+    etiqueta_else = ctx.nova_etiqueta()
+    etiqueta_fim  = ctx.nova_etiqueta()
+
+    agenda.append((None, etiqueta_fim))          # 6) Rótulo FIM
+    if no.senao is not None:
+        agenda.append(no.senao)                  #    Gera ELSE
+    agenda.append((None, etiqueta_else))         # 5) Rótulo ELSE
+    agenda.append((JUMP, etiqueta_fim))          # 4) Pula para fim
+    agenda.append(no.entao)                      # 3) Gera THEN
+    _agendar_condicao(no.cond, etiqueta_else, ctx, agenda)  # 1-2) Condição; se falsa, JZ → etiqueta_else
+
+def _gerar_while(no, ctx, emitir, agenda):
+    etiqueta_inicio = ctx.nova_etiqueta()
+    etiqueta_saida  = ctx.nova_etiqueta()
+
+    agenda.append((None, etiqueta_saida))        # 6) Rótulo saída
+    agenda.append((JUMP, etiqueta_inicio))       # 5) Pula de volta para início
+    agenda.append(no.corpo)                      # 4) Gera corpo
+    _agendar_condicao(no.cond, etiqueta_saida, ctx, agenda)  # 2-3) Condição; se falsa, pula para etiqueta_saida
+    agenda.append((None, etiqueta_inicio))       # 1) Rótulo início
+
+def _gerar_write(no, ctx, emitir, agenda):
+    if no.nova_linha:
+        agenda.append((WRITELN, None))
+    for e in reversed(no.exprs):
+        # 1) empilha o valor de 'e', 2) WRITEI / WRITEF / WRITES conforme
+        #    o tipo já calculado pela análise semântica
+        agenda.append((_ESCRITA.get(e.tipo, WRITEI), None))
+        agenda.append(e)
+
+def _gerar_read(no, ctx, emitir, agenda):
+    tipo_var, _, escrever, idx = _variavel(ctx, no.var)
+
+    # 1) Lê string do teclado
+    emitir((READ, None))
+
+    # 2) Converte conforme tipo
+    if tipo_var == 'integer':
+        emitir((ATOI, None))
+    elif tipo_var == 'real':
+        emitir((ATOF, None))
+    elif tipo_var == 'boolean':
+        emitir((ATOI, None))
+    # se for 'string', não converte
+
+    # 3) Grava em var → STOREG <índice> (STOREL <posição>, se for local)
+    emitir((escrever, idx))
+
+def _gerar_read_index(no, ctx, emitir, agenda):
+    # 1) endereço do elemento, 2) lê e converte como _gerar_read, 3) STORE
+    tipo, base = ctx.tabela_variaveis[no.var]
+    agenda.append((STORE, _deslocamento(tipo, base, no.indice)))
+    if tipo.elemento in _CONVERSAO:
+        agenda.append((_CONVERSAO[tipo.elemento], None))
+    agenda.append((READ, None))
+    _agendar_endereco(tipo, no.indice, ctx, agenda)
+
+class _FimFor:
+    """Marca, na agenda, o fim de um ciclo for com o limite numa posição escondida."""
+    __slots__ = ()
+
+_FIM_FOR = _FimFor()
+
+def _gerar_fim_for(no, ctx, emitir, agenda):
+    ctx.nivel_for -= 1
+
+def _gerar_for(no, ctx, emitir, agenda):
     """
-    Recebe ast_program = ('program', nome, bloco_stmt)
-    1) Declara todas as variáveis em tabela_variaveis (já povoada por p_declaracao)
-       gerando "nome: 0" na ordem dos índices.
-    2) Em seguida, insere uma linha em branco e o rótulo START:.
-    3) Por fim, gera o bloco de statements e acrescenta STOP.
+    O limite é avaliado uma só vez, como manda o Pascal: um literal é
+    empilhado diretamente, outra expressão fica numa posição escondida
+    (uma por nível de ciclos aninhados). O teste é feito uma vez à entrada
+    e depois só no fim de cada iteração, já com a variável incrementada:
+
+        <inicio> <limite> STOREG t STOREG i       (ou <inicio> STOREG i)
+        PUSHG i PUSHG t INFEQ JZ Lsaida           (SUPEQ para downto)
+      Lcorpo:
+        <corpo>
+        PUSHG i PUSHI 1 ADD DUP 1 STOREG i        (SUB para downto)
+        PUSHG t SUP JZ Lcorpo                     (INF para downto)
+      Lsaida:
+
+    No fim, como antes, i vale limite + 1 (ou o valor inicial, se o corpo
+    nunca correu). Num subprograma, i e t podem ser locais (PUSHL/STOREL).
     """
-    nome_prog = ast_program[1]
-    bloco     = ast_program[2]
-
-    # 1) Declaração de variáveis (cada var com “nome: 0”):
-    for var, (tipo, idx) in tabela_variaveis.items():
-        codigo_meio.append(f"{var}: 0:")
+    _, ler, escrever, idx = _variavel(ctx, no.var)
+    etiqueta_corpo = ctx.nova_etiqueta()
+    etiqueta_saida = ctx.nova_etiqueta()
+    para_cima = no.direcao == 'to'
+
+    if type(no.limite) is Num:
+        limite = (PUSHI, no.limite.valor)
+        guardar = None
+    else:
+        oculta = ctx.posicao_oculta(ctx.nivel_for)
+        limite = (ctx.ambito.ler, oculta)
+        guardar = (ctx.ambito.escrever, oculta)
+        ctx.nivel_for += 1
+        agenda.append(_FIM_FOR)                                   # 6) Liberta o nível do limite
+
+    agenda.append((None, etiqueta_saida))                         # 5) Rótulo de saída
+    agenda.append((JZ, etiqueta_corpo))                           # 4) Continua se i não passou o limite
+    agenda.append((SUP if para_cima else INF, None))
+    agenda.append(limite)
+    agenda.append((escrever, idx))                                # 3) Incrementa ou decrementa
+    agenda.append((DUP, 1))                                       #    a variável de controlo
+    agenda.append((ADD if para_cima else SUB, None))
+    agenda.append((PUSHI, 1))
+    agenda.append((ler, idx))
+    agenda.append(no.corpo)                                       # 2) Corpo
+    agenda.append((None, etiqueta_corpo))
+    agenda.append((JZ, etiqueta_saida))                           # 1) Teste à entrada
+    agenda.append((INFEQ if para_cima else SUPEQ, None))
+    agenda.append(limite)
+    agenda.append((ler, idx))
+    agenda.append((escrever, idx))                                # 0) Valores inicial e limite,
+    if guardar is not None:                                       #    ambos avaliados antes de
+        agenda.append(guardar)                                    #    alterar a variável
+        agenda.append(no.limite)
+    agenda.append(no.inicio)
+
+# ---------------- subprogramas ----------------
+#
+# Chamadas com frames, como na EWVM (CALL guarda pc e fp; o novo fp é o
+# topo da pilha):
+#   f(a1, …, an)  →  [PUSHI 0]  <a1> … <an>  PUSHA _f  CALL  [POP n]
+# O PUSHI 0 (só nas funções) reserva o resultado, que fica no topo depois
+# de retirados os argumentos. No frame, os argumentos estão em fp-n …
+# fp-1, o resultado em fp-n-1 e as variáveis locais, seguidas das posições
+# escondidas dos ciclos for, em fp+0, fp+1, …:
+#   _f:  [PUSHN k]  <corpo>  [POP k]  RETURN
+# Os corpos são gerados à parte e ficam depois do STOP do programa
+# principal. As variáveis globais continuam a usar PUSHG/STOREG; cada
+# chamada tem o seu frame, por isso a recursão funciona.
+#
+# Expansão em linha (inline, exceto com a opção 'sem_inline'): um
+# subprograma não recursivo (sem ciclos no grafo de chamadas), pequeno ou
+# chamado num só sítio, é expandido em cada chamada se isso executar menos
+# instruções do que a chamada. Os parâmetros, o resultado e as locais
+# passam a posições reservadas no âmbito de quem chama (Ambito; as
+# expansões de um subprograma no mesmo âmbito partilham-nas, porque nunca
+# estão ativas ao mesmo tempo), os argumentos são guardados nelas e as
+# locais e o resultado começam a 0, como no frame:
+#   <a1> … <an>  STORE pn … STORE p1  [PUSHI 0 STORE x]…  <corpo>  [LOAD resultado]
+# Um subprograma expandido não tem corpo próprio no código.
+
+# Máximo de nós do corpo de um subprograma expandido em mais de um sítio
+_MAX_NOS_EXPANSAO = 16
+
+def _rotulo(nome):
+    """Rótulo do corpo do subprograma 'nome' (nunca igual a Lx nem a START)."""
+    return f"_{nome}"
+
+def _variavel(ctx, nome):
+    """(tipo, opcode de leitura, opcode de escrita, posição) da variável simples 'nome'."""
+    ambito = ctx.ambito
+    local = ambito.locais.get(nome)
+    if local is None:
+        tipo, idx = ctx.tabela_variaveis[nome]
+        return tipo, PUSHG, STOREG, idx
+    return local[0], ambito.ler, ambito.escrever, local[1]
+
+class _Entrada:
+    """Marca, na agenda, a passagem para o âmbito 'ambito' (à volta de um corpo expandido)."""
+    __slots__ = ('ambito',)
+
+    def __init__(self, ambito):
+        self.ambito = ambito
+
+def _gerar_entrada(no, ctx, emitir, agenda):
+    ctx.ambito = no.ambito
+
+def _gerar_call(no, ctx, emitir, agenda):
+    # Call (função, numa expressão) e ProcCall (procedimento, statement)
+    sub = ctx.subprogramas[no.nome]
+    if sub.nome in ctx.expandir:
+        _agendar_expansao(no, sub, ctx, agenda)
+        return
+    if no.args:
+        agenda.append((POP, len(no.args)))                # 3) Retira os argumentos
+    agenda.append((CALL, None))                           # 2) Chama
+    agenda.append((PUSHA, _rotulo(sub.nome)))
+    for nome, arg in reversed(list(zip(sub.parametros, no.args))):  # 1) Argumentos, pela ordem
+        _agendar_valor(arg, sub.tabela[nome][0], agenda)
+    if sub.retorno is not None:
+        agenda.append((PUSHI, 0))                         # 0) Lugar do resultado
+
+def _agendar_expansao(no, sub, ctx, agenda):
+    """Agenda o corpo de 'sub' expandido em linha no lugar da chamada 'no'."""
+    base = ctx.ambito.base
+    ambito = base.expansoes.get(sub.nome)
+    if ambito is None:
+        locais = {nome: (tipo, ctx.reservar()) for nome, (tipo, _) in sub.tabela.items()}
+        ambito = base.expansoes[sub.nome] = Ambito(locais, base.ler, base.escrever, base)
+
+    if sub.retorno is not None:
+        agenda.append((ambito.ler, ambito.locais[sub.nome][1]))   # 4) Resultado
+    agenda.append(_Entrada(ctx.ambito))                           # 3) Corpo, com as posições
+    agenda.append(sub.corpo)                                      #    da expansão
+    agenda.append(_Entrada(ambito))
+    for nome, (_, pos) in ambito.locais.items():                  # 2) Locais e resultado a 0
+        if nome not in sub.parametros:
+            agenda.append((ambito.escrever, pos))
+            agenda.append((PUSHI, 0))
+    for nome in sub.parametros:                                   # 1) Argumentos guardados nos
+        agenda.append((ambito.escrever, ambito.locais[nome][1]))  #    parâmetros (o último está
+    for nome, arg in reversed(list(zip(sub.parametros, no.args))):  #  no topo), convertidos
+        _agendar_valor(arg, sub.tabela[nome][0], agenda)          #    se preciso
+
+def _expansoes(ast_program):
+    """Nomes dos subprogramas de 'ast_program' a expandir em linha."""
+    subprogramas = {sub.nome: sub for sub in ast_program.subprogramas}
+    chamados = {}                               # nome → nomes chamados no corpo
+    chamadas = dict.fromkeys(subprogramas, 0)   # nome → chamadas em todo o programa
+    tamanho = {}                                # nome → nós do corpo
+    for nome, raiz in [(None, ast_program.bloco)] + [(sub.nome, sub.corpo)
+                                                     for sub in ast_program.subprogramas]:
+        alvos, n = set(), 0
+        for no in nos(raiz):
+            n += 1
+            if type(no) is Call or type(no) is ProcCall:
+                alvos.add(no.nome)
+                chamadas[no.nome] += 1
+        if nome is not None:
+            chamados[nome], tamanho[nome] = alvos, n
+
+    expandir = set()
+    for nome, sub in subprogramas.items():
+        # Recursivo: chega a si próprio pelo grafo de chamadas
+        vistos, pendentes = set(), list(chamados[nome])
+        while pendentes:
+            x = pendentes.pop()
+            if x not in vistos:
+                vistos.add(x)
+                pendentes.extend(chamados[x])
+        if nome in vistos or not chamadas[nome]:
+            continue
+        # Instruções executadas por chamada além do corpo: PUSHA, CALL,
+        # RETURN, [PUSHI 0], [POP n], [PUSHN k, POP k]; ou, expandido, um
+        # STORE por argumento, PUSHI 0 + STORE por local e resultado, e o
+        # resultado empilhado
+        n, funcao = len(sub.parametros), int(sub.retorno is not None)
+        chamada = 3 + funcao + int(n > 0) + 2 * int(sub.locais > 0)
+        expansao = n + 2 * (sub.locais + funcao) + funcao
+        if expansao <= chamada and (tamanho[nome] <= _MAX_NOS_EXPANSAO or chamadas[nome] == 1):
+            expandir.add(nome)
+    return frozenset(expandir)
+
+_GERADORES = {
+    Id: _gerar_id, Num: _gerar_num, Str: _gerar_str, Bool: _gerar_bool, Real: _gerar_real,
+    BinOp: _gerar_binop, Assign: _gerar_assign, Block: _gerar_block, If: _gerar_if,
+    While: _gerar_while, Write: _gerar_write, Read: _gerar_read, For: _gerar_for,
+    Index: _gerar_index, AssignIndex: _gerar_assign_index, ReadIndex: _gerar_read_index,
+    Call: _gerar_call, ProcCall: _gerar_call,
+    _FimFor: _gerar_fim_for, _Condicao: _gerar_condicao, _Entrada: _gerar_entrada,
+}
+
+def _gerar(raiz, ctx):
+    """
+    Gera as instruções EWVM do nó 'raiz' (expressão ou statement) em
+    ctx.codigo_meio. Em cada caso, usamos exatamente os opcodes da
+    documentação. Os tipos das expressões já foram anotados pela análise
+    semântica (semantica.py).
+    """
+    emitir = ctx.codigo_meio.append
+    ctx.nivel_for = 0                   # 'raiz' nunca está dentro de um ciclo for
+    agenda = [raiz]
+    retirar = agenda.pop
+    while agenda:
+        no = retirar()
+        if type(no) is tuple:
+            # Instrução já pronta (opcode inteiro) ou rótulo (None)
+            emitir(no)
+            continue
+        gerador = _GERADORES.get(type(no))
+        if gerador is None:
+            raise ValueError(f"Tipo de nó inesperado na geração de código: {type(no).__name__}")
+        gerador(no, ctx, emitir, agenda)
 
-    # 2) Linha em branco para separar dados do código:
-    codigo_meio.append("")
+def generate_expr_code(expr, ctx):
+    """Gera instruções EWVM para avaliar 'expr' e deixar o valor no topo da pilha."""
+    _gerar(expr, ctx)
 
-    # 3) Começo do código:
-    codigo_meio.append("START:")
-    generate_stmt_code(bloco)
+def generate_stmt_code(stmt, ctx):
+    """Gera instruções EWVM para o nó de statement 'stmt', sem espaços à esquerda."""
+    _gerar(stmt, ctx)
 
-    # 4) Fim com STOP:
-    codigo_meio.append("STOP")
+def generate_subprogram_code(ast_program, ctx):
+    """
+    Prepara a geração das chamadas aos subprogramas de ast_program
+    (ctx.subprogramas e ctx.expandir) e devolve o código dos corpos dos que
+    não são expandidos em linha, para pôr depois do STOP. As posições
+    globais usadas nesses corpos ficam em ctx.globais_partilhadas (a
+    alocação de posições não as pode mover para o frame principal).
+    """
+    ctx.subprogramas = {sub.nome: sub for sub in ast_program.subprogramas}
+    if ast_program.subprogramas and not ctx.opcoes.get('sem_inline'):
+        ctx.expandir = _expansoes(ast_program)
+    if ctx.expandir:
+        ctx.estatisticas['inline'] = len(ctx.expandir)
+
+    principal, codigo_meio = ctx.ambito, ctx.codigo_meio
+    codigo = []
+    for sub in ast_program.subprogramas:
+        if sub.nome in ctx.expandir:
+            continue
+        ambito = Ambito(sub.tabela, PUSHL, STOREL, tamanho=sub.locais)
+        ctx.ambito, ctx.codigo_meio = ambito, []
+        _gerar(sub.corpo, ctx)
+        codigo.append((None, _rotulo(sub.nome)))
+        if ambito.tamanho:
+            codigo.append((PUSHN, ambito.tamanho))
+        codigo.extend(ctx.codigo_meio)
+        if ambito.tamanho:
+            codigo.append((POP, ambito.tamanho))
+        codigo.append((RETURN, None))
+    ctx.ambito, ctx.codigo_meio = principal, codigo_meio
+    ctx.globais_partilhadas = frozenset(arg for op, arg in codigo if op == PUSHG or op == STOREG)
+    return codigo
+
+def generate_code(ast_program, ctx):
+    """
+    Recebe ast_program (arvore.Program) e gera em ctx.codigo_meio o código
+    a seguir a START: (o bloco de statements, STOP e os corpos dos
+    subprogramas). As declarações das variáveis ("nome: 0:", na ordem dos
+    índices de ctx.tabela_variaveis) são acrescentadas por montar().
+    Os nós que ainda não têm tipo (ex.: criados pela dobragem de
+    constantes) são anotados antes de gerar.
+    """
+    anotar_tipos(ast_program, ctx.tabela_variaveis)
+    subprogramas = generate_subprogram_code(ast_program, ctx)
+    generate_stmt_code(ast_program.bloco, ctx)
+    ctx.codigo_meio.append((STOP, None))
+    ctx.codigo_meio.extend(subprogramas)
 
 
 # ---------------------------------------------------
@@ -349,41 +686,118 @@ def generate_code(ast_program):
 
 def p_programa(p):
     'programa : PROGRAM ID SEMICOLON bloco DOT'
-    p[0] = ('program', p[2], p[4])
+    bloco, subprogramas = p[4]
+    p[0] = Program(p[2], bloco, subprogramas)
 
 def p_bloco_com_var(p):
-    'bloco : VAR declaracoes BEGIN instrucoes END'
-    p[0] = ('block', p[4])
+    'bloco : VAR declaracoes subprogramas BEGIN instrucoes END'
+    p[0] = (Block(p[5]), p[3])
 
 def p_bloco_sem_var(p):
-    'bloco : BEGIN instrucoes END'
-    p[0] = ('block', p[2])
+    'bloco : subprogramas BEGIN instrucoes END'
+    p[0] = (Block(p[3]), p[1])
 
 def p_declaracoes(p):
     '''declaracoes : declaracoes declaracao
                    | declaracao
                    | empty'''
-    if len(p) == 2:
-        if p[1] is None:
-            p[0] = []
-        else:
-            p[0] = [p[1]]
-    else:
-        p[0] = p[1] + [p[2]]
+    # As variáveis ficam nas tabelas (ver p_declaracao): não há nós na AST.
 
 def p_declaracao(p):
     'declaracao : lista_ids COLON tipo SEMICOLON'
     """
-    Aqui, cada nome em p[1] recebe:
-       tabela_variaveis[nome] = (tipo, índice_global_atual)
-    e incrementamos next_global_index para a próxima.
+    Aqui, cada nome em p[1] recebe, no contexto da compilação em curso
+    (associado ao lexer por compilar_programa):
+       ctx.tabela_variaveis[nome] = (tipo, índice_global_atual)
+    e o contexto avança next_global_index para a próxima.
     """
-    global next_global_index
+    ctx = p.lexer.contexto
     tipo = p[3]
-    for nome in p[1]:
-        tabela_variaveis[nome] = (tipo, next_global_index)
-        next_global_index += 1
-    p[0] = ('decl', p[1], tipo)
+    if ctx.declarando is not None:
+        # Variáveis locais do subprograma em declaração (ver p_cabecalho_*)
+        for nome in p[1]:
+            _declarar_local(ctx.declarando, nome, tipo, p.lineno(2))
+    else:
+        tamanho = len(tipo) if type(tipo) is TipoArray else 1
+        for nome in p[1]:
+            ctx.tabela_variaveis[nome] = (tipo, ctx.alocar_global(tamanho))
+
+# ---------------- SUBPROGRAMAS ----------------
+#
+# O cabeçalho é reduzido antes das declarações do corpo: cria o
+# Subprograma, com os parâmetros (e o resultado) na tabela local, e marca-o
+# em ctx.declarando, para p_declaracao pôr lá as variáveis locais.
+# Só há passagem por valor; arrays locais ou como parâmetros não são
+# suportados (os arrays globais podem ser usados nos corpos).
+
+def _declarar_local(sub, nome, tipo, linha, posicao=None):
+    """
+    Acrescenta 'nome' à tabela local de 'sub': na 'posicao' dada (parâmetro
+    ou resultado) ou como a próxima variável local (fp+0, fp+1, …).
+    """
+    if type(tipo) is TipoArray:
+        raise ErroSemantico(f"Arrays locais ou como parâmetros não são suportados: '{nome}' "
+                            f"em '{sub.nome}' (linha {linha})")
+    if nome in sub.tabela:
+        raise ErroSemantico(f"'{nome}' declarado duas vezes em '{sub.nome}' (linha {linha})")
+    if posicao is None:
+        posicao = sub.locais
+        sub.locais += 1
+    sub.tabela[nome] = (tipo, posicao)
+
+def _declarar_subprograma(p, parametros, retorno):
+    """Cria e regista o Subprograma do cabeçalho em 'p' (nome em p[2])."""
+    ctx = p.lexer.contexto
+    nome, linha = p[2], p.lineno(1)
+    if nome in ctx.tabela_variaveis:
+        raise ErroSemantico(f"'{nome}' já foi declarado (linha {linha})")
+    sub = Subprograma(nome, [par for par, _ in parametros], retorno, {})
+    n = len(parametros)
+    for k, (par, tipo) in enumerate(parametros):
+        _declarar_local(sub, par, tipo, linha, k - n)       # argumentos em fp-n … fp-1
+    if retorno is not None:
+        _declarar_local(sub, nome, retorno, linha, -n - 1)  # resultado por baixo deles
+    ctx.tabela_variaveis[nome] = (sub, None)
+    ctx.declarando = sub
+    return sub
+
+def p_subprogramas(p):
+    '''subprogramas : subprogramas subprograma
+                    | empty'''
+    p[0] = [] if len(p) == 2 else p[1] + [p[2]]
+
+def p_subprograma(p):
+    'subprograma : cabecalho corpo SEMICOLON'
+    p[1].corpo = p[2]
+    p.lexer.contexto.declarando = None
+    p[0] = p[1]
+
+def p_cabecalho_procedimento(p):
+    'cabecalho : PROCEDURE ID parametros SEMICOLON'
+    p[0] = _declarar_subprograma(p, p[3], None)
+
+def p_cabecalho_funcao(p):
+    'cabecalho : FUNCTION ID parametros COLON tipo SEMICOLON'
+    p[0] = _declarar_subprograma(p, p[3], p[5])
+
+def p_parametros(p):
+    '''parametros : LPAREN grupos_parametros RPAREN
+                  | empty'''
+    p[0] = [] if len(p) == 2 else p[2]
+
+def p_grupos_parametros(p):
+    '''grupos_parametros : grupo_parametros
+                         | grupos_parametros SEMICOLON grupo_parametros'''
+    p[0] = p[1] if len(p) == 2 else p[1] + p[3]
+
+def p_grupo_parametros(p):
+    'grupo_parametros : lista_ids COLON tipo'
+    p[0] = [(nome, p[3]) for nome in p[1]]
+
+def p_corpo(p):
+    '''corpo : VAR declaracoes BEGIN instrucoes END
+             | BEGIN instrucoes END'''
+    p[0] = Block(p[len(p) - 2])
 
 def p_lista_ids(p):
     '''lista_ids : ID
@@ -402,7 +816,11 @@ def p_tipo_primitivo(p):
 
 def p_tipo_array(p):
     'tipo : ARRAY LBRACKET NUMBER DOTDOT NUMBER RBRACKET OF tipo'
-    p[0] = 'array'
+    if type(p[8]) is TipoArray:
+        raise ErroSemantico(f"Arrays de arrays não são suportados (linha {p.lineno(1)})")
+    if p[5] < p[3]:
+        raise ErroSemantico(f"Limites do array invertidos: [{p[3]}..{p[5]}] (linha {p.lineno(1)})")
+    p[0] = TipoArray(p[3], p[5], p[8])
 
 def p_instrucoes(p):
     'instrucoes : statement_list'
@@ -428,24 +846,38 @@ def p_statement(p):
                  | if_then
                  | while_stmt
                  | for_stmt
+                 | chamada_stmt
                  | bloco_instr'''
     p[0] = p[1]
 
 def p_atribuicao_instr_only(p):
     'atribuicao_instr_only : ID ASSIGN expressao'
-    p[0] = ('assign', p[1], p[3])
+    p[0] = Assign(p[1], p[3])
+
+def p_atribuicao_indexada(p):
+    'atribuicao_instr_only : ID LBRACKET expressao RBRACKET ASSIGN expressao'
+    p[0] = AssignIndex(p[1], p[3], p[6])
+
+def p_chamada_stmt(p):
+    '''chamada_stmt : ID
+                    | ID LPAREN exp_list RPAREN'''
+    p[0] = ProcCall(sys.intern(p[1]), p[3] if len(p) == 5 else [])
 
 def p_leitura_stmt(p):
     'leitura_stmt : READLN LPAREN ID RPAREN'
-    p[0] = ('read', p[3])
+    p[0] = Read(p[3])
+
+def p_leitura_indexada(p):
+    'leitura_stmt : READLN LPAREN ID LBRACKET expressao RBRACKET RPAREN'
+    p[0] = ReadIndex(p[3], p[5])
 
 def p_escrita_stmt_writeln(p):
     'escrita_stmt : WRITELN LPAREN exp_list RPAREN'
-    p[0] = ('write', p[3], True)
+    p[0] = Write(p[3], True)
 
 def p_escrita_stmt_write(p):
     'escrita_stmt : WRITE LPAREN exp_list RPAREN'
-    p[0] = ('write', p[3], False)
+    p[0] = Write(p[3], False)
 
 def p_exp_list(p):
     '''exp_list : expressao
@@ -460,25 +892,25 @@ def p_if_then_else(p):
     cond      = p[2]
     then_stmt = p[4]
     else_stmt = p[6]
-    p[0] = ('if', cond, then_stmt, else_stmt)
+    p[0] = If(cond, then_stmt, else_stmt)
 
 def p_if_then(p):
     'if_then : IF expressao THEN statement'
     cond      = p[2]
     then_stmt = p[4]
-    p[0] = ('if', cond, then_stmt, None)
+    p[0] = If(cond, then_stmt)
 
 def p_while_stmt(p):
     'while_stmt : WHILE expressao DO statement'
     cond  = p[2]
     corpo = p[4]
-    p[0] = ('while', cond, corpo)
+    p[0] = While(cond, corpo)
 
 def p_for_stmt(p):
     '''for_stmt : FOR ID ASSIGN expressao TO expressao DO statement
                 | FOR ID ASSIGN expressao DOWNTO expressao DO statement'''
     """
-    Construímos um nó AST do tipo ('for', var, expr_inicial, expr_limite, corpo, direction)
+    Construímos um nó For(var, expr_inicial, expr_limite, corpo, direction)
       direction = 'to' ou 'downto'
     """
     var_nome      = p[2]
@@ -486,11 +918,11 @@ def p_for_stmt(p):
     expr_limite   = p[6]
     corpo_stmt    = p[8]
     direction_key = p[5].lower()  # 'to' ou 'downto'
-    p[0] = ('for', var_nome, expr_inicio, expr_limite, corpo_stmt, direction_key)
+    p[0] = For(var_nome, expr_inicio, expr_limite, corpo_stmt, direction_key)
 
 def p_bloco_instr(p):
     'bloco_instr : BEGIN instrucoes END'
-    p[0] = ('block', p[2])
+    p[0] = Block(p[2])
 
 # ---------------- EXPRESSÕES ----------------
 
@@ -510,9 +942,9 @@ def p_expressao_binaria(p):
                  | expressao AND expressao
                  | expressao OR expressao'''
     left  = p[1]
-    op    = p[2]
+    op    = sys.intern(p[2].lower())      # 'AND', 'Div', … → 'and', 'div'
     right = p[3]
-    p[0] = ('binop', op, left, right)
+    p[0] = BinOp(op, left, right)
 
 def p_expressao_grupo(p):
     'expressao : LPAREN expressao RPAREN'
@@ -520,23 +952,46 @@ def p_expressao_grupo(p):
 
 def p_expressao_id(p):
     'expressao : ID'
-    p[0] = ('id', p[1])
+    # Nomes internados: cada variável tem uma só string em toda a AST
+    nome = sys.intern(p[1])
+    entrada = p.lexer.contexto.tabela_variaveis.get(nome)
+    if entrada is not None and entrada[1] is None and _chamada_sem_argumentos(p.lexer.contexto, entrada[0]):
+        p[0] = Call(nome, [])
+    else:
+        p[0] = Id(nome)
+
+def _chamada_sem_argumentos(ctx, sub):
+    """
+    Um nome de função sem parâmetros numa expressão é uma chamada, exceto
+    no corpo dela própria, onde é o resultado (ou se uma local o esconde).
+    """
+    atual = ctx.declarando
+    return (sub.retorno is not None and not sub.parametros
+            and (atual is None or sub.nome not in atual.tabela))
+
+def p_expressao_chamada(p):
+    'expressao : ID LPAREN exp_list RPAREN'
+    p[0] = Call(sys.intern(p[1]), p[3])
+
+def p_expressao_index(p):
+    'expressao : ID LBRACKET expressao RBRACKET'
+    p[0] = Index(sys.intern(p[1]), p[3])
 
 def p_expressao_num(p):
     'expressao : NUMBER'
-    p[0] = ('num', p[1])
+    p[0] = Num(p[1])
 
 def p_expressao_str(p):
     'expressao : STRING_LITERAL'
-    p[0] = ('str', p[1])
+    p[0] = Str(p[1])
 
 def p_expressao_true(p):
     'expressao : TRUE'
-    p[0] = ('bool', True)
+    p[0] = Bool(True)
 
 def p_expressao_false(p):
     'expressao : FALSE'
-    p[0] = ('bool', False)
+    p[0] = Bool(False)
 
 def p_empty(p):
     'empty :'
@@ -548,55 +1003,371 @@ def p_error(p):
     else:
         raise SyntaxError("Fim de arquivo inesperado")
 
-parser = yacc.yacc(debug=True)
+# As tabelas LALR (parsetab.py) só são carregadas, ou geradas, na primeira
+# compilação.
+_parser = None
+
+def obter_parser():
+    """Devolve o parser LALR partilhado, construindo-o no primeiro uso."""
+    global _parser
+    if _parser is None:
+        import ply.yacc as yacc
+
+        _parser = yacc.yacc(debug=True)
+    return _parser
 
 # ---------------------------------------------------
-# Driver principal: separa cada “program … end.” em input.txt e gera .ewvm
+# Compilação de um programa isolado
 # ---------------------------------------------------
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Uso: python parser.py <input.txt>")
-        sys.exit(1)
-
-    arquivo_entrada = sys.argv[1]
-    with open(arquivo_entrada, 'r', encoding='utf-8') as f:
-        data = f.read()
-
-    # Regex para isolar cada trecho “program Nome; … end.” (case-insensitive)
-    padrao = re.compile(
-        r'(?i)program\s+([A-Za-z_][A-Za-z0-9_]*)\s*;.*?end\.',
-        re.IGNORECASE | re.DOTALL
-    )
-    matches = list(padrao.finditer(data))
-    if not matches:
-        print("Nenhum programa Pascal encontrado em input.txt")
-        sys.exit(1)
-
-    for m in matches:
-        trecho    = m.group(0)
-        nome_prog = m.group(1)
-
-        # Limpa tudo antes de compilar cada programa
-        codigo_meio.clear()
-        tabela_variaveis.clear()
-        contador_etiquetas = 0
-        next_global_index = 0
-
-        lexer = build_lexer()
-        try:
-            ast_prog = parser.parse(trecho, lexer=lexer)
-        except SyntaxError as e:
-            print(f"[ERRO DE SINTAXE em '{nome_prog}'] {e}")
-            continue
+VERSAO_COMPILADOR = "1.0"
+
+# Módulos cujo código determina o .ewvm gerado (entram no carimbo de versão)
+_FONTES_COMPILADOR = ('lexer.py', 'lexer_rapido.py', 'parser.py', 'otimizador.py', 'instrucoes.py',
+                      'semantica.py', 'arvore.py', 'alocacao.py')
+
+def carimbo_versao(opcoes=None):
+    """
+    Carimbo de versão do compilador: VERSAO_COMPILADOR mais um hash das
+    fontes e das opções de compilação, para que qualquer alteração ao
+    compilador (ou compilar com outras opções) invalide a cache.
+    """
+    h = hashlib.sha256(VERSAO_COMPILADOR.encode('utf-8'))
+    h.update(repr(sorted((opcoes or {}).items())).encode('utf-8'))
+    base = os.path.dirname(os.path.abspath(__file__))
+    for nome in _FONTES_COMPILADOR:
+        with open(os.path.join(base, nome), 'rb') as f:
+            h.update(f.read())
+    return f"{VERSAO_COMPILADOR}-{h.hexdigest()[:16]}"
+
+def compilar_programa(trecho, linha_inicial=1, ctx=None):
+    """
+    Compila um trecho "program … end." e devolve o Programa EWVM montado
+    (instrucoes.py; para_texto() dá as linhas do .ewvm).
+    Todo o estado fica num CompilationContext novo (ou no 'ctx' recebido),
+    por isso a função pode ser chamada em simultâneo a partir de várias
+    threads. 'linha_inicial' é a linha do ficheiro onde o trecho começa,
+    para que os erros indiquem a linha real.
+    Erros de sintaxe propagam-se como SyntaxError e erros de tipos ou
+    variáveis não declaradas como ErroSemantico.
+    Com ctx.perfil, cada fase é medida (perfil.py).
+    """
+    if ctx is None:
+        ctx = CompilationContext()
+    perfil = ctx.perfil or SEM_PERFIL
+
+    with perfil.pico_memoria():
+        # Lexer e parser próprios desta compilação (partilham apenas as tabelas)
+        with perfil.fase('lexer'):
+            lexer = build_lexer(ctx.opcoes.get('lexer', 'ply'))
+            lexer.lineno = linha_inicial
+            lexer.contexto = ctx
+        with perfil.fase('parser'):
+            ast_prog = copy.copy(obter_parser()).parse(trecho, lexer=lexer,
+                                                       tokenfunc=perfil.contar_tokens(lexer))
+        perfil.contar_nos(ast_prog)
+
+        # Análise semântica: tipo de cada expressão, calculado uma vez
+        with perfil.fase('semantica'):
+            anotar_tipos(ast_prog, ctx.tabela_variaveis)
+
+        # Dobragem de constantes e simplificações algébricas (opcional)
+        if ctx.opcoes.get('dobragem'):
+            with perfil.fase('dobragem'):
+                ast_prog, ctx.estatisticas['dobragem'] = dobrar_constantes(ast_prog)
 
         # Gera as instruções EWVM (Data + Code)
-        generate_code(ast_prog)
+        with perfil.fase('codegen'):
+            if ctx.opcoes.get('slots'):
+                ctx.agrupar_arrays()
+            generate_code(ast_prog, ctx)
+
+        # Blocos inalcançáveis e escritas mortas (opcional)
+        if ctx.opcoes.get('codigo_morto'):
+            with perfil.fase('codigo_morto'):
+                ctx.codigo_meio, instrucoes, poupados = eliminar_codigo_morto(
+                    ctx.codigo_meio, ctx.globais_partilhadas)
+            ctx.estatisticas['codigo_morto'] = instrucoes
+            ctx.estatisticas['codigo_morto_bytes'] = poupados
+
+        # Otimização peephole (opcional)
+        if ctx.opcoes.get('peephole'):
+            with perfil.fase('peephole'):
+                ctx.codigo_meio, ctx.estatisticas['peephole'] = otimizar_peephole(ctx.codigo_meio)
+
+        # Posições partilhadas e locais em vez de globais (opcional)
+        variaveis = ctx.variaveis_globais()
+        if ctx.opcoes.get('slots'):
+            with perfil.fase('slots'):
+                ctx.codigo_meio, ctx.estatisticas['slots'] = alocar_slots(
+                    ctx.codigo_meio, ctx.next_global_index, ctx.globais_partilhadas, ctx.posicoes_arrays)
+            variaveis = ctx.variaveis_globais(slots=True)
+        with perfil.fase('montagem'):
+            programa = montar(variaveis, ctx.codigo_meio)
+    if ctx.perfil:
+        ctx.perfil.instrucoes = len(programa)
+    return programa
+
+def descrever_erro(nome_prog, erro):
+    """Mensagem, como o driver a mostra, de um erro ao compilar 'nome_prog'."""
+    if isinstance(erro, SyntaxError):
+        return f"[ERRO DE SINTAXE em '{nome_prog}'] {erro}"
+    if isinstance(erro, ErroSemantico):
+        return f"[ERRO SEMÂNTICO em '{nome_prog}'] {erro}"
+    return f"[ERRO em '{nome_prog}'] {erro}"
+
+def escrever_ewvm(programa, nome_prog, diretoria, binario=False):
+    """
+    Escreve o Programa em <diretoria>/<nome_prog>.ewvm (ou .ewvmb, no
+    formato binário) e devolve o caminho.
+    """
+    nome_saida = os.path.join(diretoria, f"{nome_prog}.ewvmb" if binario else f"{nome_prog}.ewvm")
+    escrever(programa, nome_saida, binario)
+    return nome_saida
+
+def _compilar_lote(tarefas, opcoes=None):
+    """
+    Compila uma lista de tarefas (nome, trecho, linha_inicial) com as
+    'opcoes' dadas e devolve, pela mesma ordem, tuplos (nome, programa, erro,
+    estatisticas, perfil); perfil é None sem a opção 'perfil'.
+    Corre nos processos do pool: um programa inválido não interrompe os restantes.
+    """
+    resultados = []
+    for nome_prog, trecho, linha in tarefas:
+        ctx = CompilationContext(opcoes)
+        try:
+            resultados.append((nome_prog, compilar_programa(trecho, linha, ctx), None,
+                               ctx.estatisticas, ctx.perfil))
+        except (SyntaxError, ErroSemantico, ValueError) as e:
+            resultados.append((nome_prog, None, descrever_erro(nome_prog, e), {}, ctx.perfil))
+    return resultados
+
+def _agrupar(iteravel, tamanho):
+    """Agrupa os elementos de 'iteravel' em listas de até 'tamanho' elementos."""
+    lote = []
+    for elem in iteravel:
+        lote.append(elem)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+def _consultar_cache(lote, cache):
+    """
+    Procura na cache cada tarefa do lote. Devolve a lista de resultados (com
+    None nas posições em falta) e os pares (posição, chave) por compilar.
+    """
+    resultados = [None] * len(lote)
+    em_falta = []
+    for pos, (nome_prog, trecho, _) in enumerate(lote):
+        chave = cache.chave(trecho) if cache else None
+        linhas = cache.obter(chave) if cache else None
+        if linhas is not None:
+            try:
+                resultados[pos] = (nome_prog, Programa.de_texto(linhas), None, {}, None)
+                continue
+            except ValueError:
+                # Entrada ilegível (ex.: truncada): compila-se de novo
+                cache.descartar(chave)
+        em_falta.append((pos, chave))
+    return resultados, em_falta
+
+def _concluir_lote(resultados, em_falta, compilados, cache):
+    """Junta os programas compilados aos acertos e guarda-os na cache."""
+    for (pos, chave), res in zip(em_falta, compilados):
+        resultados[pos] = res
+        if cache and res[2] is None:
+            cache.guardar(chave, res[1].para_texto())
+    return resultados
+
+def compilar_em_lote(tarefas, trabalhadores=1, tamanho_lote=16, cache=None, opcoes=None):
+    """
+    Compila as tarefas (nome, trecho, linha_inicial) e gera os resultados
+    (nome, programa, erro, estatisticas, perfil) pela ordem original; os
+    programas lidos da cache não têm estatísticas nem perfil.
+
+    Com trabalhadores > 1 os lotes são distribuídos por um pool de processos.
+    Só são submetidos alguns lotes à frente do que já foi consumido, para a
+    memória não crescer com o tamanho do ficheiro de entrada.
+    Com uma CacheCompilacao, os programas já compilados são lidos da cache
+    (no processo principal) e só os restantes são enviados para compilar.
+    """
+    lotes = _agrupar(tarefas, tamanho_lote)
+    if trabalhadores <= 1:
+        for lote in lotes:
+            resultados, em_falta = _consultar_cache(lote, cache)
+            compilados = _compilar_lote([lote[pos] for pos, _ in em_falta], opcoes)
+            yield from _concluir_lote(resultados, em_falta, compilados, cache)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=trabalhadores) as pool:
+        pendentes = deque()
+        for lote in lotes:
+            resultados, em_falta = _consultar_cache(lote, cache)
+            futuro = pool.submit(_compilar_lote, [lote[pos] for pos, _ in em_falta], opcoes) if em_falta else None
+            pendentes.append((resultados, em_falta, futuro))
+            if len(pendentes) >= 2 * trabalhadores:
+                resultados, em_falta, futuro = pendentes.popleft()
+                yield from _concluir_lote(resultados, em_falta, futuro.result() if futuro else [], cache)
+        while pendentes:
+            resultados, em_falta, futuro = pendentes.popleft()
+            yield from _concluir_lote(resultados, em_falta, futuro.result() if futuro else [], cache)
+
+# ---------------------------------------------------
+# Driver principal: separa cada “program … end.” em input.txt e gera .ewvm
+# ---------------------------------------------------
 
-        # Escreve no arquivo <nome_prog>.ewvm
-        nome_saida = f"{nome_prog}.ewvm"
-        with open(nome_saida, 'w', encoding='utf-8') as fout:
-            for linha in codigo_meio:
-                fout.write(linha + "\n")
+def _ler_argumentos(argv):
+    import argparse
+
+    ap = argparse.ArgumentParser(
+        description="Compila os programas Pascal de um ficheiro para EWVM.")
+    ap.add_argument("entrada", help="ficheiro com um ou mais programas Pascal")
+    ap.add_argument("-j", "--jobs", type=int, default=1,
+                    help="número de processos de compilação (0 = todos os núcleos)")
+    ap.add_argument("--lote", type=int, default=16,
+                    help="programas enviados a cada processo de uma vez")
+    ap.add_argument("-o", "--saida", default=".",
+                    help="diretoria onde escrever os ficheiros .ewvm")
+    ap.add_argument("--binario", action="store_true",
+                    help="escreve cada programa no formato binário (.ewvmb) em vez do .ewvm em texto")
+    ap.add_argument("--resumo",
+                    help="escreve um resumo (sucesso/erro por programa) neste ficheiro")
+    ap.add_argument("--lexer", choices=("ply", "rapido"), default="ply",
+                    help="analisador léxico: PLY ou o lexer rápido (lexer_rapido.py)")
+    ap.add_argument("--dobragem", action="store_true",
+                    help="calcula as expressões constantes e simplifica a AST antes de gerar código")
+    ap.add_argument("--peephole", action="store_true",
+                    help="otimiza o código gerado (saltos e rótulos inúteis, padrões redundantes)")
+    ap.add_argument("--codigo-morto", action="store_true",
+                    help="elimina os blocos inalcançáveis (grafo de fluxo de controlo) e as escritas "
+                         "em variáveis que não voltam a ser lidas")
+    ap.add_argument("--slots", action="store_true",
+                    help="partilha as posições de variáveis com tempos de vida disjuntos (liveness) "
+                         "e acede-lhes como locais (PUSHL/STOREL)")
+    ap.add_argument("--sem-limites", action="store_true",
+                    help="não verifica em execução (CHECK) se os índices dos arrays estão dentro dos limites")
+    ap.add_argument("--sem-inline", action="store_true",
+                    help="não expande em linha os subprogramas pequenos e não recursivos (usa sempre CALL)")
+    ap.add_argument("--curto-circuito", action="store_true",
+                    help="nas condições de if/while, and/or não avaliam o segundo operando "
+                         "quando o primeiro já decide o resultado")
+    ap.add_argument("--cache", metavar="DIR",
+                    help="reutiliza o .ewvm de programas já compilados (cache em disco)")
+    ap.add_argument("--cache-max", type=int, default=64, metavar="MiB",
+                    help="tamanho máximo da cache; as entradas mais antigas são removidas")
+    ap.add_argument("--watch", action="store_true",
+                    help="depois de compilar, vigia a entrada e recompila só os programas alterados")
+    ap.add_argument("--intervalo", type=float, default=0.5, metavar="SEG",
+                    help="com --watch: intervalo entre verificações da entrada")
+    ap.add_argument("--debounce", type=float, default=0.2, metavar="SEG",
+                    help="com --watch: tempo sem alterações antes de recompilar")
+    ap.add_argument("--profile", nargs="?", const="tabela", choices=("tabela", "json"),
+                    help="mede cada fase, tokens, nós, instruções e pico de memória por programa "
+                         "(tabela no fim ou uma linha JSON por programa)")
+    ap.add_argument("--profile-saida", metavar="FICHEIRO",
+                    help="escreve o perfil neste ficheiro em vez da saída normal")
+    return ap.parse_args(argv)
+
+def _registar_perfil(registos, formato, saida, nome_prog, perfil, erro=None):
+    """Guarda as medições de um programa (tabela) ou escreve-as já (JSON)."""
+    r = perfil_registo(nome_prog, perfil, erro)
+    if formato == 'json':
+        print(perfil_json(r), file=saida)
+    else:
+        registos.append(r)
+
+def main(argv=None):
+    args = _ler_argumentos(argv)
+    trabalhadores = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    opcoes = {'lexer': args.lexer, 'dobragem': args.dobragem, 'peephole': args.peephole,
+              'codigo_morto': args.codigo_morto, 'slots': args.slots,
+              'curto_circuito': args.curto_circuito, 'sem_limites': args.sem_limites, 'sem_inline': args.sem_inline}
+
+    os.makedirs(args.saida, exist_ok=True)
+    resumo = open(args.resumo, 'w', encoding='utf-8') if args.resumo else None
+    cache = None
+    if args.cache:
+        cache = CacheCompilacao(args.cache, carimbo_versao(opcoes), args.cache_max * 1024 * 1024)
+    # O perfil não muda o código gerado, por isso fica fora do carimbo da cache
+    registos = [] if args.profile else None
+    if args.profile:
+        opcoes['perfil'] = True
+        saida_perfil = open(args.profile_saida, 'w', encoding='utf-8') if args.profile_saida else sys.stdout
+    sucessos = erros = 0
+    totais = {}    # soma das estatisticas das otimizações
+    vigia = None
+    if args.watch:
+        from vigia import Vigia
+        vigia = Vigia(args.entrada, args.saida, opcoes, args.intervalo, args.debounce, args.binario)
+
+    # Os programas são lidos, compilados e escritos um a um (em streaming)
+    with open(args.entrada, 'r', encoding='utf-8') as fonte:
+        tarefas = dividir_programas(fonte)
+        if vigia:
+            tarefas = vigia.registar(tarefas)
+        for nome_prog, programa, erro, estatisticas, perfil in compilar_em_lote(
+                tarefas, trabalhadores, args.lote, cache, opcoes):
+            if registos is not None and erro is not None:
+                _registar_perfil(registos, args.profile, saida_perfil, nome_prog, perfil, erro)
+            if erro is not None:
+                print(erro)
+                if resumo:
+                    resumo.write(f"ERRO\t{nome_prog}\t{erro}\n")
+                erros += 1
+                continue
+
+            # Escreve no arquivo <nome_prog>.ewvm
+            with (perfil or SEM_PERFIL).fase('escrita'):
+                nome_saida = escrever_ewvm(programa, nome_prog, args.saida, args.binario)
+            if registos is not None:
+                _registar_perfil(registos, args.profile, saida_perfil, nome_prog, perfil)
+            if 'codigo_morto' in estatisticas:
+                print(f"Gerado → {nome_saida} (código morto: {estatisticas['codigo_morto']} "
+                      f"instrução(ões), {estatisticas['codigo_morto_bytes']} bytes)")
+            else:
+                print(f"Gerado → {nome_saida}")
+            if resumo:
+                detalhe = "".join(f"\t{chave}={valor}" for chave, valor in estatisticas.items())
+                resumo.write(f"OK\t{nome_prog}\t{nome_saida}\t{len(programa)} instruções{detalhe}\n")
+            for chave, valor in estatisticas.items():
+                totais[chave] = totais.get(chave, 0) + valor
+            sucessos += 1
+
+    if resumo:
+        resumo.write(f"TOTAL\t{sucessos} compilados\t{erros} com erros\n")
+        resumo.close()
+
+    if sucessos + erros == 0:
+        print(f"Nenhum programa Pascal encontrado em {args.entrada}")
+        if not vigia:
+            return 1
+
+    print(f"{sucessos} programa(s) compilado(s), {erros} com erros.")
+    if args.dobragem:
+        print(f"Dobragem de constantes: {totais.get('dobragem', 0)} simplificação(ões).")
+    if args.peephole:
+        print(f"Peephole: {totais.get('peephole', 0)} instrução(ões) eliminada(s).")
+    if args.codigo_morto:
+        print(f"Código morto: {totais.get('codigo_morto', 0)} instrução(ões) eliminada(s), "
+              f"{totais.get('codigo_morto_bytes', 0)} bytes poupados.")
+    if args.slots:
+        print(f"Slots: {totais.get('slots', 0)} posição(ões) de variáveis poupada(s).")
+    if totais.get('inline'):
+        print(f"Inline: {totais['inline']} subprograma(s) expandido(s) em linha.")
+    if cache:
+        print(cache.resumo())
+    if registos is not None:
+        if args.profile == 'tabela':
+            print("\n" + "\n".join(perfil_tabela(registos)), file=saida_perfil)
+        if saida_perfil is not sys.stdout:
+            saida_perfil.close()
+    if vigia:
+        return vigia.executar()
+    return 0 if erros == 0 else 2
 
-        print(f"Gerado → {nome_saida}")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'leftORleftANDleftEQUALNELTLEGTGEleftPLUSMINUSleftTIMESDIVIDEDIVMODAND ARRAY ASSIGN BEGIN BOOLEAN COLON COMMA DIV DIVIDE DO DOT DOTDOT DOWNTO ELSE END EQUAL FALSE FOR FUNCTION GE GT ID IF INTEGER LBRACKET LE LPAREN LT MINUS MOD NE NUMBER OF OR PLUS PROCEDURE PROGRAM RBRACKET READLN REAL RPAREN SEMICOLON STRING STRING_LITERAL THEN TIMES TO TRUE VAR WHILE WRITE WRITELNprograma : PROGRAM ID SEMICOLON bloco DOTbloco : VAR declaracoes BEGIN instrucoes ENDbloco : BEGIN instrucoes ENDdeclaracoes : declaracoes declaracao\n                   | declaracao\n                   | emptydeclaracao : lista_ids COLON tipo SEMICOLONlista_ids : ID\n                 | lista_ids COMMA IDtipo : INTEGER\n            | BOOLEAN\n            | STRING\n            | REALtipo : ARRAY LBRACKET NUMBER DOTDOT NUMBER RBRACKET OF tipoinstrucoes : statement_liststatement_list : statement_list SEMICOLON statementstatement_list : statement_list SEMICOLONstatement_list : statementstatement : atribuicao_instr_only\n                 | leitura_stmt\n                 | escrita_stmt\n                 | if_then_else\n                 | if_then\n                 | while_stmt\n                 | bloco_instratribuicao_instr_only : ID ASSIGN expressaoleitura_stmt : READLN LPAREN ID RPARENescrita_stmt : WRITELN LPAREN exp_list RPARENescrita_stmt : WRITE LPAREN exp_list RPARENexp_list : expressao\n                | exp_list COMMA expressaoif_then_else : IF expressao THEN statement ELSE statementif_then : IF expressao THEN statementwhile_stmt : WHILE expressao DO statementbloco_instr : BEGIN instrucoes ENDexpressao : expressao PLUS expressao\n                 | expressao MINUS expressao\n                 | expressao TIMES expressao\n                 | expressao DIVIDE expressao\n                 | expressao DIV expressao\n                 | expressao MOD expressao\n                 | expressao EQUAL expressao\n                 | expressao NE expressao\n                 | expressao LT expressao\n                 | expressao LE expressao\n                 | expressao GT expressao\n                 | expressao GE expressao\n                 | expressao AND expressao\n                 | expressao OR expressaoexpressao : LPAREN expressao RPARENexpressao : IDexpressao : NUMBERexpressao : STRING_LITERALexpressao : TRUEexpressao : FALSEempty :'
+_lr_signature = 'leftORleftANDleftEQUALNELTLEGTGEleftPLUSMINUSleftTIMESDIVIDEDIVMODAND ARRAY ASSIGN BEGIN BOOLEAN COLON COMMA DIV DIVIDE DO DOT DOTDOT DOWNTO ELSE END EQUAL FALSE FOR FUNCTION GE GT ID IF INTEGER LBRACKET LE LPAREN LT MINUS MOD NE NUMBER OF OR PLUS PROCEDURE PROGRAM RBRACKET READLN REAL RPAREN SEMICOLON STRING STRING_LITERAL THEN TIMES TO TRUE VAR WHILE WRITE WRITELNprograma : PROGRAM ID SEMICOLON bloco DOTbloco : VAR declaracoes subprogramas BEGIN instrucoes ENDbloco : subprogramas BEGIN instrucoes ENDdeclaracoes : declaracoes declaracao\n                   | declaracao\n                   | emptydeclaracao : lista_ids COLON tipo SEMICOLONsubprogramas : subprogramas subprograma\n                    | emptysubprograma : cabecalho corpo SEMICOLONcabecalho : PROCEDURE ID parametros SEMICOLONcabecalho : FUNCTION ID parametros COLON tipo SEMICOLONparametros : LPAREN grupos_parametros RPAREN\n                  | emptygrupos_parametros : grupo_parametros\n                         | grupos_parametros SEMICOLON grupo_parametrosgrupo_parametros : lista_ids COLON tipocorpo : VAR declaracoes BEGIN instrucoes END\n             | BEGIN instrucoes ENDlista_ids : ID\n                 | lista_ids COMMA IDtipo : INTEGER\n            | BOOLEAN\n            | STRING\n            | REALtipo : ARRAY LBRACKET NUMBER DOTDOT NUMBER RBRACKET OF tipoinstrucoes : statement_liststatement_list : statement_list SEMICOLON statementstatement_list : statement_list SEMICOLONstatement_list : statementstatement : atribuicao_instr_only\n                 | leitura_stmt\n                 | escrita_stmt\n                 | if_then_else\n                 | if_then\n                 | while_stmt\n                 | for_stmt\n                 | chamada_stmt\n                 | bloco_instratribuicao_instr_only : ID ASSIGN expressaoatribuicao_instr_only : ID LBRACKET expressao RBRACKET ASSIGN expressaochamada_stmt : ID\n                    | ID LPAREN exp_list RPARENleitura_stmt : READLN LPAREN ID RPARENleitura_stmt : READLN LPAREN ID LBRACKET expressao RBRACKET RPARENescrita_stmt : WRITELN LPAREN exp_list RPARENescrita_stmt : WRITE LPAREN exp_list RPARENexp_list : expressao\n                | exp_list COMMA expressaoif_then_else : IF expressao THEN statement ELSE statementif_then : IF expressao THEN statementwhile_stmt : WHILE expressao DO statementfor_stmt : FOR ID ASSIGN expressao TO expressao DO statement\n                | FOR ID ASSIGN expressao DOWNTO expressao DO statementbloco_instr : BEGIN instrucoes ENDexpressao : expressao PLUS expressao\n                 | expressao MINUS expressao\n                 | expressao TIMES expressao\n                 | expressao DIVIDE expressao\n                 | expressao DIV expressao\n                 | expressao MOD expressao\n                 | expressao EQUAL expressao\n                 | expressao NE expressao\n                 | expressao LT expressao\n                 | expressao LE expressao\n                 | expressao GT expressao\n                 | expressao GE expressao\n                 | expressao AND expressao\n                 | expressao OR expressaoexpressao : LPAREN expressao RPARENexpressao : IDexpressao : ID LPAREN exp_list RPARENexpressao : ID LBRACKET expressao RBRACKETexpressao : NUMBERexpressao : STRING_LITERALexpressao : TRUEexpressao : FALSEempty :'
     
-_lr_action_items = {'PROGRAM':([0,],[2,]),'$end':([1,8,],[0,-1,]),'ID':([2,6,7,9,10,11,14,29,30,31,32,34,37,38,39,40,41,43,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,83,87,108,],[3,13,25,13,-5,-6,25,44,44,25,-4,57,25,44,61,44,44,44,25,44,44,44,44,44,44,44,44,44,44,44,44,44,44,25,-7,44,25,]),'SEMICOLON':([3,16,17,18,19,20,21,22,23,24,37,44,45,46,47,48,51,52,53,54,55,58,59,60,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,105,110,114,],[4,37,-18,-19,-20,-21,-22,-23,-24,-25,-17,-51,-52,-53,-54,-55,83,-10,-11,-12,-13,-35,-16,-26,-27,-28,-29,-33,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-34,-32,-14,]),'VAR':([4,],[6,]),'BEGIN':([4,6,7,9,10,11,14,31,32,37,65,81,83,108,],[7,-56,14,31,-5,-6,14,14,-4,14,14,14,-7,14,]),'DOT':([5,36,82,],[8,-3,-2,]),'READLN':([7,14,31,37,65,81,108,],[26,26,26,26,26,26,26,]),'WRITELN':([7,14,31,37,65,81,108,],[27,27,27,27,27,27,27,]),'WRITE':([7,14,31,37,65,81,108,],[28,28,28,28,28,28,28,]),'IF':([7,14,31,37,65,81,108,],[29,29,29,29,29,29,29,]),'WHILE':([7,14,31,37,65,81,108,],[30,30,30,30,30,30,30,]),'COLON':([12,13,57,],[33,-8,-9,]),'COMMA':([12,13,44,45,46,47,48,57,62,63,64,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[34,-8,-51,-52,-53,-54,-55,-9,87,-30,87,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-31,]),'END':([15,16,17,18,19,20,21,22,23,24,35,37,44,45,46,47,48,50,58,59,60,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,105,110,],[36,-15,-18,-19,-20,-21,-22,-23,-24,-25,58,-17,-51,-52,-53,-54,-55,82,-35,-16,-26,-27,-28,-29,-33,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-34,-32,]),'ELSE':([18,19,20,21,22,23,24,44,45,46,47,48,58,60,85,86,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,105,110,],[-19,-20,-21,-22,-23,-24,-25,-51,-52,-53,-54,-55,-35,-26,-27,-28,-29,108,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-34,-32,]),'ASSIGN':([25,],[38,]),'LPAREN':([26,27,28,29,30,38,40,41,43,66,67,68,69,70,71,72,73,74,75,76,77,78,79,87,],[39,40,41,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,]),'NUMBER':([29,30,38,40,41,43,66,67,68,69,70,71,72,73,74,75,76,77,78,79,84,87,109,],[45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,106,45,111,]),'STRING_LITERAL':([29,30,38,40,41,43,66,67,68,69,70,71,72,73,74,75,76,77,78,79,87,],[46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,]),'TRUE':([29,30,38,40,41,43,66,67,68,69,70,71,72,73,74,75,76,77,78,79,87,],[47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,]),'FALSE':([29,30,38,40,41,43,66,67,68,69,70,71,72,73,74,75,76,77,78,79,87,],[48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,]),'INTEGER':([33,113,],[52,52,]),'BOOLEAN':([33,113,],[53,53,]),'STRING':([33,113,],[54,54,]),'REAL':([33,113,],[55,55,]),'ARRAY':([33,113,],[56,56,]),'THEN':([42,44,45,46,47,48,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,],[65,-51,-52,-53,-54,-55,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,]),'PLUS':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[66,-51,-52,-53,-54,-55,66,66,66,66,-36,-37,-38,-39,-40,-41,66,66,66,66,66,66,66,66,-50,66,]),'MINUS':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[67,-51,-52,-53,-54,-55,67,67,67,67,-36,-37,-38,-39,-40,-41,67,67,67,67,67,67,67,67,-50,67,]),'TIMES':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[68,-51,-52,-53,-54,-55,68,68,68,68,68,68,-38,-39,-40,-41,68,68,68,68,68,68,68,68,-50,68,]),'DIVIDE':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[69,-51,-52,-53,-54,-55,69,69,69,69,69,69,-38,-39,-40,-41,69,69,69,69,69,69,69,69,-50,69,]),'DIV':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[70,-51,-52,-53,-54,-55,70,70,70,70,70,70,-38,-39,-40,-41,70,70,70,70,70,70,70,70,-50,70,]),'MOD':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[71,-51,-52,-53,-54,-55,71,71,71,71,71,71,-38,-39,-40,-41,71,71,71,71,71,71,71,71,-50,71,]),'EQUAL':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[72,-51,-52,-53,-54,-55,72,72,72,72,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,72,72,-50,72,]),'NE':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[73,-51,-52,-53,-54,-55,73,73,73,73,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,73,73,-50,73,]),'LT':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[74,-51,-52,-53,-54,-55,74,74,74,74,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,74,74,-50,74,]),'LE':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[75,-51,-52,-53,-54,-55,75,75,75,75,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,75,75,-50,75,]),'GT':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[76,-51,-52,-53,-54,-55,76,76,76,76,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,76,76,-50,76,]),'GE':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[77,-51,-52,-53,-54,-55,77,77,77,77,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,77,77,-50,77,]),'AND':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[78,-51,-52,-53,-54,-55,78,78,78,78,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,78,-50,78,]),'OR':([42,44,45,46,47,48,49,60,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[79,-51,-52,-53,-54,-55,79,79,79,79,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,79,]),'DO':([44,45,46,47,48,49,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,],[-51,-52,-53,-54,-55,81,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,]),'RPAREN':([44,45,46,47,48,61,62,63,64,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,107,],[-51,-52,-53,-54,-55,85,86,-30,88,104,-36,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-31,]),'LBRACKET':([56,],[84,]),'DOTDOT':([106,],[109,]),'RBRACKET':([111,],[112,]),'OF':([112,],[113,]),}
+_lr_action_items = {'PROGRAM':([0,],[2,]),'$end':([1,9,],[0,-1,]),'ID':([2,6,10,11,12,15,18,19,21,23,24,41,42,43,45,46,49,59,60,61,62,63,64,65,67,76,79,83,94,95,96,97,98,99,100,101,102,103,104,105,106,107,108,110,111,112,113,114,125,127,152,156,159,162,163,176,177,],[3,14,14,-5,-6,37,47,48,-4,56,37,68,68,74,14,37,37,37,68,68,68,91,68,68,68,14,14,-7,37,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,37,68,37,68,68,14,68,37,68,68,37,37,]),'SEMICOLON':([3,26,27,28,29,30,31,32,33,34,35,36,37,44,47,50,51,52,53,54,59,68,69,70,71,72,78,80,85,86,87,115,117,118,124,126,128,129,130,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,148,151,154,160,161,164,165,166,169,171,175,179,180,181,],[4,59,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-42,75,-78,83,-22,-23,-24,-25,-29,-71,-74,-75,-76,-77,116,-14,-55,-28,-40,-19,152,-15,-43,-44,-46,-47,-51,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,-52,-13,167,-72,-73,-18,-16,-17,-41,-50,-45,-53,-54,-26,]),'VAR':([4,17,116,167,],[6,45,-11,-12,]),'BEGIN':([4,6,7,8,10,11,12,15,16,17,20,21,24,45,46,49,59,75,76,83,94,112,114,116,159,167,176,177,],[-78,-78,15,-9,-78,-5,-6,24,-8,46,49,-4,24,-78,24,24,24,-10,114,-7,24,24,24,-11,24,-12,24,24,]),'PROCEDURE':([4,6,7,8,10,11,12,16,20,21,75,83,],[-78,-78,18,-9,-78,-5,-6,-8,18,-4,-10,-7,]),'FUNCTION':([4,6,7,8,10,11,12,16,20,21,75,83,],[-78,-78,19,-9,-78,-5,-6,-8,19,-4,-10,-7,]),'DOT':([5,58,121,],[9,-3,-2,]),'COLON':([13,14,48,56,80,81,119,151,],[22,-20,-78,-21,-14,120,153,-13,]),'COMMA':([13,14,56,68,69,70,71,72,89,90,92,93,119,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,157,160,161,],[23,-20,-21,-71,-74,-75,-76,-77,125,-48,125,125,23,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,125,-49,-72,-73,]),'READLN':([15,24,46,49,59,94,112,114,159,176,177,],[38,38,38,38,38,38,38,38,38,38,38,]),'WRITELN':([15,24,46,49,59,94,112,114,159,176,177,],[39,39,39,39,39,39,39,39,39,39,39,]),'WRITE':([15,24,46,49,59,94,112,114,159,176,177,],[40,40,40,40,40,40,40,40,40,40,40,]),'IF':([15,24,46,49,59,94,112,114,159,176,177,],[41,41,41,41,41,41,41,41,41,41,41,]),'WHILE':([15,24,46,49,59,94,112,114,159,176,177,],[42,42,42,42,42,42,42,42,42,42,42,]),'FOR':([15,24,46,49,59,94,112,114,159,176,177,],[43,43,43,43,43,43,43,43,43,43,43,]),'INTEGER':([22,120,153,178,],[51,51,51,51,]),'BOOLEAN':([22,120,153,178,],[52,52,52,52,]),'STRING':([22,120,153,178,],[53,53,53,53,]),'REAL':([22,120,153,178,],[54,54,54,54,]),'ARRAY':([22,120,153,178,],[55,55,55,55,]),'END':([25,26,27,28,29,30,31,32,33,34,35,36,37,57,59,68,69,70,71,72,77,82,85,86,87,124,126,128,129,130,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,148,150,160,161,169,171,175,179,180,],[58,-27,-30,-31,-32,-33,-34,-35,-36,-37,-38,-39,-42,85,-29,-71,-74,-75,-76,-77,115,121,-55,-28,-40,-43,-44,-46,-47,-51,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,-52,164,-72,-73,-41,-50,-45,-53,-54,]),'ELSE':([28,29,30,31,32,33,34,35,36,37,68,69,70,71,72,85,87,124,126,128,129,130,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,148,160,161,169,171,175,179,180,],[-31,-32,-33,-34,-35,-36,-37,-38,-39,-42,-71,-74,-75,-76,-77,-55,-40,-43,-44,-46,-47,159,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,-52,-72,-73,-41,-50,-45,-53,-54,]),'ASSIGN':([37,74,123,],[60,113,156,]),'LBRACKET':([37,55,68,91,],[61,84,111,127,]),'LPAREN':([37,38,39,40,41,42,47,48,60,61,62,64,65,67,68,95,96,97,98,99,100,101,102,103,104,105,106,107,108,110,111,113,125,127,156,162,163,],[62,63,64,65,67,67,79,79,67,67,67,67,67,67,110,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,]),'NUMBER':([41,42,60,61,62,64,65,67,84,95,96,97,98,99,100,101,102,103,104,105,106,107,108,110,111,113,125,127,155,156,162,163,],[69,69,69,69,69,69,69,69,122,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,168,69,69,69,]),'STRING_LITERAL':([41,42,60,61,62,64,65,67,95,96,97,98,99,100,101,102,103,104,105,106,107,108,110,111,113,125,127,156,162,163,],[70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,]),'TRUE':([41,42,60,61,62,64,65,67,95,96,97,98,99,100,101,102,103,104,105,106,107,108,110,111,113,125,127,156,162,163,],[71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,]),'FALSE':([41,42,60,61,62,64,65,67,95,96,97,98,99,100,101,102,103,104,105,106,107,108,110,111,113,125,127,156,162,163,],[72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,]),'RPAREN':([51,52,53,54,68,69,70,71,72,89,90,91,92,93,109,117,118,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,157,160,161,165,166,170,181,],[-22,-23,-24,-25,-71,-74,-75,-76,-77,124,-48,126,128,129,145,151,-15,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,160,-49,-72,-73,-16,-17,175,-26,]),'THEN':([66,68,69,70,71,72,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,160,161,],[94,-71,-74,-75,-76,-77,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,-72,-73,]),'PLUS':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[95,-71,-74,-75,-76,-77,95,95,95,95,95,-56,-57,-58,-59,-60,-61,95,95,95,95,95,95,95,95,-70,95,95,95,95,-72,-73,95,95,95,]),'MINUS':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[96,-71,-74,-75,-76,-77,96,96,96,96,96,-56,-57,-58,-59,-60,-61,96,96,96,96,96,96,96,96,-70,96,96,96,96,-72,-73,96,96,96,]),'TIMES':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[97,-71,-74,-75,-76,-77,97,97,97,97,97,97,97,-58,-59,-60,-61,97,97,97,97,97,97,97,97,-70,97,97,97,97,-72,-73,97,97,97,]),'DIVIDE':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[98,-71,-74,-75,-76,-77,98,98,98,98,98,98,98,-58,-59,-60,-61,98,98,98,98,98,98,98,98,-70,98,98,98,98,-72,-73,98,98,98,]),'DIV':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[99,-71,-74,-75,-76,-77,99,99,99,99,99,99,99,-58,-59,-60,-61,99,99,99,99,99,99,99,99,-70,99,99,99,99,-72,-73,99,99,99,]),'MOD':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[100,-71,-74,-75,-76,-77,100,100,100,100,100,100,100,-58,-59,-60,-61,100,100,100,100,100,100,100,100,-70,100,100,100,100,-72,-73,100,100,100,]),'EQUAL':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[101,-71,-74,-75,-76,-77,101,101,101,101,101,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,101,101,-70,101,101,101,101,-72,-73,101,101,101,]),'NE':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[102,-71,-74,-75,-76,-77,102,102,102,102,102,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,102,102,-70,102,102,102,102,-72,-73,102,102,102,]),'LT':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[103,-71,-74,-75,-76,-77,103,103,103,103,103,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,103,103,-70,103,103,103,103,-72,-73,103,103,103,]),'LE':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[104,-71,-74,-75,-76,-77,104,104,104,104,104,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,104,104,-70,104,104,104,104,-72,-73,104,104,104,]),'GT':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[105,-71,-74,-75,-76,-77,105,105,105,105,105,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,105,105,-70,105,105,105,105,-72,-73,105,105,105,]),'GE':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[106,-71,-74,-75,-76,-77,106,106,106,106,106,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,106,106,-70,106,106,106,106,-72,-73,106,106,106,]),'AND':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[107,-71,-74,-75,-76,-77,107,107,107,107,107,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,107,-70,107,107,107,107,-72,-73,107,107,107,]),'OR':([66,68,69,70,71,72,73,87,88,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,149,157,158,160,161,169,172,173,],[108,-71,-74,-75,-76,-77,108,108,108,108,108,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,108,108,108,108,-72,-73,108,108,108,]),'DO':([68,69,70,71,72,73,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,160,161,172,173,],[-71,-74,-75,-76,-77,112,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,-72,-73,176,177,]),'RBRACKET':([68,69,70,71,72,88,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,147,158,160,161,168,],[-71,-74,-75,-76,-77,123,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,161,170,-72,-73,174,]),'TO':([68,69,70,71,72,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,149,160,161,],[-71,-74,-75,-76,-77,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,162,-72,-73,]),'DOWNTO':([68,69,70,71,72,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,149,160,161,],[-71,-74,-75,-76,-77,-56,-57,-58,-59,-60,-61,-62,-63,-64,-65,-66,-67,-68,-69,-70,163,-72,-73,]),'DOTDOT':([122,],[155,]),'OF':([174,],[178,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'programa':([0,],[1,]),'bloco':([4,],[5,]),'declaracoes':([6,],[9,]),'declaracao':([6,9,],[10,32,]),'empty':([6,],[11,]),'lista_ids':([6,9,],[12,12,]),'instrucoes':([7,14,31,],[15,35,50,]),'statement_list':([7,14,31,],[16,16,16,]),'statement':([7,14,31,37,65,81,108,],[17,17,17,59,89,105,110,]),'atribuicao_instr_only':([7,14,31,37,65,81,108,],[18,18,18,18,18,18,18,]),'leitura_stmt':([7,14,31,37,65,81,108,],[19,19,19,19,19,19,19,]),'escrita_stmt':([7,14,31,37,65,81,108,],[20,20,20,20,20,20,20,]),'if_then_else':([7,14,31,37,65,81,108,],[21,21,21,21,21,21,21,]),'if_then':([7,14,31,37,65,81,108,],[22,22,22,22,22,22,22,]),'while_stmt':([7,14,31,37,65,81,108,],[23,23,23,23,23,23,23,]),'bloco_instr':([7,14,31,37,65,81,108,],[24,24,24,24,24,24,24,]),'expressao':([29,30,38,40,41,43,66,67,68,69,70,71,72,73,74,75,76,77,78,79,87,],[42,49,60,63,63,80,90,91,92,93,94,95,96,97,98,99,100,101,102,103,107,]),'tipo':([33,113,],[51,114,]),'exp_list':([40,41,],[62,64,]),}
+_lr_goto_items = {'programa':([0,],[1,]),'bloco':([4,],[5,]),'subprogramas':([4,10,],[7,20,]),'empty':([4,6,10,45,47,48,],[8,12,8,12,80,80,]),'declaracoes':([6,45,],[10,76,]),'declaracao':([6,10,45,76,],[11,21,11,21,]),'lista_ids':([6,10,45,76,79,152,],[13,13,13,13,119,119,]),'subprograma':([7,20,],[16,16,]),'cabecalho':([7,20,],[17,17,]),'instrucoes':([15,24,46,49,114,],[25,57,77,82,150,]),'statement_list':([15,24,46,49,114,],[26,26,26,26,26,]),'statement':([15,24,46,49,59,94,112,114,159,176,177,],[27,27,27,27,86,130,148,27,171,179,180,]),'atribuicao_instr_only':([15,24,46,49,59,94,112,114,159,176,177,],[28,28,28,28,28,28,28,28,28,28,28,]),'leitura_stmt':([15,24,46,49,59,94,112,114,159,176,177,],[29,29,29,29,29,29,29,29,29,29,29,]),'escrita_stmt':([15,24,46,49,59,94,112,114,159,176,177,],[30,30,30,30,30,30,30,30,30,30,30,]),'if_then_else':([15,24,46,49,59,94,112,114,159,176,177,],[31,31,31,31,31,31,31,31,31,31,31,]),'if_then':([15,24,46,49,59,94,112,114,159,176,177,],[32,32,32,32,32,32,32,32,32,32,32,]),'while_stmt':([15,24,46,49,59,94,112,114,159,176,177,],[33,33,33,33,33,33,33,33,33,33,33,]),'for_stmt':([15,24,46,49,59,94,112,114,159,176,177,],[34,34,34,34,34,34,34,34,34,34,34,]),'chamada_stmt':([15,24,46,49,59,94,112,114,159,176,177,],[35,35,35,35,35,35,35,35,35,35,35,]),'bloco_instr':([15,24,46,49,59,94,112,114,159,176,177,],[36,36,36,36,36,36,36,36,36,36,36,]),'corpo':([17,],[44,]),'tipo':([22,120,153,178,],[50,154,166,181,]),'expressao':([41,42,60,61,62,64,65,67,95,96,97,98,99,100,101,102,103,104,105,106,107,108,110,111,113,125,127,156,162,163,],[66,73,87,88,90,90,90,109,131,132,133,134,135,136,137,138,139,140,141,142,143,144,90,147,149,157,158,169,172,173,]),'parametros':([47,48,],[78,81,]),'exp_list':([62,64,65,110,],[89,92,93,146,]),'grupos_parametros':([79,],[117,]),'grupo_parametros':([79,152,],[118,165,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,60 +27,82 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> programa","S'",1,None,None,None),
-  ('programa -> PROGRAM ID SEMICOLON bloco DOT','programa',5,'p_programa','parser.py',399),
-  ('bloco -> VAR declaracoes BEGIN instrucoes END','bloco',5,'p_bloco_com_var','parser.py',403),
-  ('bloco -> BEGIN instrucoes END','bloco',3,'p_bloco_sem_var','parser.py',407),
-  ('declaracoes -> declaracoes declaracao','declaracoes',2,'p_declaracoes','parser.py',411),
-  ('declaracoes -> declaracao','declaracoes',1,'p_declaracoes','parser.py',412),
-  ('declaracoes -> empty','declaracoes',1,'p_declaracoes','parser.py',413),
-  ('declaracao -> lista_ids COLON tipo SEMICOLON','declaracao',4,'p_declaracao','parser.py',423),
-  ('lista_ids -> ID','lista_ids',1,'p_lista_ids','parser.py',437),
-  ('lista_ids -> lista_ids COMMA ID','lista_ids',3,'p_lista_ids','parser.py',438),
-  ('tipo -> INTEGER','tipo',1,'p_tipo_primitivo','parser.py',445),
-  ('tipo -> BOOLEAN','tipo',1,'p_tipo_primitivo','parser.py',446),
-  ('tipo -> STRING','tipo',1,'p_tipo_primitivo','parser.py',447),
-  ('tipo -> REAL','tipo',1,'p_tipo_primitivo','parser.py',448),
-  ('tipo -> ARRAY LBRACKET NUMBER DOTDOT NUMBER RBRACKET OF tipo','tipo',8,'p_tipo_array','parser.py',452),
-  ('instrucoes -> statement_list','instrucoes',1,'p_instrucoes','parser.py',456),
-  ('statement_list -> statement_list SEMICOLON statement','statement_list',3,'p_statement_list_multi','parser.py',460),
-  ('statement_list -> statement_list SEMICOLON','statement_list',2,'p_statement_list_trail','parser.py',464),
-  ('statement_list -> statement','statement_list',1,'p_statement_list_single','parser.py',468),
-  ('statement -> atribuicao_instr_only','statement',1,'p_statement','parser.py',472),
-  ('statement -> leitura_stmt','statement',1,'p_statement','parser.py',473),
-  ('statement -> escrita_stmt','statement',1,'p_statement','parser.py',474),
-  ('statement -> if_then_else','statement',1,'p_statement','parser.py',475),
-  ('statement -> if_then','statement',1,'p_statement','parser.py',476),
-  ('statement -> while_stmt','statement',1,'p_statement','parser.py',477),
-  ('statement -> bloco_instr','statement',1,'p_statement','parser.py',478),
-  ('atribuicao_instr_only -> ID ASSIGN expressao','atribuicao_instr_only',3,'p_atribuicao_instr_only','parser.py',482),
-  ('leitura_stmt -> READLN LPAREN ID RPAREN','leitura_stmt',4,'p_leitura_stmt','parser.py',486),
-  ('escrita_stmt -> WRITELN LPAREN exp_list RPAREN','escrita_stmt',4,'p_escrita_stmt_writeln','parser.py',490),
-  ('escrita_stmt -> WRITE LPAREN exp_list RPAREN','escrita_stmt',4,'p_escrita_stmt_write','parser.py',494),
-  ('exp_list -> expressao','exp_list',1,'p_exp_list','parser.py',498),
-  ('exp_list -> exp_list COMMA expressao','exp_list',3,'p_exp_list','parser.py',499),
-  ('if_then_else -> IF expressao THEN statement ELSE statement','if_then_else',6,'p_if_then_else','parser.py',506),
-  ('if_then -> IF expressao THEN statement','if_then',4,'p_if_then','parser.py',513),
-  ('while_stmt -> WHILE expressao DO statement','while_stmt',4,'p_while_stmt','parser.py',519),
-  ('bloco_instr -> BEGIN instrucoes END','bloco_instr',3,'p_bloco_instr','parser.py',525),
-  ('expressao -> expressao PLUS expressao','expressao',3,'p_expressao_binaria','parser.py',531),
-  ('expressao -> expressao MINUS expressao','expressao',3,'p_expressao_binaria','parser.py',532),
-  ('expressao -> expressao TIMES expressao','expressao',3,'p_expressao_binaria','parser.py',533),
-  ('expressao -> expressao DIVIDE expressao','expressao',3,'p_expressao_binaria','parser.py',534),
-  ('expressao -> expressao DIV expressao','expressao',3,'p_expressao_binaria','parser.py',535),
-  ('expressao -> expressao MOD expressao','expressao',3,'p_expressao_binaria','parser.py',536),
-  ('expressao -> expressao EQUAL expressao','expressao',3,'p_expressao_binaria','parser.py',537),
-  ('expressao -> expressao NE expressao','expressao',3,'p_expressao_binaria','parser.py',538),
-  ('expressao -> expressao LT expressao','expressao',3,'p_expressao_binaria','parser.py',539),
-  ('expressao -> expressao LE expressao','expressao',3,'p_expressao_binaria','parser.py',540),
-  ('expressao -> expressao GT expressao','expressao',3,'p_expressao_binaria','parser.py',541),
-  ('expressao -> expressao GE expressao','expressao',3,'p_expressao_binaria','parser.py',542),
-  ('expressao -> expressao AND expressao','expressao',3,'p_expressao_binaria','parser.py',543),
-  ('expressao -> expressao OR expressao','expressao',3,'p_expressao_binaria','parser.py',544),
-  ('expressao -> LPAREN expressao RPAREN','expressao',3,'p_expressao_grupo','parser.py',551),
-  ('expressao -> ID','expressao',1,'p_expressao_id','parser.py',555),
-  ('expressao -> NUMBER','expressao',1,'p_expressao_num','parser.py',559),
-  ('expressao -> STRING_LITERAL','expressao',1,'p_expressao_str','parser.py',563),
-  ('expressao -> TRUE','expressao',1,'p_expressao_true','parser.py',567),
-  ('expressao -> FALSE','expressao',1,'p_expressao_false','parser.py',571),
-  ('empty -> <empty>','empty',0,'p_empty','parser.py',575),
+  ('programa -> PROGRAM ID SEMICOLON bloco DOT','programa',5,'p_programa','parser.py',661),
+  ('bloco -> VAR declaracoes subprogramas BEGIN instrucoes END','bloco',6,'p_bloco_com_var','parser.py',666),
+  ('bloco -> subprogramas BEGIN instrucoes END','bloco',4,'p_bloco_sem_var','parser.py',670),
+  ('declaracoes -> declaracoes declaracao','declaracoes',2,'p_declaracoes','parser.py',674),
+  ('declaracoes -> declaracao','declaracoes',1,'p_declaracoes','parser.py',675),
+  ('declaracoes -> empty','declaracoes',1,'p_declaracoes','parser.py',676),
+  ('declaracao -> lista_ids COLON tipo SEMICOLON','declaracao',4,'p_declaracao','parser.py',686),
+  ('subprogramas -> subprogramas subprograma','subprogramas',2,'p_subprogramas','parser.py',745),
+  ('subprogramas -> empty','subprogramas',1,'p_subprogramas','parser.py',746),
+  ('subprograma -> cabecalho corpo SEMICOLON','subprograma',3,'p_subprograma','parser.py',750),
+  ('cabecalho -> PROCEDURE ID parametros SEMICOLON','cabecalho',4,'p_cabecalho_procedimento','parser.py',756),
+  ('cabecalho -> FUNCTION ID parametros COLON tipo SEMICOLON','cabecalho',6,'p_cabecalho_funcao','parser.py',760),
+  ('parametros -> LPAREN grupos_parametros RPAREN','parametros',3,'p_parametros','parser.py',764),
+  ('parametros -> empty','parametros',1,'p_parametros','parser.py',765),
+  ('grupos_parametros -> grupo_parametros','grupos_parametros',1,'p_grupos_parametros','parser.py',769),
+  ('grupos_parametros -> grupos_parametros SEMICOLON grupo_parametros','grupos_parametros',3,'p_grupos_parametros','parser.py',770),
+  ('grupo_parametros -> lista_ids COLON tipo','grupo_parametros',3,'p_grupo_parametros','parser.py',774),
+  ('corpo -> VAR declaracoes BEGIN instrucoes END','corpo',5,'p_corpo','parser.py',778),
+  ('corpo -> BEGIN instrucoes END','corpo',3,'p_corpo','parser.py',779),
+  ('lista_ids -> ID','lista_ids',1,'p_lista_ids','parser.py',783),
+  ('lista_ids -> lista_ids COMMA ID','lista_ids',3,'p_lista_ids','parser.py',784),
+  ('tipo -> INTEGER','tipo',1,'p_tipo_primitivo','parser.py',791),
+  ('tipo -> BOOLEAN','tipo',1,'p_tipo_primitivo','parser.py',792),
+  ('tipo -> STRING','tipo',1,'p_tipo_primitivo','parser.py',793),
+  ('tipo -> REAL','tipo',1,'p_tipo_primitivo','parser.py',794),
+  ('tipo -> ARRAY LBRACKET NUMBER DOTDOT NUMBER RBRACKET OF tipo','tipo',8,'p_tipo_array','parser.py',798),
+  ('instrucoes -> statement_list','instrucoes',1,'p_instrucoes','parser.py',806),
+  ('statement_list -> statement_list SEMICOLON statement','statement_list',3,'p_statement_list_multi','parser.py',810),
+  ('statement_list -> statement_list SEMICOLON','statement_list',2,'p_statement_list_trail','parser.py',814),
+  ('statement_list -> statement','statement_list',1,'p_statement_list_single','parser.py',818),
+  ('statement -> atribuicao_instr_only','statement',1,'p_statement','parser.py',822),
+  ('statement -> leitura_stmt','statement',1,'p_statement','parser.py',823),
+  ('statement -> escrita_stmt','statement',1,'p_statement','parser.py',824),
+  ('statement -> if_then_else','statement',1,'p_statement','parser.py',825),
+  ('statement -> if_then','statement',1,'p_statement','parser.py',826),
+  ('statement -> while_stmt','statement',1,'p_statement','parser.py',827),
+  ('statement -> for_stmt','statement',1,'p_statement','parser.py',828),
+  ('statement -> chamada_stmt','statement',1,'p_statement','parser.py',829),
+  ('statement -> bloco_instr','statement',1,'p_statement','parser.py',830),
+  ('atribuicao_instr_only -> ID ASSIGN expressao','atribuicao_instr_only',3,'p_atribuicao_instr_only','parser.py',834),
+  ('atribuicao_instr_only -> ID LBRACKET expressao RBRACKET ASSIGN expressao','atribuicao_instr_only',6,'p_atribuicao_indexada','parser.py',838),
+  ('chamada_stmt -> ID','chamada_stmt',1,'p_chamada_stmt','parser.py',842),
+  ('chamada_stmt -> ID LPAREN exp_list RPAREN','chamada_stmt',4,'p_chamada_stmt','parser.py',843),
+  ('leitura_stmt -> READLN LPAREN ID RPAREN','leitura_stmt',4,'p_leitura_stmt','parser.py',847),
+  ('leitura_stmt -> READLN LPAREN ID LBRACKET expressao RBRACKET RPAREN','leitura_stmt',7,'p_leitura_indexada','parser.py',851),
+  ('escrita_stmt -> WRITELN LPAREN exp_list RPAREN','escrita_stmt',4,'p_escrita_stmt_writeln','parser.py',855),
+  ('escrita_stmt -> WRITE LPAREN exp_list RPAREN','escrita_stmt',4,'p_escrita_stmt_write','parser.py',859),
+  ('exp_list -> expressao','exp_list',1,'p_exp_list','parser.py',863),
+  ('exp_list -> exp_list COMMA expressao','exp_list',3,'p_exp_list','parser.py',864),
+  ('if_then_else -> IF expressao THEN statement ELSE statement','if_then_else',6,'p_if_then_else','parser.py',871),
+  ('if_then -> IF expressao THEN statement','if_then',4,'p_if_then','parser.py',878),
+  ('while_stmt -> WHILE expressao DO statement','while_stmt',4,'p_while_stmt','parser.py',884),
+  ('for_stmt -> FOR ID ASSIGN expressao TO expressao DO statement','for_stmt',8,'p_for_stmt','parser.py',890),
+  ('for_stmt -> FOR ID ASSIGN expressao DOWNTO expressao DO statement','for_stmt',8,'p_for_stmt','parser.py',891),
+  ('bloco_instr -> BEGIN instrucoes END','bloco_instr',3,'p_bloco_instr','parser.py',904),
+  ('expressao -> expressao PLUS expressao','expressao',3,'p_expressao_binaria','parser.py',910),
+  ('expressao -> expressao MINUS expressao','expressao',3,'p_expressao_binaria','parser.py',911),
+  ('expressao -> expressao TIMES expressao','expressao',3,'p_expressao_binaria','parser.py',912),
+  ('expressao -> expressao DIVIDE expressao','expressao',3,'p_expressao_binaria','parser.py',913),
+  ('expressao -> expressao DIV expressao','expressao',3,'p_expressao_binaria','parser.py',914),
+  ('expressao -> expressao MOD expressao','expressao',3,'p_expressao_binaria','parser.py',915),
+  ('expressao -> expressao EQUAL expressao','expressao',3,'p_expressao_binaria','parser.py',916),
+  ('expressao -> expressao NE expressao','expressao',3,'p_expressao_binaria','parser.py',917),
+  ('expressao -> expressao LT expressao','expressao',3,'p_expressao_binaria','parser.py',918),
+  ('expressao -> expressao LE expressao','expressao',3,'p_expressao_binaria','parser.py',919),
+  ('expressao -> expressao GT expressao','expressao',3,'p_expressao_binaria','parser.py',920),
+  ('expressao -> expressao GE expressao','expressao',3,'p_expressao_binaria','parser.py',921),
+  ('expressao -> expressao AND expressao','expressao',3,'p_expressao_binaria','parser.py',922),
+  ('expressao -> expressao OR expressao','expressao',3,'p_expressao_binaria','parser.py',923),
+  ('expressao -> LPAREN expressao RPAREN','expressao',3,'p_expressao_grupo','parser.py',930),
+  ('expressao -> ID','expressao',1,'p_expressao_id','parser.py',934),
+  ('expressao -> ID LPAREN exp_list RPAREN','expressao',4,'p_expressao_chamada','parser.py',953),
+  ('expressao -> ID LBRACKET expressao RBRACKET','expressao',4,'p_expressao_index','parser.py',957),
+  ('expressao -> NUMBER','expressao',1,'p_expressao_num','parser.py',961),
+  ('expressao -> STRING_LITERAL','expressao',1,'p_expressao_str','parser.py',965),
+  ('expressao -> TRUE','expressao',1,'p_expressao_true','parser.py',969),
+  ('expressao -> FALSE','expressao',1,'p_expressao_false','parser.py',973),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',977),
 ]
@@ -0,0 +1,134 @@
+import time, json, contextlib, tracemalloc
+
+from arvore import nos
+
+# ---------------------------------------------------
+# Instrumentação da compilação (parser.py --profile)
+#
+# Um Perfil acompanha a compilação de um programa (ctx.perfil) e guarda:
+#   - o tempo de cada fase (FASES): construção do lexer, parser (inclui a
+#     análise léxica, que o PLY faz a pedido), análise semântica, dobragem,
+#     geração de código, código morto, peephole, alocação de posições,
+#     montagem e escrita do .ewvm;
+#   - contadores: tokens, nós da AST e instruções EWVM;
+#   - o pico de memória alocada durante a compilação (tracemalloc, que
+#     também torna a compilação mais lenta: os tempos servem para comparar
+#     fases e programas entre si, não com uma execução sem --profile).
+# Os Perfis vêm dos processos de compilação com os resultados e o driver
+# escreve-os como tabela ou como linhas JSON (uma por programa).
+# Sem --profile o contexto não tem Perfil e usa-se SEM_PERFIL, que não
+# mede nada.
+# ---------------------------------------------------
+
+FASES = ('lexer', 'parser', 'semantica', 'dobragem', 'codegen', 'codigo_morto', 'peephole', 'slots',
+         'montagem', 'escrita')
+
+class Perfil:
+    """Medições da compilação de um programa (tempos em segundos, memória em bytes)."""
+    __slots__ = ('fases', 'tokens', 'nos', 'instrucoes', 'memoria')
+
+    def __init__(self):
+        self.fases = {}
+        self.tokens = 0
+        self.nos = 0
+        self.instrucoes = 0
+        self.memoria = 0
+
+    @contextlib.contextmanager
+    def fase(self, nome):
+        """Soma à fase 'nome' o tempo passado dentro do bloco with."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases[nome] = self.fases.get(nome, 0.0) + time.perf_counter() - inicio
+
+    @contextlib.contextmanager
+    def pico_memoria(self):
+        """Regista em 'memoria' o pico de memória alocada dentro do bloco with."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            self.memoria = max(self.memoria, tracemalloc.get_traced_memory()[1] - base)
+
+    def contar_tokens(self, lexer):
+        """Função de tokens para parse(tokenfunc=…) que conta os tokens de 'lexer'."""
+        def token():
+            t = lexer.token()
+            if t is not None:
+                self.tokens += 1
+            return t
+        return token
+
+    def contar_nos(self, raiz):
+        """Conta os nós da AST (sem recursão, como os passos do compilador)."""
+        self.nos += sum(1 for _ in nos(raiz))
+
+    def total(self):
+        return sum(self.fases.values())
+
+class _SemPerfil:
+    """Perfil que não mede nada (compilação sem --profile)."""
+
+    def fase(self, nome):
+        return contextlib.nullcontext()
+
+    def pico_memoria(self):
+        return contextlib.nullcontext()
+
+    def contar_tokens(self, lexer):
+        return None                     # parse() usa lexer.token diretamente
+
+    def contar_nos(self, raiz):
+        pass
+
+SEM_PERFIL = _SemPerfil()
+
+# ---------------- saída ----------------
+
+def registo(nome_prog, perfil, erro=None):
+    """Dicionário com as medições de um programa (perfil None = lido da cache)."""
+    if perfil is None:
+        return {'programa': nome_prog, 'cache': True}
+    r = {'programa': nome_prog, 'tokens': perfil.tokens, 'nos': perfil.nos,
+         'instrucoes': perfil.instrucoes,
+         'fases_ms': {f: round(perfil.fases[f] * 1000, 3) for f in FASES if f in perfil.fases},
+         'total_ms': round(perfil.total() * 1000, 3), 'memoria_pico': perfil.memoria}
+    if erro is not None:
+        r['erro'] = erro
+    return r
+
+def linha_json(registo):
+    return json.dumps(registo, ensure_ascii=False)
+
+def tabela(registos):
+    """Linhas de uma tabela com um programa por linha e os totais no fim."""
+    fases = [f for f in FASES if any(f in r.get('fases_ms', ()) for r in registos)]
+    cabecalho = (f"{'programa':<24}{'tokens':>9}{'nós':>9}{'instr.':>9}"
+                 + "".join(f"{f:>11}" for f in fases) + f"{'total':>11}{'pico KiB':>10}")
+    linhas = [cabecalho + "   (ms)", "-" * len(cabecalho)]
+    soma = {'tokens': 0, 'nos': 0, 'instrucoes': 0, 'total_ms': 0.0, 'memoria_pico': 0}
+    soma_fases = dict.fromkeys(fases, 0.0)
+    for r in registos:
+        sufixo = " (erro)" if 'erro' in r else ""
+        nome = r['programa'][:23 - len(sufixo)] + sufixo
+        if r.get('cache'):
+            linhas.append(f"{nome:<24}  (da cache)")
+            continue
+        for chave in soma:
+            soma[chave] = max(soma[chave], r[chave]) if chave == 'memoria_pico' else soma[chave] + r[chave]
+        for f in fases:
+            soma_fases[f] += r['fases_ms'].get(f, 0.0)
+        linhas.append(_linha(nome, r, r['fases_ms'], fases))
+    linhas.append("-" * len(cabecalho))
+    linhas.append(_linha(f"TOTAL ({len(registos)})", soma, soma_fases, fases))
+    return linhas
+
+def _linha(nome, r, fases_ms, fases):
+    return (f"{nome:<24}{r['tokens']:>9}{r['nos']:>9}{r['instrucoes']:>9}"
+            + "".join(f"{fases_ms.get(f, 0.0):>11.2f}" for f in fases)
+            + f"{r['total_ms']:>11.2f}{r['memoria_pico'] / 1024:>10.0f}")
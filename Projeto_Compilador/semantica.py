@@ -0,0 +1,225 @@
+from collections import ChainMap
+
+from arvore import (Num, Id, Index, Call, BinOp, Assign, AssignIndex, Read, ReadIndex, Write, If, While,
+                    For, ProcCall, Block, TipoArray, Subprograma)
+
+# ---------------------------------------------------
+# Análise semântica: tipos das expressões
+#
+# Uma única passagem sobre a AST (depois da análise sintática) calcula o
+# tipo de cada expressão e verifica:
+#   - que todas as variáveis usadas foram declaradas;
+#   - que os operandos de cada operador têm tipos compatíveis;
+#   - atribuições, condições de if/while, ciclos for, read e write;
+#   - que só os arrays são indexados, com índices inteiros (e, se o
+#     índice é uma constante, dentro dos limites declarados).
+# Uma variável array usada sem índice tem o tipo 'array', que nenhum
+# operador nem instrução aceita.
+# Os corpos dos subprogramas são verificados com a tabela local à frente da
+# global (ChainMap): os parâmetros, o resultado e as variáveis locais
+# escondem as globais com o mesmo nome. As chamadas procuram o subprograma
+# na tabela global e verificam o número e os tipos dos argumentos (como
+# numa atribuição ao parâmetro).
+# Um inteiro pode ser guardado numa variável, elemento ou parâmetro real:
+# a geração de código converte-o com ITOF.
+# O tipo fica no próprio nó (campo 'tipo' de arvore.Expressao), para a
+# geração de código escolher WRITEI/WRITEF/WRITES com uma consulta. Os nós
+# já anotados não voltam a ser percorridos: depois da dobragem de
+# constantes só os nós novos são tipados.
+# Como a geração de código, o percurso usa pilhas explícitas (sem recursão).
+# ---------------------------------------------------
+
+class ErroSemantico(Exception):
+    """Variável não declarada ou tipos incompatíveis."""
+
+_NUMERICOS = {'integer', 'real'}
+_RELACIONAIS = {'=', '<>', '<', '<=', '>', '>='}
+
+def _tipo_operacao(op, esq, dir_):
+    """Tipo do resultado de 'esq op dir_' (tipos dos operandos)."""
+    if op == 'and' or op == 'or':
+        if esq == dir_ == 'boolean':
+            return 'boolean'
+    elif op in _RELACIONAIS:
+        if (esq == dir_ != 'array') or (esq in _NUMERICOS and dir_ in _NUMERICOS):
+            return 'boolean'
+    elif op == 'div' or op == 'mod':
+        if esq == dir_ == 'integer':
+            return 'integer'
+    elif esq in _NUMERICOS and dir_ in _NUMERICOS:
+        # + - * / ('/' entre inteiros é a divisão inteira da EWVM)
+        return 'real' if 'real' in (esq, dir_) else 'integer'
+    raise ErroSemantico(f"Tipos incompatíveis: {esq} {op} {dir_}")
+
+def _tipo_variavel(tabela, nome):
+    if nome not in tabela:
+        raise ErroSemantico(f"Variável não declarada: '{nome}'")
+    tipo = tabela[nome][0]
+    if type(tipo) is Subprograma:
+        raise ErroSemantico(f"'{nome}' é um subprograma, não uma variável")
+    return tipo
+
+def _subprograma(tabela, nome):
+    """Subprograma 'nome' (na tabela global, a última de um ChainMap)."""
+    globais = tabela.maps[-1] if type(tabela) is ChainMap else tabela
+    entrada = globais.get(nome)
+    if entrada is None:
+        raise ErroSemantico(f"Subprograma não declarado: '{nome}'")
+    if type(entrada[0]) is not Subprograma:
+        raise ErroSemantico(f"'{nome}' não é um subprograma")
+    return entrada[0]
+
+def _verificar_argumentos(sub, args):
+    """Número e tipos (já calculados) dos argumentos de uma chamada a 'sub'."""
+    if len(args) != len(sub.parametros):
+        raise ErroSemantico(f"'{sub.nome}' recebe {len(sub.parametros)} argumento(s), não {len(args)}")
+    for nome, arg in zip(sub.parametros, args):
+        tipo_par = sub.tabela[nome][0]
+        if arg.tipo != tipo_par and not (tipo_par == 'real' and arg.tipo == 'integer'):
+            raise ErroSemantico(f"Argumento incompatível em '{sub.nome}': '{nome}' ({tipo_par}) "
+                                f"recebe {arg.tipo}")
+
+def _tipo_chamada(tabela, no):
+    """Tipo do resultado de uma chamada de função (os argumentos já tipados)."""
+    sub = _subprograma(tabela, no.nome)
+    if sub.retorno is None:
+        raise ErroSemantico(f"'{no.nome}' é um procedimento e não devolve valor")
+    _verificar_argumentos(sub, no.args)
+    return sub.retorno
+
+def _tipo_elemento(tabela, nome, indice):
+    """Tipo de nome[indice] (o tipo do índice já calculado)."""
+    tipo = _tipo_variavel(tabela, nome)
+    if type(tipo) is not TipoArray:
+        raise ErroSemantico(f"'{nome}' não é um array")
+    if indice.tipo != 'integer':
+        raise ErroSemantico(f"O índice de '{nome}' tem de ser integer (é {indice.tipo})")
+    if type(indice) is Num and not tipo.inicio <= indice.valor <= tipo.fim:
+        raise ErroSemantico(f"Índice {indice.valor} fora dos limites de '{nome}' ({tipo})")
+    return tipo.elemento
+
+def tipo_expressao(expr, tabela):
+    """
+    Tipo de 'expr', calculado uma só vez por nó: os sub-nós que já têm
+    'tipo' não voltam a ser percorridos.
+    """
+    if expr.tipo is not None:
+        return expr.tipo
+    # Percurso em pós-ordem: (nó, False) ao chegar, (nó, True) depois dos operandos
+    pendentes = [(expr, False)]
+    while pendentes:
+        no, operandos_prontos = pendentes.pop()
+        if operandos_prontos:
+            if type(no) is Index:
+                no.tipo = _tipo_elemento(tabela, no.nome, no.indice)
+            elif type(no) is Call:
+                no.tipo = _tipo_chamada(tabela, no)
+            else:
+                no.tipo = _tipo_operacao(no.op, no.esq.tipo, no.dir.tipo)
+        elif no.tipo is not None:
+            continue
+        elif type(no) is BinOp:
+            pendentes.append((no, True))
+            pendentes.append((no.dir, False))
+            pendentes.append((no.esq, False))
+        elif type(no) is Id:
+            tipo = _tipo_variavel(tabela, no.nome)
+            no.tipo = 'array' if type(tipo) is TipoArray else tipo
+        elif type(no) is Index:
+            pendentes.append((no, True))
+            pendentes.append((no.indice, False))
+        elif type(no) is Call:
+            pendentes.append((no, True))
+            pendentes.extend((a, False) for a in reversed(no.args))
+        else:
+            raise ValueError(f"Tipo de nó inesperado na análise semântica: {type(no).__name__}")
+    return expr.tipo
+
+# ---------------- instruções ----------------
+# Cada função verifica um statement e acrescenta a 'pendentes' os
+# statements filhos ainda por verificar.
+
+def _verificar_block(stmt, tabela, pendentes):
+    pendentes.extend(reversed(stmt.instrucoes))
+
+def _verificar_assign(stmt, tabela, pendentes):
+    tipo_var = _tipo_variavel(tabela, stmt.var)
+    tipo = tipo_expressao(stmt.expr, tabela)
+    if tipo != tipo_var and not (tipo_var == 'real' and tipo == 'integer'):
+        raise ErroSemantico(f"Atribuição incompatível: '{stmt.var}' ({tipo_var}) := {tipo}")
+
+def _verificar_assign_index(stmt, tabela, pendentes):
+    tipo_expressao(stmt.indice, tabela)
+    tipo_var = _tipo_elemento(tabela, stmt.var, stmt.indice)
+    tipo = tipo_expressao(stmt.expr, tabela)
+    if tipo != tipo_var and not (tipo_var == 'real' and tipo == 'integer'):
+        raise ErroSemantico(f"Atribuição incompatível: '{stmt.var}[…]' ({tipo_var}) := {tipo}")
+
+def _verificar_condicao(cond, tabela, instrucao):
+    tipo = tipo_expressao(cond, tabela)
+    if tipo != 'boolean':
+        raise ErroSemantico(f"A condição do {instrucao} tem de ser boolean (é {tipo})")
+
+def _verificar_if(stmt, tabela, pendentes):
+    _verificar_condicao(stmt.cond, tabela, 'if')
+    if stmt.senao is not None:
+        pendentes.append(stmt.senao)
+    pendentes.append(stmt.entao)
+
+def _verificar_while(stmt, tabela, pendentes):
+    _verificar_condicao(stmt.cond, tabela, 'while')
+    pendentes.append(stmt.corpo)
+
+def _verificar_for(stmt, tabela, pendentes):
+    if _tipo_variavel(tabela, stmt.var) != 'integer':
+        raise ErroSemantico(f"A variável de controlo '{stmt.var}' tem de ser integer")
+    for limite in (stmt.inicio, stmt.limite):
+        tipo = tipo_expressao(limite, tabela)
+        if tipo != 'integer':
+            raise ErroSemantico(f"Os limites do for têm de ser integer (é {tipo})")
+    pendentes.append(stmt.corpo)
+
+def _verificar_write(stmt, tabela, pendentes):
+    for e in stmt.exprs:
+        if tipo_expressao(e, tabela) == 'array':
+            raise ErroSemantico("Não é possível escrever um array")
+
+def _verificar_read(stmt, tabela, pendentes):
+    if type(_tipo_variavel(tabela, stmt.var)) is TipoArray:
+        raise ErroSemantico(f"Não é possível ler o array '{stmt.var}'")
+
+def _verificar_read_index(stmt, tabela, pendentes):
+    tipo_expressao(stmt.indice, tabela)
+    _tipo_elemento(tabela, stmt.var, stmt.indice)
+
+def _verificar_proc_call(stmt, tabela, pendentes):
+    for a in stmt.args:
+        tipo_expressao(a, tabela)
+    sub = _subprograma(tabela, stmt.nome)
+    if sub.retorno is not None:
+        raise ErroSemantico(f"'{stmt.nome}' é uma função: o resultado tem de ser usado")
+    _verificar_argumentos(sub, stmt.args)
+
+_VERIFICADORES = {
+    Block: _verificar_block, Assign: _verificar_assign, If: _verificar_if,
+    While: _verificar_while, For: _verificar_for, Write: _verificar_write,
+    Read: _verificar_read, AssignIndex: _verificar_assign_index, ReadIndex: _verificar_read_index,
+    ProcCall: _verificar_proc_call,
+}
+
+def anotar_tipos(ast_program, tabela):
+    """
+    Verifica a AST (arvore.Program) com a tabela de variáveis
+    (nome → (tipo, índice)) e anota o tipo de todas as expressões que ainda
+    não o têm, no bloco principal e nos corpos dos subprogramas.
+    Erros → ErroSemantico.
+    """
+    for bloco, escopo in [(ast_program.bloco, tabela)] + [
+            (sub.corpo, ChainMap(sub.tabela, tabela)) for sub in ast_program.subprogramas]:
+        pendentes = [bloco]
+        while pendentes:
+            stmt = pendentes.pop()
+            verificar = _VERIFICADORES.get(type(stmt))
+            if verificar is None:
+                raise ValueError(f"Tipo de nó inesperado na análise semântica: {type(stmt).__name__}")
+            verificar(stmt, escopo, pendentes)
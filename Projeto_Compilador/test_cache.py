@@ -0,0 +1,38 @@
+import parser as compilador
+from cache import CacheCompilacao
+
+# ---------------------------------------------------
+# Acertos da cache de compilação
+#
+# Um acerto volta a ler o .ewvm guardado com Programa.de_texto: tem de dar
+# o mesmo programa que a compilação, também com strings que ocupam várias
+# linhas, e uma entrada ilegível conta como falha (compila-se de novo).
+# A chave distingue programas que só diferem nos espaços de uma string.
+# ---------------------------------------------------
+
+PROGRAMA = "program Linhas; begin writeln('linha1\nlinha2  '); writeln('a \"b\" ') end.\n"
+
+def _compilar(cache):
+    (nome, programa, erro, _, _), = compilador.compilar_em_lote([("Linhas", PROGRAMA, 1)], cache=cache)
+    assert erro is None
+    return programa.para_texto()
+
+def test_acerto_com_string_em_varias_linhas(tmp_path):
+    cache = CacheCompilacao(str(tmp_path), compilador.carimbo_versao())
+    texto = _compilar(cache)
+    assert _compilar(cache) == texto
+    assert (cache.acertos, cache.falhas) == (1, 1)
+
+def test_entrada_ilegivel_conta_como_falha(tmp_path):
+    cache = CacheCompilacao(str(tmp_path), compilador.carimbo_versao())
+    texto = _compilar(cache)
+    with open(cache._caminho(cache.chave(PROGRAMA)), 'w', encoding='utf-8') as f:
+        f.write('PUSHS "linha1\n')
+    assert _compilar(cache) == texto
+    assert (cache.acertos, cache.falhas) == (0, 2)
+    assert _compilar(cache) == texto
+    assert cache.acertos == 1
+
+def test_espacos_numa_string_mudam_a_chave(tmp_path):
+    cache = CacheCompilacao(str(tmp_path), compilador.carimbo_versao())
+    assert cache.chave(PROGRAMA) != cache.chave(PROGRAMA.replace("linha1\n", "linha1  \n"))
@@ -0,0 +1,44 @@
+import pytest
+
+import parser as compilador
+import ewvm
+
+# ---------------------------------------------------
+# Conversão integer → real nas atribuições e nos argumentos
+#
+# A análise semântica aceita um inteiro numa variável, elemento de array
+# ou parâmetro real; o código gerado tem de o converter (ITOF), senão a
+# divisão seguinte é a divisão inteira da EWVM. Cada programa é compilado,
+# escrito num .ewvm e executado com a linha de comandos de ewvm.py.
+# ---------------------------------------------------
+
+PROGRAMA = """program Reais;
+var x: real; i: integer; v: array[1..3] of real;
+function metade(r: real): real;
+begin
+  metade := r / 2
+end;
+procedure mostra(r: real; k: integer);
+begin
+  writeln(r / k)
+end;
+begin
+  x := 3;
+  x := x / 2;
+  writeln(x);
+  i := 5;
+  v[2] := i;
+  writeln(v[2] / 2);
+  writeln(metade(7));
+  mostra(9, 2)
+end.
+"""
+
+@pytest.mark.parametrize("opcoes", [
+    {}, {'sem_inline': True}, {'dobragem': True, 'peephole': True, 'slots': True, 'codigo_morto': True},
+])
+def test_inteiro_guardado_como_real(opcoes, tmp_path, capsys):
+    programa = compilador.compilar_programa(PROGRAMA, ctx=compilador.CompilationContext(opcoes))
+    caminho = compilador.escrever_ewvm(programa, "Reais", tmp_path)
+    assert ewvm.main([caminho]) == 0
+    assert capsys.readouterr().out == "1.5\n2.5\n3.5\n4.5\n"
@@ -0,0 +1,65 @@
+import io
+
+import parser as compilador
+import ewvm
+
+# ---------------------------------------------------
+# Opção 'slots' com arrays
+#
+# Os arrays ficam na área global e as variáveis simples passam a locais
+# (PUSHN no início): o .ewvm só pode declarar os elementos dos arrays e as
+# globais usadas nos subprogramas, e as posições poupadas não contam com
+# os arrays.
+# ---------------------------------------------------
+
+ARRAY = """program Soma;
+var i, s: integer; v: array[1..100] of integer;
+begin
+  s := 0;
+  for i := 1 to 100 do v[i] := i;
+  for i := 1 to 100 do s := s + v[i];
+  writeln(s)
+end.
+"""
+
+# 'total' é usada no procedimento (fica global); 'k' e 'x' passam a locais
+# e partilham a mesma posição
+PARTILHADA = """program Partilhada;
+var k: integer; total: integer; x: integer; a: array[0..4] of integer;
+procedure soma(n: integer);
+begin
+  total := total + n
+end;
+begin
+  x := 3;
+  soma(x);
+  for k := 0 to 4 do a[k] := k * k;
+  for k := 0 to 4 do soma(a[k]);
+  writeln(total)
+end.
+"""
+
+def _compilar(texto):
+    ctx = compilador.CompilationContext({'slots': True, 'sem_inline': True})
+    programa = compilador.compilar_programa(texto, ctx=ctx)
+    saida = io.StringIO()
+    ewvm.executar(programa, saida=saida)
+    return programa, ctx.estatisticas['slots'], saida.getvalue()
+
+def _declaracoes(programa):
+    return [linha for linha in programa.para_texto() if linha.endswith(': 0:')]
+
+def test_so_os_arrays_ficam_globais():
+    programa, poupadas, saida = _compilar(ARRAY)
+    assert saida == "5050\n"
+    assert _declaracoes(programa) == [f"v[{i}]: 0:" for i in range(1, 101)]
+    assert programa.globais() == 100
+    assert programa.para_texto().count("PUSHN 2") == 1
+    assert poupadas == 0
+
+def test_globais_dos_subprogramas_depois_dos_arrays():
+    programa, poupadas, saida = _compilar(PARTILHADA)
+    assert saida == "33\n"
+    assert _declaracoes(programa) == [f"a[{i}]: 0:" for i in range(5)] + ["total: 0:"]
+    assert programa.globais() == 6
+    assert poupadas == 1
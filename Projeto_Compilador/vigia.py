@@ -0,0 +1,134 @@
+import os, time, hashlib
+
+import parser as compilador
+from divisor import dividir_programas
+from incremental import CompilacaoIncremental
+from semantica import ErroSemantico
+
+# ---------------------------------------------------
+# Modo watch do driver (parser.py --watch)
+#
+# Depois da compilação inicial, verifica periodicamente a data de
+# modificação e o tamanho do ficheiro de entrada (só biblioteca padrão, sem
+# inotify). Quando mudam, espera que o ficheiro fique estável durante o
+# tempo de debounce (um editor pode gravar em várias escritas) e faz um
+# ciclo: divide a entrada em programas, compara o hash de cada um com o da
+# versão anterior e recompila só os alterados, reescrevendo apenas os seus
+# .ewvm. Cada programa tem a sua CompilacaoIncremental (incremental.py),
+# por isso uma edição pequena só refaz o statement alterado.
+# Os programas são identificados pelo nome e pela ocorrência (o segundo
+# "program P;" do ficheiro é (P, 1)).
+# ---------------------------------------------------
+
+def assinatura(caminho):
+    """(data de modificação, tamanho) do ficheiro, ou None se não existir."""
+    try:
+        st = os.stat(caminho)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _hash(trecho):
+    return hashlib.sha256(trecho.encode('utf-8')).digest()
+
+def _com_chaves(tarefas):
+    """Acrescenta a cada tarefa (nome, trecho, linha) a chave (nome, ocorrência)."""
+    vistos = {}
+    for tarefa in tarefas:
+        n = vistos.get(tarefa[0], 0)
+        vistos[tarefa[0]] = n + 1
+        yield (tarefa[0], n), tarefa
+
+class Vigia:
+    """
+    Vigia o ficheiro 'entrada' e recompila para 'saida' os programas que
+    mudam. 'intervalo' e 'espera' (debounce) em segundos; com 'binario',
+    escreve .ewvmb em vez de .ewvm.
+    """
+
+    def __init__(self, entrada, saida, opcoes=None, intervalo=0.5, espera=0.2, binario=False):
+        self.entrada = entrada
+        self.saida = saida
+        self.binario = binario
+        self.opcoes = opcoes or {}
+        self.intervalo = intervalo
+        self.espera = espera
+        self.assinatura = assinatura(entrada)
+        self.hashes = {}        # (nome, ocorrência) → hash do texto compilado
+        self.sessoes = {}       # (nome, ocorrência) → CompilacaoIncremental
+        self.ciclos = 0
+
+    def registar(self, tarefas):
+        """Deixa passar as tarefas da compilação inicial, guardando o hash de cada programa."""
+        for chave, tarefa in _com_chaves(tarefas):
+            self.hashes[chave] = _hash(tarefa[1])
+            yield tarefa
+
+    def esperar_alteracao(self):
+        """Bloqueia até o ficheiro mudar e ficar 'espera' segundos sem mudar."""
+        while True:
+            time.sleep(self.intervalo)
+            atual = assinatura(self.entrada)
+            if atual is None or atual == self.assinatura:
+                continue
+            while True:
+                time.sleep(self.espera)
+                seguinte = assinatura(self.entrada)
+                if seguinte == atual:
+                    break
+                atual = seguinte
+            if atual is not None:
+                self.assinatura = atual
+                return
+
+    def ciclo(self):
+        """
+        Recompila os programas alterados e escreve os seus .ewvm.
+        Devolve (alterados, total, erros).
+        """
+        inicio = time.perf_counter()
+        self.ciclos += 1
+        vistos = set()
+        alterados = erros = 0
+        with open(self.entrada, 'r', encoding='utf-8') as fonte:
+            for chave, (nome_prog, trecho, linha) in _com_chaves(dividir_programas(fonte)):
+                vistos.add(chave)
+                h = _hash(trecho)
+                if self.hashes.get(chave) == h:
+                    continue
+                self.hashes[chave] = h
+                alterados += 1
+
+                sessao = self.sessoes.get(chave)
+                if sessao is None:
+                    sessao = self.sessoes[chave] = CompilacaoIncremental(self.opcoes)
+                try:
+                    programa = sessao.compilar(trecho, linha)
+                except (SyntaxError, ErroSemantico, ValueError) as e:
+                    print(compilador.descrever_erro(nome_prog, e))
+                    erros += 1
+                    continue
+                nome_saida = compilador.escrever_ewvm(programa, nome_prog, self.saida, self.binario)
+                print(f"Gerado → {nome_saida} ({sessao.ultima})")
+
+        # Programas que deixaram de existir (os .ewvm ficam onde estão)
+        for chave in set(self.hashes) - vistos:
+            del self.hashes[chave]
+            self.sessoes.pop(chave, None)
+            print(f"Removido da entrada: {chave[0]}")
+
+        ms = (time.perf_counter() - inicio) * 1000
+        print(f"[ciclo {self.ciclos}] {alterados} de {len(vistos)} programa(s) recompilado(s), "
+              f"{erros} com erros, {ms:.1f} ms")
+        return alterados, len(vistos), erros
+
+    def executar(self, max_ciclos=None):
+        """Ciclos até Ctrl+C (ou até 'max_ciclos'); devolve o código de saída."""
+        print(f"A vigiar {self.entrada} (Ctrl+C para terminar)")
+        try:
+            while max_ciclos is None or self.ciclos < max_ciclos:
+                self.esperar_alteracao()
+                self.ciclo()
+        except KeyboardInterrupt:
+            print()
+        return 0